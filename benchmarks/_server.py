@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DRAIN_CHUNK_SIZE = 1024 * 1024
+
+
+class _DrainingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The headers and body are written separately, so without this every response on a
+    # kept-alive connection stalls on delayed ACKs.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    get_body = b'{"count": 0, "rows": []}'
+
+    def do_POST(self):
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            chunk = self.rfile.read(min(DRAIN_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+
+            remaining -= len(chunk)
+
+        self._respond({"IpfsHash": "QmBenchmark", "PinSize": 0, "Timestamp": ""})
+
+    def do_GET(self):
+        self._respond(self.get_body)
+
+    def _respond(self, data):
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(latency: float = 0.0, get_body: Optional[bytes] = None):
+    """
+    Start a local HTTP server that reads and discards request bodies and replies with
+    canned Pinata-like responses after ``latency`` seconds. GET requests are answered with
+    ``get_body``, an empty ``pinList`` by default. Returns the server and its base URL.
+    """
+
+    attributes = {"latency": latency}
+    if get_body is not None:
+        attributes["get_body"] = get_body
+
+    handler = type("Handler", (_DrainingHandler,), attributes)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.request_queue_size = 1024
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/"
@@ -0,0 +1,93 @@
+"""
+Latency of single ``pinata unpin`` commands, with and without a :class:`~pinata.agent.PinataAgent`.
+
+Without an agent, every command builds a new SDK and session and opens a new connection;
+the ``cold sdk`` row times that in-process, so Python startup isn't part of it. The
+``agent call`` row times the same command forwarded to a running agent, which reuses its
+SDK and connection, and ``cli via agent`` runs the whole ``pinata unpin`` command in a
+fresh interpreter, startup included. Requests go to a local
+:class:`~pinata.testing.FakePinataServer` answering after ``--latency`` seconds.
+
+Usage::
+
+    python -m benchmarks.bench_agent [--calls 50] [--cli-calls 10] [--latency 0.0]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from pinata.agent import DISABLE_ENV_VAR, SOCKET_ENV_VAR, AgentClient, PinataAgent
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.sdk import Pinata
+from pinata.session import PinataAPISession
+from pinata.testing import FakePinataServer
+
+_CLI = "import sys; from pinata.cli import cli; cli(['unpin', sys.argv[1], '-p', 'bench'])"
+
+
+def _median_ms(operation: Callable[[str], object], server: FakePinataServer, calls: int) -> float:
+    timings = []
+    for number in range(calls):
+        cid = f"QmBench{number:039}"
+        server.add_pin(cid)
+        start = time.perf_counter()
+        operation(cid)
+        timings.append(time.perf_counter() - start)
+
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--cli-calls", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir, FakePinataServer(
+        latency=args.latency
+    ) as server:
+
+        def make_sdk(profile: str = "bench") -> Pinata:
+            session = PinataAPISession.from_api_key("key", "secret", host_address=server.url)
+            return Pinata(PinningClient(session), DataClient(session))
+
+        socket_path = Path(temp_dir) / "agent.sock"
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(sys.path),
+            SOCKET_ENV_VAR: str(socket_path),
+        }
+        env.pop(DISABLE_ENV_VAR, None)
+
+        def run_cli(cid: str):
+            subprocess.run(
+                [sys.executable, "-c", _CLI, cid], env=env, check=True, stdout=subprocess.DEVNULL
+            )
+
+        with PinataAgent(socket_path, sdk_factory=make_sdk):
+            client = AgentClient(socket_path)
+            rows = [
+                ("cold sdk", _median_ms(lambda c: make_sdk().unpin(c), server, args.calls)),
+                (
+                    "agent call",
+                    _median_ms(
+                        lambda c: client.call("unpin", "bench", content_hash=c), server, args.calls
+                    ),
+                ),
+                ("cli via agent", _median_ms(run_cli, server, args.cli_calls)),
+            ]
+
+    print(f"{'command':>14} {'median ms':>10}")
+    for name, median in rows:
+        print(f"{name:>14} {median:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
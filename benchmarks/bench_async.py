@@ -0,0 +1,66 @@
+"""
+Throughput of the threaded sync client versus the asyncio client.
+
+Both clients send the same number of ``pinList`` requests to a local server that answers
+each request after a fixed delay, simulating network latency.
+
+Usage::
+
+    python -m benchmarks.bench_async [--requests 2000] [--concurrency 500] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._server import start_server
+
+
+def _run_sync(url: str, requests: int, concurrency: int) -> float:
+    from pinata.clients.data import DataClient
+    from pinata.session import PinataAPISession
+
+    client = DataClient(PinataAPISession.from_api_key("bench", "bench", host_address=url))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: client.search_pins(status="pinned"), range(requests)))
+
+    return time.perf_counter() - start
+
+
+async def _run_async(url: str, requests: int, concurrency: int) -> float:
+    from pinata.aio import AsyncDataClient, AsyncPinataAPISession
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncPinataAPISession.from_api_key(
+        "bench", "bench", host_address=url, max_connections=concurrency
+    ) as session:
+        client = AsyncDataClient(session)
+
+        async def search():
+            async with semaphore:
+                await client.search_pins(status="pinned")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(search() for _ in range(requests)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency)
+    print(f"{'client':>8} {'seconds':>8} {'req/s':>8}")
+    sync_elapsed = _run_sync(url, args.requests, args.concurrency)
+    print(f"{'sync':>8} {sync_elapsed:>8.2f} {args.requests / sync_elapsed:>8.0f}")
+    async_elapsed = asyncio.run(_run_async(url, args.requests, args.concurrency))
+    print(f"{'async':>8} {async_elapsed:>8.2f} {args.requests / async_elapsed:>8.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Startup time of the ``pinata`` CLI.
+
+Runs ``pinata --help`` in fresh interpreters and reports the best wall time, and the
+cumulative import time of ``pinata.cli`` from ``python -X importtime``, along with the
+slowest imports it pulls in. Exits with an error when the import time is above
+``--max-ms`` or when one of the modules the CLI must not import at startup was imported,
+so it can guard against import-time regressions.
+
+Usage::
+
+    python -m benchmarks.bench_cli_startup [--runs 10] [--top 10] [--max-ms 100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Modules that only the commands that need them may import.
+DEFERRED_MODULES = ("requests", "keyring", "numpy", "orjson", "project_nft", "pinata.sdk")
+
+_HELP = "from pinata.cli import cli; cli(['--help'])"
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _best_time(code: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(["-c", code])
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def _import_times() -> Dict[str, Tuple[int, int]]:
+    # Lines look like: "import time:  self [us] | cumulative | imported package".
+    stderr = _run(["-X", "importtime", "-c", "import pinata.cli"]).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        own, cumulative, module = line.split(":", 1)[1].split("|")
+        times[module.strip()] = (int(own), int(cumulative))
+
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    help_time = _best_time(_HELP, args.runs) - _best_time("pass", args.runs)
+    times = _import_times()
+    import_ms = times["pinata.cli"][1] / 1000
+    print(f"pinata --help: {help_time * 1000:.1f} ms over a bare interpreter")
+    print(f"import pinata.cli: {import_ms:.1f} ms")
+    print(f"\n{'cumulative ms':>13} {'self ms':>8}  module")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+    for module, (own, cumulative) in slowest[: args.top]:
+        print(f"{cumulative / 1000:>13.1f} {own / 1000:>8.1f}  {module}")
+
+    imported = [m for m in DEFERRED_MODULES if m in times]
+    if imported:
+        sys.exit(f"\nImported at startup: {', '.join(imported)}.")
+    elif import_ms > args.max_ms:
+        sys.exit(f"\nImporting the CLI took longer than {args.max_ms:.0f} ms.")
+
+
+if __name__ == "__main__":
+    main()
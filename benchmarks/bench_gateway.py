@@ -0,0 +1,58 @@
+"""
+Download time of one large object through :class:`~pinata.gateway.GatewayClient`.
+
+The ``single`` row fetches the object in one request, ``ranged`` splits it into parallel
+range requests of ``--part-mib`` MiB, and ``cached`` fetches it again from the content
+cache. The object is served by a local :class:`~pinata.testing.FakePinataServer` that
+caps each response at ``--bandwidth-mib`` MiB/s, like a gateway throttling connections.
+
+Usage::
+
+    python -m benchmarks.bench_gateway [--size-mib 64] [--part-mib 8] [--bandwidth-mib 16]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pinata.gateway import ContentCache, GatewayClient
+from pinata.testing import FakePinataServer
+
+MIB = 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mib", type=int, default=64)
+    parser.add_argument("--part-mib", type=int, default=8)
+    parser.add_argument("--bandwidth-mib", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    size = args.size_mib * MIB
+    with tempfile.TemporaryDirectory() as temp_dir, FakePinataServer(
+        bandwidth=args.bandwidth_mib * MIB, compute_cids=False
+    ) as server:
+        cid = server.add_content(os.urandom(size))
+        cache = ContentCache(Path(temp_dir) / "cache", max_size=2 * size)
+        runs = [
+            ("single", size, False),
+            ("ranged", args.part_mib * MIB, True),
+            ("cached", args.part_mib * MIB, True),
+        ]
+        print(f"{'download':>9} {'seconds':>8} {'MiB/s':>8} {'requests':>9}")
+        for name, part_size, use_cache in runs:
+            gateway = GatewayClient(
+                server.url, cache=cache, part_size=part_size, max_workers=args.workers
+            )
+            requests_before = server.stats["ipfs"]
+            start = time.perf_counter()
+            gateway.download(cid, Path(temp_dir) / name, use_cache=use_cache)
+            elapsed = time.perf_counter() - start
+            requests = server.stats["ipfs"] - requests_before
+            print(f"{name:>9} {elapsed:>8.2f} {size / MIB / elapsed:>8.1f} {requests:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cost of JSON encoding and decoding for large ``pinList`` responses and ``pinJSONToIPFS``
+request bodies, with each available codec of :mod:`pinata.codec`.
+
+Decoding is timed through ``PinataResponse.data`` on a canned ``pinList`` response of
+``--rows`` records, and encoding through ``PinataAPISession._prepare_request`` with a
+``pinataContent`` of ``--items`` records. The ``requests`` row is what the SDK did before
+it had codecs: decode ``Response.text`` and let ``requests`` serialize ``json=`` bodies.
+With ``--gc-pause``, the codecs decode with the garbage collector paused, see
+:func:`~pinata.codec.set_gc_pause`.
+
+Usage::
+
+    python -m benchmarks.bench_json_codec [--rows 100000] [--items 100000] [--calls 5] [--gc-pause]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from requests import Response
+from requests.sessions import Request
+
+from benchmarks.bench_logging import _make_body
+from pinata import codec
+from pinata.response import PinataResponse
+from pinata.session import PinataAPISession
+
+
+def _make_content(items: int) -> dict:
+    item = {
+        "name": "token",
+        "description": "A token with a description long enough to matter. " * 2,
+        "image": "ipfs://Qm" + "x" * 44,
+        "attributes": [{"trait_type": "level", "value": 7}, {"trait_type": "rare", "value": True}],
+    }
+    return {"items": [dict(item, id=i) for i in range(items)]}
+
+
+def _measure(operation: Callable[[], object], calls: int) -> Tuple[float, float]:
+    operation()
+    start = time.perf_counter()
+    for _ in range(calls):
+        operation()
+
+    elapsed = (time.perf_counter() - start) / calls
+    # Tracing allocations slows them down, so peak memory is measured on its own call.
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _decode(body: bytes, legacy: bool) -> Callable[[], object]:
+    def operation():
+        response = Response()
+        response._content = body
+        response.encoding = "utf-8"
+        if legacy:
+            return json.loads(response.text)
+
+        return PinataResponse(response).data
+
+    return operation
+
+
+def _encode(session: PinataAPISession, content: dict, legacy: bool) -> Callable[[], object]:
+    data = {"pinataContent": content}
+    if legacy:
+        request = Request("POST", "http://localhost/pinning/pinJSONToIPFS", json=data)
+        return lambda: request.prepare().body
+
+    return lambda: session._prepare_request("POST", "pinning/pinJSONToIPFS", json=data).body
+
+
+def _codec_names() -> List[str]:
+    names = ["json"]
+    try:
+        codec.set_codec("orjson")
+        names.append("orjson")
+    except Exception:
+        print("orjson is not installed; install it with 'pip install pynata[orjson]'.")
+
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--gc-pause", action="store_true")
+    args = parser.parse_args()
+    if args.gc_pause:
+        codec.set_gc_pause()
+
+    body = _make_body(args.rows)
+    content = _make_content(args.items)
+    session = PinataAPISession.from_api_key("bench", "bench")
+    request_size = len(codec.StdlibCodec().dumps({"pinataContent": content}))
+
+    print(f"pinList response: {len(body) / 1024 ** 2:.1f} MiB")
+    print(f"pinJSONToIPFS request: {request_size / 1024 ** 2:.1f} MiB")
+    print(f"{'codec':>8} {'decode ms':>10} {'peak MiB':>9} {'encode ms':>10} {'peak MiB':>9}")
+    for name in ["requests"] + _codec_names():
+        legacy = name == "requests"
+        if not legacy:
+            codec.set_codec(name)
+
+        decode, decode_peak = _measure(_decode(body, legacy), args.calls)
+        encode, encode_peak = _measure(_encode(session, content, legacy), args.calls)
+        print(
+            f"{name:>8} {decode * 1000:>10.1f} {decode_peak / 1024 ** 2:>9.1f} "
+            f"{encode * 1000:>10.1f} {encode_peak / 1024 ** 2:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
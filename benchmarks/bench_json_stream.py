@@ -0,0 +1,55 @@
+"""
+Peak memory of reading a large ``pinList`` response with ``PinataResponse.data`` versus
+streaming its rows with ``PinataResponse.iter_items``.
+
+A local server answers with a ``pinList`` body of ``--rows`` records. Peak memory is the
+peak of Python allocations while the rows are consumed, measured with ``tracemalloc``.
+
+Usage::
+
+    python -m benchmarks.bench_json_stream [--rows 200000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks._server import start_server
+from benchmarks.bench_logging import _make_body
+
+
+def _consume(client, stream: bool) -> int:
+    if stream:
+        rows = client.search_pins(stream=True).iter_items("rows")
+    else:
+        rows = client.search_pins()["rows"]
+
+    return sum(1 for _ in rows)
+
+
+def main():
+    from pinata.clients.data import DataClient
+    from pinata.session import PinataAPISession
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    body = _make_body(args.rows)
+    _, url = start_server(get_body=body)
+    client = DataClient(PinataAPISession.from_api_key("bench", "bench", host_address=url))
+
+    print(f"response size: {len(body) / 1024 ** 2:.1f} MiB")
+    print(f"{'mode':>12} {'seconds':>8} {'peak MiB':>9}")
+    for mode, stream in (("data", False), ("iter_items", True)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = _consume(client, stream)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert count == args.rows
+        print(f"{mode:>12} {elapsed:>8.2f} {peak / 1024 ** 2:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Overhead of debug logging in ``PinataAPISession.request`` for large responses.
+
+The transport is replaced by one that returns a canned ``pinList`` response, so the
+timings only cover the session's own work. Compares debug logging off, debug logging on
+with the default body cap, and the previous behavior of decoding and logging whole bodies.
+
+Usage::
+
+    python -m benchmarks.bench_logging [--rows 20000] [--calls 20]
+"""
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+from requests import Response
+
+from pinata.logger import logger
+from pinata.session import PinataAPISession
+
+
+def _make_body(rows: int) -> bytes:
+    row = {
+        "id": "0" * 36,
+        "ipfs_pin_hash": "Qm" + "x" * 44,
+        "size": 1024,
+        "user_id": "0" * 36,
+        "date_pinned": "2021-01-01T00:00:00.000Z",
+        "date_unpinned": None,
+        "metadata": {"name": "file.txt", "keyvalues": None},
+        "regions": [{"regionId": "FRA1", "currentReplicationCount": 1}],
+    }
+    return json.dumps({"count": rows, "rows": [row] * rows}).encode()
+
+
+def _make_session(body: bytes) -> PinataAPISession:
+    session = PinataAPISession.from_api_key("bench", "bench")
+
+    def send(request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response._content = body
+        response.url = request.url
+        return response
+
+    session._session.send = send  # type: ignore[assignment]
+    return session
+
+
+def _measure(session: PinataAPISession, calls: int, eager: bool):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = session.get("data/pinList")
+        if eager:
+            # What every call did before: decode the whole body and format it.
+            logger.debug(f"Response data: {response._response.text}")
+
+    elapsed = (time.perf_counter() - start) / calls
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    body = _make_body(args.rows)
+    session = _make_session(body)
+    # Keep the log records out of the terminal, but let them be fully formatted.
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+
+    print(f"response size: {len(body) / 1024 ** 2:.1f} MiB")
+    print(f"{'mode':>14} {'ms/call':>8} {'peak MiB':>9}")
+    for mode, level, eager in (
+        ("debug off", logging.WARNING, False),
+        ("debug capped", logging.DEBUG, False),
+        ("debug eager", logging.DEBUG, True),
+    ):
+        logger.setLevel(level)
+        elapsed, peak = _measure(session, args.calls, eager)
+        print(f"{mode:>14} {elapsed * 1000:>8.3f} {peak / 1024 ** 2:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
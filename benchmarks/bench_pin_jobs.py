@@ -0,0 +1,68 @@
+"""
+Requests and time it takes to pin ``--hashes`` hashes by CID and learn when they are pinned.
+
+The ``per-hash`` row is what scripts did before :class:`~pinata.jobs.PinJobTracker`: add
+each hash to the pin queue, then poll ``pinList`` for it every ``--interval`` seconds
+until it shows up. The ``tracker`` row uses :meth:`~pinata.sdk.Pinata.pin_hashes`, which
+follows every job with one shared, adaptive poll of ``pinJobs``. Requests go to a local
+:class:`~pinata.testing.FakePinataServer` that takes ``--delay`` seconds to pin a hash.
+
+Usage::
+
+    python -m benchmarks.bench_pin_jobs [--hashes 500] [--delay 2.0] [--interval 1.0]
+"""
+import argparse
+import time
+
+from pinata.bulk import run_bounded
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.sdk import Pinata
+from pinata.session import PinataAPISession
+from pinata.testing import FakePinataServer
+
+WORKERS = 32
+
+
+def _pin_and_poll_each(sdk: Pinata, hashes, interval: float):
+    def pin(hash_: str):
+        sdk.pinning.pin_hash(hash_)
+        while not sdk._is_pinned(hash_):
+            time.sleep(interval)
+
+    for _, _, error in run_bounded(pin, hashes, WORKERS):
+        if error:
+            raise error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hashes", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=2.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'strategy':>9} {'seconds':>8} {'requests':>9} {'pinList':>8} {'pinJobs':>8}")
+    for strategy in ("per-hash", "tracker"):
+        with FakePinataServer(hash_pin_delay=args.delay) as server:
+            session = PinataAPISession.from_api_key("key", "secret", host_address=server.url)
+            session.set_pool_size(WORKERS)
+            sdk = Pinata(PinningClient(session), DataClient(session))
+            hashes = [f"QmBench{number:039}" for number in range(args.hashes)]
+            start = time.perf_counter()
+            if strategy == "per-hash":
+                _pin_and_poll_each(sdk, hashes, args.interval)
+            else:
+                report = sdk.pin_hashes(hashes, max_workers=WORKERS, min_interval=args.interval)
+                assert report.success, report
+
+            elapsed = time.perf_counter() - start
+            stats = server.stats
+            print(
+                f"{strategy:>9} {elapsed:>8.2f} {sum(stats.values()):>9} "
+                f"{stats['pinList']:>8} {stats['pinJobs']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Time of ``Pinata.sync_directory`` on a large tree, as a function of how many files changed.
+
+A tree of ``--files`` small files is created and recorded in a manifest as if it had been
+synced before. Then ``--changes`` files are modified, or none, and the tree is synced
+against a local :class:`~pinata.testing.FakePinataServer`. The time of an unchanged tree
+is the cost of scanning it; the rest should grow with the number of changed files only.
+
+Usage::
+
+    python -m benchmarks.bench_sync [--files 100000] [--changes 0 10 100 1000]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.sdk import Pinata
+from pinata.session import PinataAPISession
+from pinata.sync import SyncManifest
+from pinata.testing import FakePinataServer
+
+
+def _make_tree(directory: Path, files: int):
+    for number in range(files):
+        sub_directory = directory / f"{number // 1000:03}"
+        if number % 1000 == 0:
+            sub_directory.mkdir()
+
+        (sub_directory / f"{number}.txt").write_text(f"file {number}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--changes", type=int, nargs="+", default=[0, 10, 100, 1000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir, FakePinataServer() as server:
+        tree = Path(temp_dir) / "tree"
+        tree.mkdir()
+        _make_tree(tree, args.files)
+        session = PinataAPISession.from_api_key("key", "secret", host_address=server.url)
+        sdk = Pinata(PinningClient(session), DataClient(session))
+        with SyncManifest(Path(temp_dir) / "manifest.sqlite") as manifest:
+            # Record the tree without uploading it, as if it had been synced before.
+            start = time.perf_counter()
+            plan = manifest.plan(tree, is_pinned=lambda cid: True)
+            manifest.record(plan.adopt + plan.touch)
+            print(f"files: {args.files}, initial hash: {time.perf_counter() - start:.2f}s")
+            # Files written just now are racy and get hashed once more.
+            time.sleep(2)
+            sdk.sync_directory(tree, manifest=manifest)
+
+            print(f"{'changes':>8} {'seconds':>8} {'uploaded':>9} {'unpinned':>9}")
+            for round_number, changes in enumerate(args.changes):
+                for number in range(changes):
+                    path = tree / f"{number // 1000:03}" / f"{number}.txt"
+                    path.write_text(f"file {number}, round {round_number}\n")
+
+                start = time.perf_counter()
+                report = sdk.sync_directory(tree, manifest=manifest)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{changes:>8} {elapsed:>8.2f} {len(report.uploaded):>9} "
+                    f"{len(report.unpinned):>9}"
+                )
+
+
+if __name__ == "__main__":
+    main()
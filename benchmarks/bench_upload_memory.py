@@ -0,0 +1,75 @@
+"""
+Peak RSS of ``PinningClient.pin_file`` for increasingly large payloads.
+
+Each upload runs in a fresh subprocess against a local server that discards the body, so
+the reported peak RSS reflects the client alone. Payloads are sparse files, so they do not
+need real disk space.
+
+Usage::
+
+    python -m benchmarks.bench_upload_memory [--sizes 1M,1G,5G] [--mmap]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._server import start_server
+
+UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def _parse_size(value: str) -> int:
+    unit = value[-1].upper()
+    return int(value[:-1]) * UNITS[unit] if unit in UNITS else int(value)
+
+
+def _run_child(file_path: str, url: str, use_mmap: bool):
+    from pinata.clients.pinning import PinningClient
+    from pinata.session import PinataAPISession
+
+    session = PinataAPISession.from_api_key("bench", "bench", host_address=url)
+    start = time.perf_counter()
+    PinningClient(session).pin_file(Path(file_path), use_mmap=use_mmap)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{peak_kb} {elapsed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1M,1G,5G")
+    parser.add_argument("--mmap", action="store_true")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(*args.child, use_mmap=args.mmap)
+        return
+
+    server, url = start_server()
+    print(f"{'payload':>10} {'peak RSS (MB)':>14} {'seconds':>8} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size_str in args.sizes.split(","):
+            size = _parse_size(size_str)
+            path = Path(temp_dir) / f"payload-{size_str}.bin"
+            with open(path, "wb") as payload:
+                payload.truncate(size)
+
+            command = [sys.executable, "-m", "benchmarks.bench_upload_memory"]
+            command += ["--child", str(path), url] + (["--mmap"] if args.mmap else [])
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            peak_kb, elapsed = output.split()
+            peak_mb = int(peak_kb) / 1024
+            throughput = size / UNITS["M"] / float(elapsed)
+            print(f"{size_str:>10} {peak_mb:>14.1f} {float(elapsed):>8.2f} {throughput:>8.1f}")
+            path.unlink()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
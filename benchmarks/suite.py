@@ -0,0 +1,318 @@
+"""
+End-to-end performance regression suite.
+
+Runs ``PinataAPISession`` requests, ``PinningClient.pin_file`` and ``pin_json`` uploads (of
+dictionaries and of streamed files) and ``DataClient.search_pins`` queries against a local
+stand-in for the Pinata API, across payload sizes and concurrency levels. Reports throughput,
+latency percentiles and the peak of Python allocations of one operation for each case, and
+compares them with the baselines stored in ``benchmarks/baselines.json``. A case fails the
+run when its throughput or p95 latency is worse than its baseline by more than
+``--tolerance``, or when its peak memory is more than ``--memory-tolerance`` above its
+baseline.
+
+Timings depend on the machine and on how busy it is, so record baselines with
+``--save-baselines`` on the machine that runs the suite, while it is otherwise idle.
+Peak memory doesn't depend on either, and is compared more strictly.
+
+Usage::
+
+    python -m benchmarks.suite [--filter pin_file] [--duration 0.5] [--tolerance 0.5]
+    python -m benchmarks.suite --save-baselines
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks._server import start_server
+from benchmarks.bench_logging import _make_body
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+# Allocations by the HTTP stack vary by a few KiB between runs.
+MEMORY_SLACK_MIB = 0.1
+WARMUP_CALLS = 3
+
+KiB = 1024
+MiB = 1024**2
+
+Operation = Callable[[], None]
+
+
+class Case(NamedTuple):
+    """
+    A benchmark case: ``setup`` gets the server URL, a scratch directory and the
+    concurrency, and returns the operation to time.
+    """
+
+    name: str
+    setup: Callable[[str, Path, int], Operation]
+    payload_size: int = 0
+    concurrency: int = 1
+    rows: Optional[int] = None
+
+
+def _session(url: str, concurrency: int):
+    from pinata.session import PinataAPISession
+
+    session = PinataAPISession.from_api_key("bench", "bench", host_address=url)
+    if session.pool_size < concurrency:
+        session.set_pool_size(concurrency)
+
+    return session
+
+
+def _session_get(url: str, directory: Path, concurrency: int) -> Operation:
+    session = _session(url, concurrency)
+    return lambda: session.get("data/testAuthentication")
+
+
+def _pin_file(size: int) -> Callable[[str, Path, int], Operation]:
+    def setup(url: str, directory: Path, concurrency: int) -> Operation:
+        from pinata.clients.pinning import PinningClient
+
+        file_path = directory / f"payload-{size}.bin"
+        with open(file_path, "wb") as file:
+            file.truncate(size)
+
+        client = PinningClient(_session(url, concurrency))
+        return lambda: client.pin_file(file_path)
+
+    return setup
+
+
+def _pin_json(size: int) -> Callable[[str, Path, int], Operation]:
+    def setup(url: str, directory: Path, concurrency: int) -> Operation:
+        from pinata.clients.pinning import PinningClient
+
+        # Items of ~100 bytes once encoded.
+        content = {"items": ["x" * 96] * max(1, size // 100)}
+        client = PinningClient(_session(url, concurrency))
+        return lambda: client.pin_json(content)
+
+    return setup
+
+
+def _pin_json_file(size: int) -> Callable[[str, Path, int], Operation]:
+    def setup(url: str, directory: Path, concurrency: int) -> Operation:
+        from pinata.clients.pinning import PinningClient
+
+        file_path = directory / f"payload-{size}.json"
+        file_path.write_text(json.dumps({"items": ["x" * 96] * max(1, size // 100)}))
+        client = PinningClient(_session(url, concurrency))
+        return lambda: client.pin_json(file_path, stream=True)
+
+    return setup
+
+
+def _search_pins(url: str, directory: Path, concurrency: int) -> Operation:
+    from pinata.clients.data import DataClient
+
+    client = DataClient(_session(url, concurrency))
+    return lambda: client.search_pins(status="pinned")["rows"]
+
+
+def get_cases() -> List[Case]:
+    cases = []
+    for concurrency in (1, 8, 32):
+        cases.append(Case(f"session_get-c{concurrency}", _session_get, 0, concurrency))
+
+    for size, label in ((KiB, "1KiB"), (MiB, "1MiB"), (32 * MiB, "32MiB")):
+        for concurrency in (1, 8):
+            name = f"pin_file-{label}-c{concurrency}"
+            cases.append(Case(name, _pin_file(size), size, concurrency))
+
+    for size, label in ((KiB, "1KiB"), (MiB, "1MiB")):
+        for concurrency in (1, 8):
+            name = f"pin_json-{label}-c{concurrency}"
+            cases.append(Case(name, _pin_json(size), size, concurrency))
+            name = f"pin_json_stream-{label}-c{concurrency}"
+            cases.append(Case(name, _pin_json_file(size), size, concurrency))
+
+    for rows in (10, 1000):
+        for concurrency in (1, 8):
+            name = f"search_pins-{rows}rows-c{concurrency}"
+            cases.append(Case(name, _search_pins, 0, concurrency, rows))
+
+    return cases
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _run_for(operation: Operation, concurrency: int, duration: float) -> List[float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        timings = []
+        while True:
+            start = time.perf_counter()
+            operation()
+            end = time.perf_counter()
+            timings.append(end - start)
+            if end >= deadline:
+                break
+
+        with lock:
+            latencies.extend(timings)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return latencies
+
+
+def _measure_peak_memory(operation: Operation) -> float:
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / MiB
+
+
+def run_case(case: Case, directory: Path, duration: float, repeat: int) -> Dict[str, float]:
+    """
+    Run a case ``repeat`` times for ``duration`` seconds each, and keep its best run.
+    """
+
+    get_body = _make_body(case.rows) if case.rows is not None else None
+    server, url = start_server(get_body=get_body)
+    try:
+        operation = case.setup(url, directory, case.concurrency)
+        for _ in range(WARMUP_CALLS):
+            operation()
+
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            latencies = sorted(_run_for(operation, case.concurrency, duration))
+            elapsed = time.perf_counter() - start
+            runs.append((len(latencies) / elapsed, latencies))
+
+        # Noise only ever makes a run slower, so keep the best value of each metric.
+        best = {"throughput": max(throughput for throughput, _ in runs)}
+        for key, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            best[key] = min(_percentile(latencies, q) for _, latencies in runs) * 1000
+
+        best["mib_per_s"] = best["throughput"] * case.payload_size / MiB
+        best["peak_mib"] = _measure_peak_memory(operation)
+        return best
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def find_regressions(
+    result: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """
+    Compare a case's result with its baseline.
+
+    Args:
+        result (Dict[str, float]): The case's metrics.
+        baseline (Dict[str, float]): The metrics stored for the case.
+        tolerance (float): How much worse than the baseline a timing may be, e.g. ``0.5``.
+        memory_tolerance (float): How much more than the baseline peak memory may be.
+
+    Returns:
+        List[str]: A description of each metric that regressed.
+    """
+
+    regressions = []
+    if result["throughput"] < baseline["throughput"] * (1 - tolerance):
+        regressions.append(
+            f"throughput {result['throughput']:.0f}/s < baseline {baseline['throughput']:.0f}/s"
+        )
+    if result["p95_ms"] > baseline["p95_ms"] * (1 + tolerance):
+        regressions.append(f"p95 {result['p95_ms']:.2f} ms > baseline {baseline['p95_ms']:.2f} ms")
+    if result["peak_mib"] > baseline["peak_mib"] * (1 + memory_tolerance) + MEMORY_SLACK_MIB:
+        regressions.append(
+            f"peak memory {result['peak_mib']:.1f} MiB > baseline {baseline['peak_mib']:.1f} MiB"
+        )
+
+    return regressions
+
+
+def _load_baselines(path: Path) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+
+    return json.loads(path.read_text())
+
+
+def _save_baselines(path: Path, results: Dict[str, Dict[str, float]]):
+    baselines = _load_baselines(path)
+    for name, result in results.items():
+        baselines[name] = {key: round(value, 3) for key, value in result.items()}
+
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this.")
+    parser.add_argument("--duration", type=float, default=0.5, help="Seconds per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is kept.")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--memory-tolerance", type=float, default=0.1)
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--save-baselines", action="store_true")
+    args = parser.parse_args()
+
+    cases = [c for c in get_cases() if args.filter in c.name]
+    baselines = _load_baselines(args.baselines)
+    results: Dict[str, Dict[str, float]] = {}
+    failures: Dict[str, List[str]] = {}
+
+    header = f"{'case':<28} {'ops/s':>9} {'MiB/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(f"{header} {'peak MiB':>9}  status")
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases:
+            result = run_case(case, Path(directory), args.duration, args.repeat)
+            results[case.name] = result
+            if args.save_baselines:
+                status = "saved"
+            elif case.name not in baselines:
+                status = "no baseline"
+            else:
+                regressions = find_regressions(
+                    result, baselines[case.name], args.tolerance, args.memory_tolerance
+                )
+                if regressions:
+                    failures[case.name] = regressions
+
+                status = "REGRESSED" if regressions else "ok"
+
+            print(
+                f"{case.name:<28} {result['throughput']:>9.0f} {result['mib_per_s']:>8.1f} "
+                f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['peak_mib']:>9.2f}  {status}"
+            )
+
+    if args.save_baselines:
+        _save_baselines(args.baselines, results)
+        print(f"\nSaved {len(results)} baselines to {args.baselines}.")
+    elif failures:
+        for name, regressions in failures.items():
+            print(f"\n{name}:\n  " + "\n  ".join(regressions))
+
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
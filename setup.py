@@ -36,13 +36,16 @@ setup(
         "requests>=2.4.2",
     ],
     extras_require={
+        "async": ["aiohttp>=3.8,<4"],
+        "numpy": ["numpy"],
+        "orjson": ["orjson>=3"],
         "dev": [
             "flake8==3.9.2",
             "pytest==6.2.4",
             "pytest-cov==2.12.1",
             "pytest-mock==3.6.1",
             "tox==3.24.0",
-        ]
+        ],
     },
     entry_points={"console_scripts": ["pinata=pynata.cli:cli"]},
     classifiers=[
@@ -1,9 +1,29 @@
+from typing import TYPE_CHECKING, Any
+
 from pinata.api_key import set_keys_from_prompt
 from pinata.exceptions import PinataMissingAPIKeyError
-from pinata.sdk import Pinata
 
+if TYPE_CHECKING:
+    from pinata.cid import compute_cid
+    from pinata.sdk import Pinata
+
+# Imported on first access, so that importing a submodule, such as the CLI, doesn't
+# import the whole SDK and ``requests``.
+_LAZY_ATTRIBUTES = {"Pinata": "pinata.sdk", "compute_cid": "pinata.cid"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
 
-def create_pinata(profile_name: str) -> Pinata:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def create_pinata(profile_name: str) -> "Pinata":
     """
     Get or create a Pinata SDK instance with the given profile name.
     If the profile does not exist, you will be prompted to create one,
@@ -18,6 +38,8 @@ def create_pinata(profile_name: str) -> Pinata:
         :class:`~pinata.sdk.Pinata`
     """
 
+    from pinata.sdk import Pinata
+
     try:
         pinata = Pinata.from_profile_name(profile_name)
     except PinataMissingAPIKeyError:
@@ -30,4 +52,4 @@ def create_pinata(profile_name: str) -> Pinata:
     return Pinata.from_profile_name(profile_name)
 
 
-__all__ = ["Pinata", "create_pinata"]
+__all__ = ["Pinata", "compute_cid", "create_pinata"]
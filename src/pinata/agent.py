@@ -0,0 +1,364 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from pinata.exceptions import AgentError, PinataException, PinataUnauthorizedError
+from pinata.logger import logger
+
+if TYPE_CHECKING:
+    from pinata.sdk import Pinata
+
+# Keep this module's imports light: the CLI imports it on every command to find out
+# whether an agent is running. The SDK is only imported by the agent itself.
+
+SOCKET_ENV_VAR = "PINATA_AGENT_SOCKET"
+DISABLE_ENV_VAR = "PINATA_NO_AGENT"
+DEFAULT_SOCKET_PATH = Path.home() / ".pinata" / "agent.sock"
+
+_BUFFER_SIZE = 64 * 1024
+_PING_TIMEOUT = 1.0
+
+
+def get_socket_path() -> Path:
+    """
+    Get the path of the agent's socket: ``PINATA_AGENT_SOCKET``, or
+    ``~/.pinata/agent.sock``.
+    """
+
+    path = os.environ.get(SOCKET_ENV_VAR)
+    return Path(path) if path else DEFAULT_SOCKET_PATH
+
+
+class PinataAgent:
+    """
+    A long-lived local agent that runs CLI commands on behalf of short-lived ``pinata``
+    processes. It keeps an SDK instance per profile, so credentials are read from the key
+    backend once and connections to Pinata stay open between commands. A profile's SDK is
+    created again when its keys are changed with ``pinata api-key``, or when Pinata rejects
+    them. Commands reach it over a Unix socket that only the current user can connect to.
+
+    Args:
+        socket_path (pathlib.Path): The path of the Unix socket to listen on.
+        idle_timeout (Optional[float]): Stop after this many seconds without a command
+          running.
+        sdk_factory (Optional[Callable[[str], :class:`~pinata.sdk.Pinata`]]): Creates the SDK
+          of a profile. Defaults to :meth:`~pinata.sdk.Pinata.from_profile_name`.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        idle_timeout: Optional[float] = None,
+        sdk_factory: Optional[Callable[[str], "Pinata"]] = None,
+    ):
+        self.socket_path = socket_path or get_socket_path()
+        self.idle_timeout = idle_timeout
+        self._sdk_factory = sdk_factory
+        self._sdks: Dict[str, "Pinata"] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._last_activity = time.monotonic()
+        self._in_flight = 0
+
+    def __enter__(self) -> "PinataAgent":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def serve_forever(self):
+        """
+        Serve commands until the agent is stopped, receives a ``shutdown`` command or
+        stays idle for longer than ``idle_timeout``.
+        """
+
+        self._serve(self._bind())
+
+    def start(self):
+        """
+        Serve commands in a background thread.
+        """
+
+        server = self._bind()
+        self._thread = threading.Thread(target=self._serve, args=(server,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        server, thread = self._server, self._thread
+        if server is not None:
+            server.shutdown()
+
+        if thread is not None:
+            thread.join()
+            self._thread = None
+
+    def _bind(self) -> "_Server":
+        if AgentClient(self.socket_path).is_running():
+            raise AgentError(f"An agent is already listening on '{self.socket_path}'.")
+
+        # Only the user may reach the socket, whatever their umask is.
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.socket_path.exists() or self.socket_path.is_symlink():
+            # Left over by an agent that didn't shut down cleanly.
+            self.socket_path.unlink()
+
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+        self._server.agent = self
+        self._last_activity = time.monotonic()
+        return self._server
+
+    def _serve(self, server: "_Server"):
+        logger.info(f"Pinata agent listening on '{self.socket_path}'.")
+        try:
+            server.serve_forever(poll_interval=0.05)
+        finally:
+            server.server_close()
+            self._server = None
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _is_idle(self) -> bool:
+        if self.idle_timeout is None:
+            return False
+
+        with self._lock:
+            if self._in_flight:
+                return False
+
+            return time.monotonic() - self._last_activity > self.idle_timeout
+
+    def _get_sdk(self, profile: str) -> "Pinata":
+        with self._lock:
+            if profile not in self._sdks:
+                if self._sdk_factory:
+                    self._sdks[profile] = self._sdk_factory(profile)
+                else:
+                    from pinata.sdk import Pinata
+
+                    self._sdks[profile] = Pinata.from_profile_name(profile)
+
+            return self._sdks[profile]
+
+    def _forget_sdk(self, profile: Optional[str]):
+        from pinata.api_key import get_key_manager
+
+        with self._lock:
+            if profile is None:
+                self._sdks.clear()
+            else:
+                self._sdks.pop(profile, None)
+
+            # The key manager caches the key pairs too; read them from the backend again.
+            get_key_manager().invalidate()
+
+    def _reload_keys(self, profile: str) -> bool:
+        # Forget the SDK of a profile whose keys were rejected, and tell whether its keys
+        # changed since, i.e. whether running the command again can succeed.
+        from pinata.api_key import get_key_manager
+
+        key_manager = get_key_manager()
+        try:
+            rejected = key_manager.get_key_pair(profile)
+        except PinataException:
+            rejected = None
+
+        self._forget_sdk(profile)
+        try:
+            return key_manager.get_key_pair(profile) != rejected
+        except PinataException:
+            return False
+
+    def _run(self, request: Dict) -> Any:
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            return self._run_command(request)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._last_activity = time.monotonic()
+
+    def _run_command(self, request: Dict) -> Any:
+        command = request.get("command")
+        profile = request.get("profile")
+        args = request.get("args") or {}
+        if command == "ping":
+            return {"pid": os.getpid(), "profiles": sorted(self._sdks)}
+        elif command == "shutdown":
+            self._server.stop_soon()
+            return None
+        elif command == "forget":
+            self._forget_sdk(profile)
+            return None
+
+        if profile is None:
+            from pinata.api_key import get_key_manager
+
+            profile = get_key_manager().default_profile_name
+            if not profile:
+                raise PinataException("There are no stored API keys.")
+
+        try:
+            return self._run_with_sdk(self._get_sdk(profile), command, args)
+        except PinataUnauthorizedError:
+            # The keys may have been changed since the SDK was created; read them again,
+            # and only run the command again if they did change.
+            logger.info("Pinata agent reloading API keys after they were rejected.")
+            if not self._reload_keys(profile):
+                raise
+
+            return self._run_with_sdk(self._get_sdk(profile), command, args)
+
+    def _run_with_sdk(self, sdk: "Pinata", command: str, args: Dict) -> Any:
+        if command == "pin":
+            return sdk.pin_file(
+                Path(args["file_path"]),
+                recursive=args.get("recursive", False),
+                skip_existing=args.get("skip_existing", False),
+            )
+        elif command == "unpin":
+            sdk.unpin(args["content_hash"])
+            return None
+
+        raise AgentError(f"Unknown command '{command}'.")
+
+
+class AgentClient:
+    """
+    Forwards commands to a :class:`PinataAgent`.
+
+    Args:
+        socket_path (Optional[pathlib.Path]): The path of the agent's socket.
+        timeout (Optional[float]): The seconds to wait for the agent to respond. ``None``,
+          the default, waits as long as a command takes, e.g. a large upload.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or get_socket_path()
+        self.timeout = timeout
+
+    @classmethod
+    def connect(cls) -> Optional["AgentClient"]:
+        """
+        Get a client of the agent, if one is running and ``PINATA_NO_AGENT`` isn't set.
+
+        Returns:
+            Optional[:class:`AgentClient`]
+        """
+
+        if os.environ.get(DISABLE_ENV_VAR):
+            return None
+
+        client = cls()
+        return client if client.is_running() else None
+
+    def is_running(self) -> bool:
+        if not self.socket_path.exists():
+            return False
+
+        try:
+            AgentClient(self.socket_path, timeout=_PING_TIMEOUT).call("ping")
+        except AgentError:
+            return False
+
+        return True
+
+    def call(self, command: str, profile: Optional[str] = None, **args) -> Any:
+        """
+        Run a command in the agent.
+
+        Args:
+            command (str): ``pin``, ``unpin``, ``ping``, ``forget``, which drops the SDK
+              of the profile, or ``shutdown``.
+            profile (Optional[str]): The API key profile to run it with. Defaults to the
+              agent's default profile.
+            **args: The command's arguments.
+
+        Returns:
+            Any: The command's result.
+        """
+
+        request = json.dumps({"command": command, "profile": profile, "args": args})
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(self.timeout)
+                connection.connect(str(self.socket_path))
+                connection.sendall(request.encode() + b"\n")
+                with connection.makefile("rb", buffering=_BUFFER_SIZE) as reader:
+                    line = reader.readline()
+        except OSError as err:
+            raise AgentError(f"Unable to reach the agent at '{self.socket_path}': {err}") from err
+
+        if not line:
+            raise AgentError("The agent closed the connection without responding.")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise AgentError(response["error"])
+
+        return response.get("result")
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    agent: PinataAgent
+    _stopping = False
+
+    def service_actions(self):
+        if self.agent._is_idle() and not self._stopping:
+            logger.info("Pinata agent stopping after being idle.")
+            self.stop_soon()
+
+    def stop_soon(self):
+        # 'shutdown' waits for the serving loop to exit, so it can't be called from it.
+        self._stopping = True
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self):
+        if not _is_same_user(self.connection):
+            logger.warning("Pinata agent refused a connection from another user.")
+            return
+
+        for line in self.rfile:
+            try:
+                response = json.dumps({"result": self.server.agent._run(json.loads(line))})
+            except Exception as err:
+                response = json.dumps({"error": str(err) or err.__class__.__name__})
+
+            self.wfile.write(response.encode() + b"\n")
+            self.wfile.flush()
+
+
+def _is_same_user(connection: socket.socket) -> bool:
+    # The socket's permissions already keep other users out; check the peer's credentials
+    # too where the platform provides them.
+    peer_credentials = getattr(socket, "SO_PEERCRED", None)
+    if peer_credentials is None:
+        return True
+
+    credentials = connection.getsockopt(socket.SOL_SOCKET, peer_credentials, 12)
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid == os.getuid()
+
+
+__all__ = ["AgentClient", "PinataAgent", "get_socket_path"]
@@ -0,0 +1,5 @@
+from pinata.aio.clients import AsyncDataClient, AsyncPinningClient
+from pinata.aio.sdk import AsyncPinata
+from pinata.aio.session import AsyncPinataAPISession
+
+__all__ = ["AsyncDataClient", "AsyncPinata", "AsyncPinataAPISession", "AsyncPinningClient"]
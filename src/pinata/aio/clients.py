@@ -0,0 +1,162 @@
+import asyncio
+from pathlib import Path
+from typing import IO, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pinata.aio.session import AsyncPinataAPISession
+from pinata.clients.data import MAX_PAGE_LIMIT, _check_page_limit, get_search_params
+from pinata.clients.pinning import get_pin_job_params
+from pinata.response import PinataResponse
+from pinata.streaming import JSONEnvelope, MultipartEncoder
+from pinata.utils import json_to_dict
+
+
+class AsyncPinataClient:
+    def __init__(self, session: AsyncPinataAPISession, api_namespace: str):
+        self.session = session
+        self._prefix = api_namespace
+
+    async def _post(self, uri, *args, **kwargs) -> PinataResponse:
+        return await self.session.post(self._uri(uri), *args, **kwargs)
+
+    async def _get(self, uri, *args, **kwargs) -> PinataResponse:
+        return await self.session.get(self._uri(uri), *args, **kwargs)
+
+    async def _delete(self, uri, *args, **kwargs) -> PinataResponse:
+        return await self.session.delete(self._uri(uri), *args, **kwargs)
+
+    def _uri(self, uri: str) -> str:
+        return f"/{self._prefix}/{uri}"
+
+
+class AsyncPinningClient(AsyncPinataClient):
+    """
+    The ``asyncio`` counterpart of :class:`~pinata.clients.pinning.PinningClient`.
+    """
+
+    def __init__(self, session: AsyncPinataAPISession):
+        super().__init__(session, "pinning")
+
+    async def pin_file(
+        self, file_path: Path, use_mmap: bool = False, recursive: bool = False
+    ) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.pinning.PinningClient.pin_file`.
+        """
+        body = MultipartEncoder.from_path(file_path, recursive=recursive, use_mmap=use_mmap)
+        return await self._post("pinFileToIPFS", data=body)
+
+    async def pin_json(
+        self, json_arg: Union[Path, IO, Dict], stream: bool = False, validate: bool = True
+    ) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.pinning.PinningClient.pin_json`.
+        """
+        if stream and not isinstance(json_arg, dict):
+            body = JSONEnvelope(json_arg, validate=validate)
+            return await self._post("pinJSONToIPFS", data=body)
+
+        json_data = json_to_dict(json_arg)
+        data = {"pinataContent": json_data}
+        return await self._post("pinJSONToIPFS", json=data)
+
+    async def pin_hash(self, hash_: str) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.pinning.PinningClient.pin_hash`.
+        """
+        data = {"hashToPin": hash_}
+        # Queueing a hash that is already queued has no further effect.
+        return await self._post("addHashToPinQueue", json=data, idempotent=True)
+
+    async def list_pin_jobs(
+        self,
+        status: Optional[str] = None,
+        ipfs_pin_hash: Optional[str] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.pinning.PinningClient.list_pin_jobs`.
+        """
+        params = get_pin_job_params(
+            status=status, ipfs_pin_hash=ipfs_pin_hash, sort=sort, limit=limit, offset=offset
+        )
+        return await self._get("pinJobs", params=params)
+
+    async def unpin(self, content_hash: str) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.pinning.PinningClient.unpin`.
+        """
+        return await self._delete(f"unpin/{content_hash}")
+
+
+class AsyncDataClient(AsyncPinataClient):
+    """
+    The ``asyncio`` counterpart of :class:`~pinata.clients.data.DataClient`.
+    """
+
+    def __init__(self, session: AsyncPinataAPISession):
+        super().__init__(session, "data")
+
+    async def search_pins(
+        self,
+        hash_contains: Optional[str] = None,
+        pin_start: Optional[str] = None,
+        pin_end: Optional[str] = None,
+        unpin_start: Optional[str] = None,
+        unpin_end: Optional[str] = None,
+        pin_size_min: Optional[int] = None,
+        pin_size_max: Optional[int] = None,
+        status: Optional[str] = None,
+        page_limit: Optional[int] = None,
+        page_offset: Optional[int] = None,
+    ) -> PinataResponse:
+        """
+        See :meth:`~pinata.clients.data.DataClient.search_pins`.
+        """
+        params = get_search_params(
+            hash_contains=hash_contains,
+            pin_start=pin_start,
+            pin_end=pin_end,
+            unpin_start=unpin_start,
+            unpin_end=unpin_end,
+            pin_size_min=pin_size_min,
+            pin_size_max=pin_size_max,
+            status=status,
+            page_limit=page_limit,
+            page_offset=page_offset,
+        )
+        return await self._get("pinList", params=params)
+
+    async def iter_pins(
+        self, page_limit: int = MAX_PAGE_LIMIT, prefetch: bool = True, **filters
+    ) -> AsyncIterator[Dict]:
+        """
+        See :meth:`~pinata.clients.data.DataClient.iter_pins`. The next page is prefetched
+        in a task on the running event loop.
+        """
+        _check_page_limit(page_limit)
+
+        async def fetch(offset: int) -> Tuple[List[Dict], int]:
+            response = await self.search_pins(page_limit=page_limit, page_offset=offset, **filters)
+            return response["rows"], response["count"]
+
+        offset = 0
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(fetch(offset))
+        try:
+            while next_page is not None:
+                rows, count = await next_page
+                offset += len(rows)
+                has_more = bool(rows) and offset < count
+                next_page = asyncio.ensure_future(fetch(offset)) if has_more and prefetch else None
+                for row in rows:
+                    yield row
+
+                if has_more and next_page is None:
+                    next_page = asyncio.ensure_future(fetch(offset))
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+
+__all__ = ["AsyncDataClient", "AsyncPinningClient"]
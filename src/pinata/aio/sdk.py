@@ -0,0 +1,155 @@
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+from project_nft import Pin
+
+from pinata.aio.clients import AsyncDataClient, AsyncPinningClient
+from pinata.aio.session import DEFAULT_MAX_CONNECTIONS, AsyncPinataAPISession
+from pinata.api_key import get_key_manager
+from pinata.cid import compute_cid
+from pinata.exceptions import (
+    NoContentError,
+    PinataBadRequestError,
+    PinataHTTPError,
+    PinataInternalServiceError,
+    PinError,
+)
+
+
+class AsyncPinata:
+    """
+    The ``asyncio`` counterpart of :class:`~pinata.sdk.Pinata`. Use it as an async context
+    manager, or call :meth:`close` when done, to release its connections.
+    """
+
+    def __init__(self, pinning_client: AsyncPinningClient, data_client: AsyncDataClient):
+        self.pinning = pinning_client
+        self.data = data_client
+
+    @classmethod
+    def from_profile_name(
+        cls, profile_name: str, max_connections: int = DEFAULT_MAX_CONNECTIONS
+    ) -> "AsyncPinata":
+        """
+        Create an instance of the async Pinata SDK from a stored profile name.
+
+        Args:
+            profile_name (str): The name of the API key profile to use.
+            max_connections (int): The maximum number of concurrent connections.
+        """
+        key_manager = get_key_manager()
+        api_key, api_secret = key_manager.get_key_pair(profile_name)
+        return cls.from_api_key(api_key, api_secret, max_connections=max_connections)
+
+    @classmethod
+    def from_api_key(
+        cls,
+        api_key: str,
+        api_secret: str,
+        host_address: str = "https://api.pinata.cloud/",
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ) -> "AsyncPinata":
+        """
+        Create an instance of the async Pinata SDK from an API key.
+
+        Args:
+            api_key (str): The API key.
+            api_secret (str): The API secret.
+            host_address (str): The address of the Pinata API.
+            max_connections (int): The maximum number of concurrent connections.
+        """
+        session = AsyncPinataAPISession.from_api_key(
+            api_key, api_secret, host_address=host_address, max_connections=max_connections
+        )
+        return cls(AsyncPinningClient(session), AsyncDataClient(session))
+
+    async def __aenter__(self) -> "AsyncPinata":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        await self.pinning.session.close()
+        await self.data.session.close()
+
+    async def get_pins(self) -> List[Pin]:
+        """
+        See :meth:`~pinata.sdk.Pinata.get_pins`.
+        """
+
+        return [
+            Pin(content_hash=p["ipfs_pin_hash"], file_name=p["metadata"]["name"])
+            async for p in self.data.iter_pins(status="pinned")
+        ]
+
+    async def get_hash(self, file_name: str) -> Optional[str]:
+        """
+        See :meth:`~pinata.sdk.Pinata.get_hash`.
+        """
+
+        async for pin in self.data.iter_pins(status="pinned"):
+            if pin["metadata"]["name"] == file_name:
+                return pin["ipfs_pin_hash"]
+
+        return None
+
+    async def pin_file(
+        self,
+        file_path: Path,
+        recursive: bool = False,
+        skip_existing: bool = False,
+        stream_json: bool = False,
+    ) -> str:
+        """
+        See :meth:`~pinata.sdk.Pinata.pin_file`.
+        """
+
+        is_json = file_path.suffix == ".json"
+        if skip_existing and not is_json:
+            cid = await self._get_pinned_cid(file_path, recursive)
+            if cid:
+                return cid
+
+        try:
+            response = (
+                await self.pinning.pin_json(file_path, stream=stream_json)
+                if is_json
+                else await self.pinning.pin_file(file_path, recursive=recursive)
+            )
+        except PinataBadRequestError as err:
+            raise PinError(file_path) from err
+
+        return response.data["IpfsHash"]
+
+    async def unpin(self, content_hash: str, ignore_errors: bool = False):
+        """
+        See :meth:`~pinata.sdk.Pinata.unpin`.
+        """
+        try:
+            await self.pinning.unpin(content_hash)
+        except PinataHTTPError as err:
+            if err.is_not_pinned:
+                if ignore_errors:
+                    return
+
+                raise NoContentError(content_hash) from err
+
+            elif ignore_errors and isinstance(err, PinataInternalServiceError):
+                return
+
+            raise
+
+    async def _get_pinned_cid(self, file_path: Path, recursive: bool) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            cid = await loop.run_in_executor(None, compute_cid, file_path, 0, recursive)
+        except ValueError:
+            return None
+
+        response = await self.data.search_pins(hash_contains=cid, status="pinned")
+        return cid if any(p["ipfs_pin_hash"] == cid for p in response["rows"]) else None
+
+
+__all__ = ["AsyncPinata"]
@@ -0,0 +1,235 @@
+import asyncio
+from typing import AsyncIterator, Optional
+from urllib.parse import urljoin
+
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RequestException, Timeout
+from requests.structures import CaseInsensitiveDict
+
+from pinata import codec
+from pinata.auth import PinataAuth
+from pinata.logger import format_body, is_debug_enabled, logger
+from pinata.response import PinataResponse
+from pinata.retry import RetryPolicy, RetryStats
+from pinata.session import _create_user_headers, _handle_error, _print_request
+from pinata.streaming import StreamingBody
+
+try:
+    import aiohttp
+except ImportError as err:
+    raise ImportError(
+        "The asyncio client requires 'aiohttp'. Install it with 'pip install pynata[async]'."
+    ) from err
+
+DEFAULT_MAX_CONNECTIONS = 1000
+_STREAM_CHUNK_SIZE = 256 * 1024
+
+
+class AsyncPinataAPISession:
+    """
+    The ``asyncio`` counterpart of :class:`~pinata.session.PinataAPISession`. All requests
+    share one connection pool on the running event loop, and failed requests raise the same
+    :class:`~pinata.exceptions.PinataHTTPError` subclasses as the synchronous session.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        auth: PinataAuth,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self._url = url
+        self._auth = auth
+        self._max_connections = max_connections
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._headers = {
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+
+    @classmethod
+    def from_api_key(
+        cls,
+        api_key: str,
+        api_secret: str,
+        host_address: str = "https://api.pinata.cloud/",
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> "AsyncPinataAPISession":
+        auth = PinataAuth(api_key, api_secret)
+        return AsyncPinataAPISession(
+            host_address, auth, max_connections=max_connections, retry_policy=retry_policy
+        )
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """
+        The number of retries made, and the total time spent waiting, by this session.
+        """
+
+        return self.retry_policy.stats
+
+    async def __aenter__(self) -> "AsyncPinataAPISession":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def options(self, url, **kwargs):
+        return await self.request("OPTIONS", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+    async def post(self, url, data=None, json=None, **kwargs):
+        return await self.request("POST", url, data=data, json=json, **kwargs)
+
+    async def put(self, url, data=None, json=None, **kwargs):
+        return await self.request("PUT", url, data=data, json=json, **kwargs)
+
+    async def patch(self, url, data=None, json=None, **kwargs):
+        return await self.request("PATCH", url, data=data, json=json, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        timeout=60,
+        idempotent=None,
+    ):
+        url = urljoin(self._url, url)
+        headers = headers or {}
+        headers.update(self._headers)
+        headers.update(self._auth.headers)
+        _print_request(method, url, params=params, data=data, json=json)
+        if data is None and json is not None:
+            data = codec.dumps(json)
+
+        if isinstance(data, StreamingBody):
+            headers.update({"Content-Type": data.content_type, "Content-Length": str(len(data))})
+        elif data and "Content-Type" not in headers:
+            headers.update({"Content-Type": "application/json"})
+        if "Accept" not in headers:
+            headers.update({"Accept": "application/json"})
+
+        headers = _create_user_headers(headers)
+        send_kwargs = dict(params=params, headers=headers, timeout=timeout)
+        retries = 0
+        retry_delay = 0.0
+        while True:
+            self.retry_policy.budget.record_request()
+            response = None
+            error = None
+            try:
+                response = await self._send(method, url, data, **send_kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                error = err
+
+            if response is not None and response.status_code < 400:
+                break
+
+            delay = self.retry_policy.get_retry_delay(
+                method,
+                retries,
+                idempotent=idempotent,
+                response=response,
+                error=_to_requests_error(error) if error is not None else None,
+            )
+            if delay is None:
+                if error is not None:
+                    raise error
+
+                break
+
+            reason = response.status_code if response is not None else type(error).__name__
+            logger.debug(f"Retrying {method} {url} after {reason} in {delay:.2f}s.")
+            await asyncio.sleep(delay)
+            retries += 1
+            retry_delay += delay
+
+        if is_debug_enabled():
+            logger.debug(f"Response status: {response.status_code}")
+            logger.debug(f"Response data: {format_body(response.content)}")
+
+        if 200 <= response.status_code <= 399:
+            return PinataResponse(response, retries=retries, retry_delay=retry_delay)
+
+        # If we get here, an error has occurred.
+        _handle_error(method, url, response)
+
+    async def _send(self, method, url, data, params, headers, timeout) -> Response:
+        if isinstance(data, StreamingBody):
+            data = _stream_body(data)
+
+        session = self._get_session()
+        async with session.request(
+            method,
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as aio_response:
+            return _to_requests_response(aio_response, await aio_response.read())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session has to be created inside a running event loop.
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_connections)
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+
+async def _stream_body(body: StreamingBody) -> AsyncIterator[bytes]:
+    # Read the files on the default executor so that disk I/O does not block the loop.
+    loop = asyncio.get_running_loop()
+    body.reset()
+    while True:
+        chunk = await loop.run_in_executor(None, body.read, _STREAM_CHUNK_SIZE)
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def _to_requests_error(error: Exception) -> RequestException:
+    # Map 'aiohttp' errors to their 'requests' equivalents for the retry policy.
+    if isinstance(error, asyncio.TimeoutError):
+        return Timeout(error)
+
+    return RequestsConnectionError(error)
+
+
+def _to_requests_response(aio_response: "aiohttp.ClientResponse", content: bytes) -> Response:
+    # Convert to a 'requests' response so that responses and errors are handled exactly
+    # like those of the synchronous session.
+    response = Response()
+    response.status_code = aio_response.status
+    response.reason = aio_response.reason or ""
+    response.url = str(aio_response.url)
+    response.headers = CaseInsensitiveDict(aio_response.headers)
+    response.encoding = "utf-8"
+    response._content = content
+    return response
+
+
+__all__ = ["AsyncPinataAPISession"]
@@ -1,16 +1,29 @@
 import json
-from typing import Dict, List, Tuple
+import os
+import re
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import click
-import keyring
 
-from pinata.exceptions import PinataMissingAPIKeyError
+from pinata.exceptions import (
+    InsecureCredentialsFileError,
+    PinataException,
+    PinataMissingAPIKeyError,
+)
 
 SERVICE_NAME = "pinata"
 PINATA_MGMT_KEY = "pinata-mgmt"
 PROFILES_KEY = "profiles"
 DEFAULT_KEY = "default"
 
+KEY_BACKEND_ENV_VAR = "PINATA_KEY_BACKEND"
+CREDENTIALS_FILE_ENV_VAR = "PINATA_CREDENTIALS_FILE"
+DEFAULT_CREDENTIALS_PATH = Path.home() / ".pinata" / "credentials"
+
 
 def set_keys_from_prompt(profile_name: str):
     """
@@ -27,33 +40,216 @@ def set_keys_from_prompt(profile_name: str):
     manager.set_key_pair(profile_name, api_key, api_secret)
 
 
-def _set_mgmt_dict(new_mgmt_dict: Dict):
-    new_mgmt_str = json.dumps(new_mgmt_dict)
-    keyring.set_password(SERVICE_NAME, PINATA_MGMT_KEY, new_mgmt_str)
+class KeyBackend(ABC):
+    """
+    Where a :class:`KeyringManager` stores its secrets, by user name.
+    """
+
+    @abstractmethod
+    def get_password(self, username: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set_password(self, username: str, password: str):
+        pass
 
+    @abstractmethod
+    def delete_password(self, username: str):
+        pass
+
+    def invalidate(self):
+        """
+        Drop anything the backend cached.
+        """
 
-def _add_profile_to_mgmt(profile_name: str, mgmt: Dict):
-    if PROFILES_KEY not in mgmt or not mgmt[PROFILES_KEY]:
-        mgmt[PROFILES_KEY] = [profile_name]
-    else:
-        mgmt[PROFILES_KEY].append(profile_name)
 
-    _set_mgmt_dict(mgmt)
+class KeyringBackend(KeyBackend):
+    """
+    Stores secrets with ``keyring``, in the system's secret store. This is the default.
+    """
 
+    # ``keyring`` looks up its backends when imported, which is slow, so it is only
+    # imported once a key is actually read or written.
+    def get_password(self, username: str) -> Optional[str]:
+        import keyring
+
+        return keyring.get_password(SERVICE_NAME, username)
+
+    def set_password(self, username: str, password: str):
+        import keyring
+
+        keyring.set_password(SERVICE_NAME, username, password)
+
+    def delete_password(self, username: str):
+        import keyring
+
+        keyring.delete_password(SERVICE_NAME, username)
+
+
+class EnvironmentBackend(KeyBackend):
+    """
+    Reads API keys from environment variables, for containers and CI jobs without a
+    keyring. ``PINATA_API_KEY`` and ``PINATA_API_SECRET`` are the keys of the profile
+    ``default``, and ``PINATA_<PROFILE>_API_KEY`` and ``PINATA_<PROFILE>_API_SECRET`` the
+    keys of any other profile. ``PINATA_PROFILE`` selects the default profile. Keys can't
+    be changed through this backend.
+    """
 
-def _get_password(username: str):
-    return keyring.get_password(SERVICE_NAME, username)
+    _KEY_PATTERN = re.compile(r"^PINATA_(?:(\w+)_)?API_KEY$")
 
+    def get_password(self, username: str) -> Optional[str]:
+        if username == PINATA_MGMT_KEY:
+            profiles = self._get_profile_names()
+            default = os.environ.get("PINATA_PROFILE")
+            if not default and DEFAULT_KEY in profiles:
+                default = DEFAULT_KEY
 
-def _delete_password(username: str):
-    keyring.delete_password(SERVICE_NAME, username)
+            return json.dumps({PROFILES_KEY: profiles, DEFAULT_KEY: default})
+
+        return os.environ.get(_get_env_var_name(username))
+
+    def set_password(self, username: str, password: str):
+        raise PinataException("API keys from environment variables are read-only.")
+
+    def delete_password(self, username: str):
+        raise PinataException("API keys from environment variables are read-only.")
+
+    def _get_profile_names(self) -> List[str]:
+        names = []
+        for name in sorted(os.environ):
+            match = self._KEY_PATTERN.match(name)
+            if match:
+                names.append((match.group(1) or DEFAULT_KEY).lower().replace("_", "-"))
+
+        return names
+
+
+def _get_env_var_name(username: str) -> str:
+    # E.g. "default-api-key" -> "PINATA_API_KEY", "my-profile-api-key" ->
+    # "PINATA_MY_PROFILE_API_KEY".
+    for suffix in ("api-key", "api-secret"):
+        if username.endswith(f"-{suffix}"):
+            profile_name = username[: -len(suffix) - 1]
+            prefix = "" if profile_name == DEFAULT_KEY else f"{profile_name}_"
+            name = f"PINATA_{prefix}{suffix}"
+            return re.sub(r"\W", "_", name).upper()
+
+    return ""
+
+
+class FileBackend(KeyBackend):
+    """
+    Stores secrets in a JSON file that only its owner may read, for machines where the
+    keyring is slow or missing. The file is read once, and replaced atomically on writes.
+
+    Args:
+        path (pathlib.Path): The path of the credentials file.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CREDENTIALS_PATH):
+        self.path = path
+        self._passwords: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def get_password(self, username: str) -> Optional[str]:
+        with self._lock:
+            return self._load().get(username)
+
+    def set_password(self, username: str, password: str):
+        with self._lock:
+            passwords = self._load()
+            passwords[username] = password
+            self._save(passwords)
+
+    def delete_password(self, username: str):
+        with self._lock:
+            passwords = self._load()
+            if passwords.pop(username, None) is not None:
+                self._save(passwords)
+
+    def invalidate(self):
+        with self._lock:
+            self._passwords = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._passwords is not None:
+            return self._passwords
+
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                mode = os.fstat(file.fileno()).st_mode
+                if os.name != "nt" and mode & 0o077:
+                    raise InsecureCredentialsFileError(self.path)
+
+                self._passwords = json.load(file)
+        except FileNotFoundError:
+            self._passwords = {}
+
+        return self._passwords  # type: ignore[return-value]
+
+    def _save(self, passwords: Dict[str, str]):
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # ``mkstemp`` creates the file readable by its owner only.
+        descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".credentials")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(passwords, file)
+
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def get_key_backend() -> KeyBackend:
+    """
+    Get the key backend selected with the ``PINATA_KEY_BACKEND`` environment variable:
+    ``keyring`` (the default), ``env`` or ``file``. The file backend uses the path in
+    ``PINATA_CREDENTIALS_FILE``, or ``~/.pinata/credentials``.
+
+    Returns:
+        :class:`KeyBackend`
+    """
+
+    name = os.environ.get(KEY_BACKEND_ENV_VAR) or "keyring"
+    if name == "keyring":
+        return KeyringBackend()
+    elif name == "env":
+        return EnvironmentBackend()
+    elif name == "file":
+        path = os.environ.get(CREDENTIALS_FILE_ENV_VAR)
+        return FileBackend(Path(path) if path else DEFAULT_CREDENTIALS_PATH)
+
+    raise PinataException(f"Unknown key backend '{name}'. Use 'keyring', 'env' or 'file'.")
 
 
 class KeyringManager:
     """
     A class that manages your API keys. Create API key profiles to use in your scripts.
+
+    Profiles and key pairs are read from the backend once and then cached, so repeated
+    lookups don't go back to the keyring. Changes made through the manager update the
+    cache; call :meth:`invalidate` to see changes made by other processes.
+
+    Args:
+        backend (Optional[:class:`KeyBackend`]): Where the keys are stored. Defaults to
+          the system's keyring.
     """
 
+    def __init__(self, backend: Optional[KeyBackend] = None):
+        self.backend = backend or KeyringBackend()
+        self._mgmt: Optional[Dict] = None
+        self._key_pairs: Dict[str, Tuple[str, str]] = {}
+
+    def invalidate(self):
+        """
+        Drop the cached profiles and key pairs, so they are read from the backend again.
+        """
+
+        self._mgmt = None
+        self._key_pairs = {}
+        self.backend.invalidate()
+
     @property
     def mgmt(self) -> Dict:
         """
@@ -63,28 +259,11 @@ class KeyringManager:
         there is at least 1 managed profile name.
         """
 
-        mgmt_str = _get_password(PINATA_MGMT_KEY) or ""
-
-        # Initialize the MGMT JSON if it does not already exist.
-        if not mgmt_str:
-            init_mgmt = {PROFILES_KEY: [], DEFAULT_KEY: None}
-            _set_mgmt_dict(init_mgmt)
-            return init_mgmt
+        if self._mgmt is None:
+            self._mgmt = self._load_mgmt()
 
-        mgmt_dict = json.loads(mgmt_str) if mgmt_str else {}
-        if PROFILES_KEY not in mgmt_dict:
-            mgmt_dict[PROFILES_KEY] = []
-        if DEFAULT_KEY not in mgmt_dict:
-            mgmt_dict[DEFAULT_KEY] = ""
-
-        # If the default is missing and there is at least 1 profile, set it as default.
-        needs_default = (
-            mgmt_dict[DEFAULT_KEY] is None or mgmt_dict[DEFAULT_KEY] not in mgmt_dict[PROFILES_KEY]
-        )
-        if len(mgmt_dict[PROFILES_KEY]) and needs_default:
-            mgmt_dict[DEFAULT_KEY] = mgmt_dict[PROFILES_KEY][0]
-
-        return mgmt_dict
+        # A copy, so callers can't change the cache.
+        return {PROFILES_KEY: list(self._mgmt[PROFILES_KEY]), DEFAULT_KEY: self._mgmt[DEFAULT_KEY]}
 
     @property
     def profile_names(self) -> List[str]:
@@ -105,12 +284,14 @@ class KeyringManager:
             api_key_secret (str): The API secret.
         """
 
-        mgmt = dict(self.mgmt)
-        if profile_name not in mgmt.get(PROFILES_KEY, []):
-            _add_profile_to_mgmt(profile_name, mgmt)
+        self.backend.set_password(f"{profile_name}-api-key", api_key)
+        self.backend.set_password(f"{profile_name}-api-secret", api_key_secret)
+        self._key_pairs[profile_name] = (api_key, api_key_secret)
 
-        keyring.set_password(SERVICE_NAME, f"{profile_name}-api-key", api_key)
-        keyring.set_password(SERVICE_NAME, f"{profile_name}-api-secret", api_key_secret)
+        mgmt = self.mgmt
+        if profile_name not in mgmt[PROFILES_KEY]:
+            mgmt[PROFILES_KEY].append(profile_name)
+            self._set_mgmt(mgmt)
 
     def delete_key_pair(self, profile_name: str):
         """
@@ -120,13 +301,14 @@ class KeyringManager:
             profile_name (str): The API key profile to remove.
         """
 
-        mgmt = dict(self.mgmt)
-        if profile_name in mgmt.get(PROFILES_KEY, []):
+        mgmt = self.mgmt
+        if profile_name in mgmt[PROFILES_KEY]:
             mgmt[PROFILES_KEY].remove(profile_name)
-            _set_mgmt_dict(mgmt)
+            self._set_mgmt(mgmt)
 
-        _delete_password(f"{profile_name}-api-key")
-        _delete_password(f"{profile_name}-api-secret")
+        self._key_pairs.pop(profile_name, None)
+        self.backend.delete_password(f"{profile_name}-api-key")
+        self.backend.delete_password(f"{profile_name}-api-secret")
 
     def get_key_pair(self, profile_name: str) -> Tuple[str, str]:
         """
@@ -139,17 +321,16 @@ class KeyringManager:
             Tuple[str, str]
         """
 
-        api_key = _get_password(f"{profile_name}-api-key")
-        api_secret = _get_password(f"{profile_name}-api-secret")
+        if profile_name in self._key_pairs:
+            return self._key_pairs[profile_name]
+
+        api_key = self.backend.get_password(f"{profile_name}-api-key")
+        api_secret = self.backend.get_password(f"{profile_name}-api-secret")
 
         if not api_key or not api_secret:
             raise PinataMissingAPIKeyError(profile_name)
 
-        # Add the profile to MGMT JSON if it for some reason is missing.
-        mgmt = dict(self.mgmt)
-        if api_key and api_secret and profile_name not in mgmt.get(PROFILES_KEY, []):
-            _add_profile_to_mgmt(profile_name, mgmt)
-
+        self._key_pairs[profile_name] = (api_key, api_secret)
         return api_key, api_secret
 
     def rename_key_pair(self, old_name: str, new_name: str):
@@ -166,13 +347,58 @@ class KeyringManager:
 
         # Change the default if needed.
         if self.default_profile_name == old_name:
-            mgmt = dict(self.mgmt)
+            mgmt = self.mgmt
             mgmt[DEFAULT_KEY] = new_name
-            _set_mgmt_dict(mgmt)
+            self._set_mgmt(mgmt)
+
+    def _load_mgmt(self) -> Dict:
+        # Only reads: a missing or incomplete MGMT JSON is completed in memory, and is
+        # written the next time a profile changes.
+        mgmt_str = self.backend.get_password(PINATA_MGMT_KEY) or ""
+        mgmt_dict = json.loads(mgmt_str) if mgmt_str else {}
+        mgmt_dict[PROFILES_KEY] = mgmt_dict.get(PROFILES_KEY) or []
+        mgmt_dict.setdefault(DEFAULT_KEY, None)
+
+        # If the default is missing and there is at least 1 profile, set it as default.
+        needs_default = mgmt_dict[DEFAULT_KEY] not in mgmt_dict[PROFILES_KEY]
+        if len(mgmt_dict[PROFILES_KEY]) and needs_default:
+            mgmt_dict[DEFAULT_KEY] = mgmt_dict[PROFILES_KEY][0]
+
+        return mgmt_dict
+
+    def _set_mgmt(self, mgmt: Dict):
+        self.backend.set_password(PINATA_MGMT_KEY, json.dumps(mgmt))
+        self._mgmt = mgmt
+
+
+_key_manager: Optional[KeyringManager] = None
+_key_manager_lock = threading.Lock()
+
+
+def get_key_manager() -> KeyringManager:
+    """
+    Get the process-wide key manager, which uses the backend from
+    :func:`get_key_backend`.
+
+    Returns:
+        :class:`KeyringManager`
+    """
 
+    global _key_manager
+    with _key_manager_lock:
+        if _key_manager is None:
+            _key_manager = KeyringManager(get_key_backend())
 
-def get_key_manager():
-    return KeyringManager()
+        return _key_manager
 
 
-__all__ = ["get_key_manager", "set_keys_from_prompt"]
+__all__ = [
+    "EnvironmentBackend",
+    "FileBackend",
+    "KeyBackend",
+    "KeyringBackend",
+    "KeyringManager",
+    "get_key_backend",
+    "get_key_manager",
+    "set_keys_from_prompt",
+]
@@ -7,9 +7,12 @@ class PinataAuth(AuthBase):
         self.__secret = secret
 
     def __call__(self, r):
-        r.headers["pinata_api_key"] = self.__api_key
-        r.headers["pinata_secret_api_key"] = self.__secret
+        r.headers.update(self.headers)
         return r
 
+    @property
+    def headers(self):
+        return {"pinata_api_key": self.__api_key, "pinata_secret_api_key": self.__secret}
+
 
 __all__ = ["PinataAuth"]
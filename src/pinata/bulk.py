@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from pinata.logger import logger
+
+DEFAULT_MAX_WORKERS = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class PinResult(NamedTuple):
+    """
+    The outcome of pinning one path with :meth:`~pinata.sdk.Pinata.pin_many`.
+    """
+
+    path: Path
+    cid: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class BulkProgress(NamedTuple):
+    """
+    A snapshot of a bulk operation's progress, passed to progress callbacks.
+    """
+
+    completed: int
+    failed: int
+    total: Optional[int]
+    elapsed: float
+    bytes_sent: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_sent / self.elapsed if self.elapsed else 0.0
+
+
+class UnpinReport:
+    """
+    The outcomes of :meth:`~pinata.sdk.Pinata.unpin_many`.
+    """
+
+    def __init__(self):
+        self.unpinned: List[str] = []
+        self.already_unpinned: List[str] = []
+        self.failed: Dict[str, Exception] = {}
+        self.duplicates = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<UnpinReport unpinned={len(self.unpinned)} "
+            f"already_unpinned={len(self.already_unpinned)} failed={len(self.failed)} "
+            f"duplicates={self.duplicates}>"
+        )
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+class PinHashReport:
+    """
+    The outcomes of :meth:`~pinata.sdk.Pinata.pin_hashes`.
+    """
+
+    def __init__(self):
+        self.pinned: List[str] = []
+        self.failed: Dict[str, Exception] = {}
+        self.duplicates = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<PinHashReport pinned={len(self.pinned)} failed={len(self.failed)} "
+            f"duplicates={self.duplicates}>"
+        )
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+ProgressCallback = Callable[[BulkProgress], None]
+
+
+def run_bounded(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_MAX_WORKERS
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Call ``func`` on every item using a pool of ``max_workers`` threads and yield
+    ``(item, result, error)`` tuples in the order they complete. Items are pulled from
+    ``items`` lazily, so only about ``2 * max_workers`` of them are in flight at a time,
+    no matter how many there are in total. Errors are collected rather than raised.
+    """
+
+    items = iter(items)
+    pending: Dict[Future, T] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit_next() -> bool:
+            item = next(items, _DONE)
+            if item is _DONE:
+                return False
+
+            pending[executor.submit(func, item)] = item  # type: ignore[arg-type]
+            return True
+
+        while len(pending) < 2 * max_workers and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, None if error else future.result(), error  # type: ignore[misc]
+                submit_next()
+
+
+class ProgressTracker:
+    """
+    Counts completed items of a bulk operation and reports the progress to an optional
+    callback and to the debug log.
+    """
+
+    def __init__(self, total: Optional[int] = None, callback: Optional[ProgressCallback] = None):
+        self.total = total
+        self.callback = callback
+        self.completed = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        self._start = time.perf_counter()
+
+    @property
+    def progress(self) -> BulkProgress:
+        elapsed = time.perf_counter() - self._start
+        return BulkProgress(self.completed, self.failed, self.total, elapsed, self.bytes_sent)
+
+    def update(self, failed: bool = False, bytes_sent: int = 0):
+        self.completed += 1
+        self.failed += int(failed)
+        self.bytes_sent += bytes_sent
+        progress = self.progress
+        logger.debug(
+            "Completed %s/%s (%s failed, %.1f items/s)",
+            progress.completed,
+            progress.total or "?",
+            progress.failed,
+            progress.items_per_second,
+        )
+        if self.callback:
+            self.callback(progress)
+
+
+_DONE = object()
+
+__all__ = ["BulkProgress", "PinHashReport", "PinResult", "UnpinReport", "run_bounded"]
@@ -0,0 +1,219 @@
+import hashlib
+from base64 import b32encode
+from itertools import zip_longest
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional
+
+from pinata.utils import iter_files
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_MAX_LINKS = 174
+
+# Directories whose links take more than this many bytes are HAMT-sharded by IPFS nodes.
+SHARDING_THRESHOLD = 256 * 1024
+
+_SHA2_256 = 0x12
+_DAG_PB = 0x70
+_RAW = 0x55
+_UNIXFS_DIRECTORY = 1
+_UNIXFS_FILE = 2
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+class _Node(NamedTuple):
+    cid: bytes
+    tsize: int
+    file_size: int
+
+
+def compute_cid(
+    path: Path,
+    version: int = 0,
+    recursive: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    raw_leaves: Optional[bool] = None,
+) -> str:
+    """
+    Compute the IPFS CID of a file, or directory, locally without uploading it. Uses the
+    same defaults as Pinata: 256 KiB fixed-size chunks, a balanced DAG with up to 174 links
+    per node and CIDv0. Directories are laid out the way
+    :meth:`~pinata.clients.pinning.PinningClient.pin_file` uploads them.
+
+    Args:
+        path (pathlib.Path): The path to the file or directory.
+        version (int): The CID version, ``0`` or ``1``.
+        recursive (bool): When ``path`` is a directory, include its sub-directories.
+        chunk_size (int): The size of the file chunks in bytes.
+        raw_leaves (Optional[bool]): Store file chunks as raw blocks instead of UnixFS
+          nodes. Defaults to ``True`` for CIDv1 and ``False`` for CIDv0.
+
+    Returns:
+        str: The CID string.
+    """
+
+    if version not in (0, 1):
+        raise ValueError(f"Unsupported CID version '{version}'.")
+    if raw_leaves is None:
+        raw_leaves = version == 1
+    if raw_leaves and version == 0:
+        raise ValueError("Raw leaves require CID version 1.")
+    if not path.exists():
+        raise ValueError(f"File '{path}' does not exist.")
+
+    builder = _DagBuilder(version, chunk_size, raw_leaves)
+    node = builder.add_directory(path, recursive) if path.is_dir() else builder.add_file(path)
+    return _cid_to_str(node.cid, version)
+
+
+class _DagBuilder:
+    def __init__(self, version: int, chunk_size: int, raw_leaves: bool):
+        self.version = version
+        self.chunk_size = chunk_size
+        self.raw_leaves = raw_leaves
+
+    def add_file(self, path: Path) -> _Node:
+        with open(path, "rb") as file:
+            return self.add_chunks(_read_chunks(file, self.chunk_size))
+
+    def add_chunks(self, chunks: Iterable[bytes]) -> _Node:
+        # Every chunk but the last must be exactly ``chunk_size`` bytes.
+        leaves = [self._leaf(chunk) for chunk in chunks]
+        if not leaves:
+            leaves = [self._leaf(b"")]
+
+        nodes = leaves
+        while len(nodes) > 1:
+            batches = [iter(nodes)] * DEFAULT_MAX_LINKS
+            nodes = [
+                self._file_node([n for n in b if n is not None]) for b in zip_longest(*batches)
+            ]
+
+        return nodes[0]
+
+    def add_directory(self, directory: Path, recursive: bool) -> _Node:
+        tree: dict = {}
+        for path in iter_files(directory, recursive):
+            parts = path.relative_to(directory).parts
+            subtree = tree
+            for part in parts[:-1]:
+                subtree = subtree.setdefault(part, {})
+
+            subtree[parts[-1]] = path
+
+        return self._directory_node(tree)
+
+    def _directory_node(self, tree: dict) -> _Node:
+        links = []
+        for name in sorted(tree, key=lambda n: n.encode()):
+            entry = tree[name]
+            if isinstance(entry, dict):
+                node = self._directory_node(entry)
+            else:
+                node = entry if isinstance(entry, _Node) else self.add_file(entry)
+
+            links.append((node, name))
+
+        if sum(len(name.encode()) + len(node.cid) for node, name in links) > SHARDING_THRESHOLD:
+            raise ValueError("Directories large enough to be HAMT-sharded are not supported.")
+
+        data = _field_varint(1, _UNIXFS_DIRECTORY)
+        return self._pb_node(links, data, 0)
+
+    def _leaf(self, chunk: bytes) -> _Node:
+        if self.raw_leaves:
+            return _Node(_make_cid(chunk, _RAW, self.version), len(chunk), len(chunk))
+
+        data = _field_varint(1, _UNIXFS_FILE)
+        if chunk:
+            data += _field_bytes(2, chunk)
+
+        data += _field_varint(3, len(chunk))
+        return self._pb_node([], data, len(chunk))
+
+    def _file_node(self, children: List[_Node]) -> _Node:
+        file_size = sum(c.file_size for c in children)
+        data = _field_varint(1, _UNIXFS_FILE) + _field_varint(3, file_size)
+        for child in children:
+            data += _field_varint(4, child.file_size)
+
+        return self._pb_node([(c, "") for c in children], data, file_size)
+
+    def _pb_node(self, links, unixfs_data: bytes, file_size: int) -> _Node:
+        # dag-pb encodes the links before the data.
+        block = b""
+        for node, name in links:
+            link = _field_bytes(1, node.cid)
+            link += _field_bytes(2, name.encode())
+            link += _field_varint(3, node.tsize)
+            block += _field_bytes(2, link)
+
+        block += _field_bytes(1, unixfs_data)
+        tsize = len(block) + sum(node.tsize for node, _ in links)
+        return _Node(_make_cid(block, _DAG_PB, self.version), tsize, file_size)
+
+
+def _read_chunks(file: IO, chunk_size: int) -> Iterator[bytes]:
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        filled = 0
+        while filled < chunk_size:
+            read = file.readinto(view[filled:])
+            if not read:
+                break
+
+            filled += read
+
+        if not filled:
+            return
+
+        yield bytes(view[:filled])
+        if filled < chunk_size:
+            return
+
+
+def _make_cid(block: bytes, codec: int, version: int) -> bytes:
+    multihash = _varint(_SHA2_256) + _varint(32) + hashlib.sha256(block).digest()
+    if version == 0:
+        return multihash
+
+    return _varint(1) + _varint(codec) + multihash
+
+
+def _cid_to_str(cid: bytes, version: int) -> str:
+    if version == 0:
+        return _base58btc(cid)
+
+    return "b" + b32encode(cid).decode().lower().rstrip("=")
+
+
+def _base58btc(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = _BASE58_ALPHABET[remainder] + encoded
+
+    leading_zeros = len(data) - len(data.lstrip(b"\0"))
+    return _BASE58_ALPHABET[0] * leading_zeros + encoded
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _field_varint(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number: int, value: bytes) -> bytes:
+    return _varint((number << 3) | 2) + _varint(len(value)) + value
+
+
+__all__ = ["compute_cid"]
@@ -1,21 +1,31 @@
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
 import click
 
+# Keep this module's imports light: the SDK, ``requests`` and the keyring backend are
+# only imported by the commands that use them, so that ``--help`` and commands such as
+# ``cid`` start quickly.
 from pinata.api_key import get_key_manager
+from pinata.bulk import DEFAULT_MAX_WORKERS
 from pinata.exceptions import PinataException
-from pinata.sdk import Pinata
-from pinata.utils import prettify_date
+
+if TYPE_CHECKING:
+    from pinata.agent import AgentClient
+    from pinata.sdk import Pinata
+
+_SORT_COLUMNS = {"date": "date_pinned", "size": "size", "name": "name"}
+
+
+def _get_default_profile_name() -> str:
+    return get_key_manager().default_profile_name
 
 
 def profile_option():
-    return click.option(
-        "--profile",
-        "-p",
-        help="The profile to use",
-        default=get_key_manager().default_profile_name,
-    )
+    # Without ``--profile``, the default profile is only looked up once a command needs
+    # keys, which commands forwarded to the agent never do.
+    return click.option("--profile", "-p", help="The profile to use")
 
 
 class ExceptionHandlingGroup(click.Group):
@@ -50,12 +60,35 @@ def list_keys():
         click.echo(name)
 
 
-def _get_pinata(profile: str) -> Pinata:
+def _get_pinata(profile: Optional[str]) -> "Pinata":
+    from pinata.sdk import Pinata
+
     key_manager = get_key_manager()
-    api_key, api_secret = key_manager.get_key_pair(profile)
+    api_key, api_secret = key_manager.get_key_pair(profile or _get_default_profile_name())
     return Pinata.from_api_key(api_key, api_secret)
 
 
+def _get_agent() -> Optional["AgentClient"]:
+    from pinata.agent import AgentClient
+
+    return AgentClient.connect()
+
+
+def _forget_profiles_in_agent(*profile_names: str):
+    # A running agent caches an SDK per profile; make it read the changed keys again.
+    from pinata.exceptions import AgentError
+
+    agent = _get_agent()
+    if agent is None:
+        return
+
+    try:
+        for profile_name in profile_names:
+            agent.call("forget", profile_name)
+    except AgentError:
+        pass
+
+
 @keys.command("import")
 @click.argument("profile_name")
 @click.option("--api-key", help="The API key.", prompt=True)
@@ -64,6 +97,7 @@ def import_key(profile_name, api_key, api_secret):
     """Import an existing API key pair."""
     key_manager = get_key_manager()
     key_manager.set_key_pair(profile_name, api_key, api_secret)
+    _forget_profiles_in_agent(profile_name)
     click.echo(f"Successfully added API key profile {profile_name}")
 
 
@@ -73,6 +107,7 @@ def remove_key(profile_name):
     """Remove an API key pair profile."""
     key_manager = get_key_manager()
     key_manager.delete_key_pair(profile_name)
+    _forget_profiles_in_agent(profile_name)
 
 
 @keys.command("rename")
@@ -82,46 +117,223 @@ def rename_key(old_name, new_name):
     """Remove an API key pair profile."""
     key_manager = get_key_manager()
     key_manager.rename_key_pair(old_name, new_name)
+    _forget_profiles_in_agent(old_name, new_name)
     click.echo(f"Successfully renamed API key profile '{old_name}' to '{new_name}'.")
 
 
 @cli.command()
 @click.option("--status", default="pinned", type=click.Choice(["all", "pinned", "unpinned"]))
+@click.option(
+    "--sort-by",
+    type=click.Choice(list(_SORT_COLUMNS)),
+    help="Sort the pins, newest and largest first, instead of listing them as received.",
+)
 @profile_option()
-def list_pins(status, profile):
+def list_pins(status, sort_by, profile):
     """List pins."""
+    from pinata.records import PinRecord, PinTable
+    from pinata.utils import prettify_timestamp
+
+    profile = profile or _get_default_profile_name()
     if not profile:
         _echo_no_profile()
         sys.exit(1)
 
     pinata = _get_pinata(profile)
-    response = pinata.data.search_pins(status=status)
-    pins = response["rows"]
+    pins: Iterable[PinRecord] = map(PinRecord.from_row, pinata.data.iter_pins(status=status))
+    if sort_by:
+        table = PinTable.from_records(pins)
+        pins = table.sort(_SORT_COLUMNS[sort_by], descending=sort_by != "name")
+
     for pin in pins:
-        name = pin["metadata"].get("name", "<Unnamed>")
-        date_str = prettify_date(pin["date_pinned"])
-        row = f"Name: {name}, CID (IPFS Pin Hash): {pin['ipfs_pin_hash']}, Pinned: {date_str}"
+        name = pin.name or "<Unnamed>"
+        date_str = prettify_timestamp(pin.date_pinned)
+        row = f"Name: {name}, CID (IPFS Pin Hash): {pin.cid}, Pinned: {date_str}"
         click.echo(row)
 
 
 @cli.command()
 @click.argument("file_path", type=Path)
+@click.option(
+    "--recursive", "-r", is_flag=True, help="Include sub-directories when pinning a directory."
+)
+@click.option(
+    "--skip-existing", is_flag=True, help="Skip the upload if the content is already pinned."
+)
 @profile_option()
-def pin(file_path, profile):
+def pin(file_path, recursive, skip_existing, profile):
     """Pin a new file."""
-    pinata = _get_pinata(profile)
-    cid = pinata.pin_file(file_path)
+    agent = _get_agent()
+    if agent:
+        cid = agent.call(
+            "pin",
+            profile,
+            file_path=str(file_path.resolve()),
+            recursive=recursive,
+            skip_existing=skip_existing,
+        )
+    else:
+        pinata = _get_pinata(profile)
+        cid = pinata.pin_file(file_path, recursive=recursive, skip_existing=skip_existing)
+
     click.echo(f"Successfully unpinned content. CID={cid}")
 
 
 @cli.command()
-@click.argument("content_hash")
+@click.argument("file_path", type=Path)
+@click.option("--cid-version", default="0", type=click.Choice(["0", "1"]), help="The CID version.")
+@click.option(
+    "--recursive", "-r", is_flag=True, help="Include sub-directories when hashing a directory."
+)
+def cid(file_path, cid_version, recursive):
+    """Compute the CID of a file without uploading it."""
+    from pinata.cid import compute_cid
+
+    try:
+        content_id = compute_cid(file_path, version=int(cid_version), recursive=recursive)
+    except ValueError as err:
+        raise click.ClickException(str(err)) from err
+
+    click.echo(content_id)
+
+
+@cli.command()
+@click.argument("content_id")
+@click.argument("dest", type=Path, required=False)
+@click.option("--gateway", help="The gateway URL. Defaults to $PINATA_GATEWAY_URL.")
+@click.option("--no-cache", is_flag=True, help="Don't use the local cache of downloads.")
+def get(content_id, dest, gateway, no_cache):
+    """Download content by CID, to DEST or a file named after it."""
+    from pinata.gateway import GatewayClient
+
+    dest = dest or Path(content_id.rstrip("/").rsplit("/", 1)[-1])
+    try:
+        GatewayClient(gateway).download(content_id, dest, use_cache=not no_cache)
+    except ValueError as err:
+        raise click.ClickException(str(err)) from err
+
+    click.echo(f"Downloaded {content_id} to '{dest}'.")
+
+
+@cli.command()
+@click.argument("content_hash", required=False)
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    help="Unpin every hash in this file, one per line. Use '-' to read from stdin.",
+)
+@click.option("--workers", default=DEFAULT_MAX_WORKERS, help="Concurrent requests for --from-file.")
 @profile_option()
-def unpin(content_hash, profile):
+def unpin(content_hash, from_file, workers, profile):
     """Remove a pin."""
+    if bool(content_hash) == bool(from_file):
+        raise click.UsageError("Provide either a CONTENT_HASH or --from-file.")
+
+    if content_hash:
+        agent = _get_agent()
+        if agent:
+            agent.call("unpin", profile, content_hash=content_hash)
+        else:
+            _get_pinata(profile).unpin(content_hash)
+
+        click.echo("Successfully unpinned content.")
+        return
+
+    pinata = _get_pinata(profile)
+    report = pinata.unpin_many(_read_hashes(from_file), max_workers=workers)
+    for failed_hash, error in report.failed.items():
+        click.echo(f"Failed to unpin {failed_hash}: {error}", err=True)
+
+    click.echo(
+        f"Unpinned {len(report.unpinned)}, already unpinned {len(report.already_unpinned)}, "
+        f"failed {len(report.failed)}, duplicates skipped {report.duplicates}."
+    )
+    if not report.success:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--manifest",
+    type=Path,
+    help="The manifest of the directory. Defaults to one kept in '~/.pinata/sync'.",
+)
+@click.option("--dry-run", is_flag=True, help="Print the changes without making them.")
+@click.option("--keep-removed", is_flag=True, help="Don't unpin the content of deleted files.")
+@click.option("--workers", default=DEFAULT_MAX_WORKERS, help="Files to hash or upload at a time.")
+@profile_option()
+def sync(directory, manifest, dry_run, keep_removed, workers, profile):
+    """Pin the changes to a directory since its last sync."""
+    from pinata.sync import SyncManifest
+
     pinata = _get_pinata(profile)
-    pinata.unpin(content_hash)
-    click.echo("Successfully unpinned content.")
+    sync_manifest = SyncManifest(manifest) if manifest else SyncManifest.for_directory(directory)
+    with sync_manifest:
+        report = pinata.sync_directory(
+            directory,
+            manifest=sync_manifest,
+            dry_run=dry_run,
+            unpin_removed=not keep_removed,
+            max_workers=workers,
+        )
+
+    plan = report.plan
+    if dry_run:
+        for line in plan.describe():
+            click.echo(line)
+
+        click.echo(
+            f"Would upload {len(plan.upload)}, adopt {len(plan.adopt)}, "
+            f"remove {len(plan.remove)} and unpin {len(plan.unpin)}; "
+            f"{plan.unchanged} unchanged."
+        )
+        return
+
+    for failed, error in report.failed.items():
+        click.echo(f"Failed to sync {failed}: {error}", err=True)
+
+    click.echo(
+        f"Uploaded {len(report.uploaded)}, adopted {len(plan.adopt)}, "
+        f"removed {len(plan.remove)}, unpinned {len(report.unpinned)}, "
+        f"failed {len(report.failed)}; {plan.unchanged} unchanged."
+    )
+    if not report.success:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=Path,
+    help="The socket to listen on. Defaults to $PINATA_AGENT_SOCKET or ~/.pinata/agent.sock.",
+)
+@click.option("--idle-timeout", type=float, help="Stop after this many seconds without commands.")
+@click.option("--stop", is_flag=True, help="Stop the running agent.")
+def serve(socket_path, idle_timeout, stop):
+    """Run an agent that keeps keys and connections warm for other commands.
+
+    While it runs, 'pin' and 'unpin' forward to it instead of starting from scratch. Set
+    PINATA_NO_AGENT=1 to run a command without it.
+    """
+    from pinata.agent import AgentClient, PinataAgent
+
+    if stop:
+        AgentClient(socket_path).call("shutdown")
+        click.echo("Stopped the agent.")
+        return
+
+    agent = PinataAgent(socket_path, idle_timeout=idle_timeout)
+    click.echo(f"Serving on '{agent.socket_path}'. Press Ctrl+C to stop.")
+    agent.serve_forever()
+
+
+def _read_hashes(file) -> Iterator[str]:
+    for line in file:
+        content_hash = line.strip()
+        if content_hash and not content_hash.startswith("#"):
+            yield content_hash
 
 
 def _echo_no_profile():
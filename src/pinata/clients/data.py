@@ -1,9 +1,12 @@
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from pinata.clients.base import PinataClient
 from pinata.response import PinataResponse
 from pinata.session import PinataAPISession
 
+MAX_PAGE_LIMIT = 1000
+
 
 class DataClient(PinataClient):
     def __init__(self, session: PinataAPISession):
@@ -19,6 +22,9 @@ class DataClient(PinataClient):
         pin_size_min: Optional[int] = None,
         pin_size_max: Optional[int] = None,
         status: Optional[str] = None,
+        page_limit: Optional[int] = None,
+        page_offset: Optional[int] = None,
+        stream: bool = False,
     ) -> PinataResponse:
         """
         Search pins.
@@ -42,22 +48,112 @@ class DataClient(PinataClient):
               ``"pinned"`` for just pinned records (hashes that are currently pinned). Pass
               in ``"unpinned"`` for just unpinned records (previous hashes that are no longer
               being pinned on pinata).
+            page_limit (int): The number of records to return, at most ``1000``. Pinata
+              defaults to ``10``.
+            page_offset (int): The number of records to skip, for paging through results.
+            stream (bool): Defer reading the response body. Use
+              ``response.iter_items("rows")`` to parse the records one at a time as they
+              are read, instead of loading the whole response.
 
         Returns:
             :class:`~pinata.response.PinataResponse`
         """
-        params = {
-            "hashContains": hash_contains,
-            "pinStart": pin_start,
-            "pinEnd": pin_end,
-            "unpinStart": unpin_start,
-            "unpinEnd": unpin_end,
-            "pinSizeMin": pin_size_min,
-            "pinSizeMax": pin_size_max,
-            "status": status,
-        }
-        params = {k: v for k, v in params.items() if v is not None}
-        return self._get("pinList", params=params)
+        params = get_search_params(
+            hash_contains=hash_contains,
+            pin_start=pin_start,
+            pin_end=pin_end,
+            unpin_start=unpin_start,
+            unpin_end=unpin_end,
+            pin_size_min=pin_size_min,
+            pin_size_max=pin_size_max,
+            status=status,
+            page_limit=page_limit,
+            page_offset=page_offset,
+        )
+        return self._get("pinList", params=params, stream=stream)
+
+    def iter_pins(
+        self, page_limit: int = MAX_PAGE_LIMIT, prefetch: bool = True, **filters
+    ) -> Iterator[Dict]:
+        """
+        Iterate over every pin record matching the given filters, requesting one page at
+        a time. While the records of one page are being consumed, the next page is fetched
+        on a background thread, so at most two pages are held in memory. Without
+        prefetching, each page is parsed as it is read, so only one record is held in
+        memory at a time. Pages may hold fewer records than requested, so they are requested
+        until one is empty or, when prefetching, the ``count`` of matching records is reached.
+
+        Args:
+            page_limit (int): The number of records to request per page, at most
+              ``MAX_PAGE_LIMIT``.
+            prefetch (bool): Fetch the next page in the background.
+            **filters: Any of the filters accepted by :meth:`search_pins`.
+
+        Returns:
+            Iterator[Dict]
+        """
+        _check_page_limit(page_limit)
+
+        def fetch(offset: int) -> Tuple[List[Dict], int]:
+            response = self.search_pins(page_limit=page_limit, page_offset=offset, **filters)
+            return response["rows"], response["count"]
+
+        if not prefetch:
+            offset = 0
+            while True:
+                count = 0
+                response = self.search_pins(
+                    page_limit=page_limit, page_offset=offset, stream=True, **filters
+                )
+                for row in response.iter_items("rows"):
+                    count += 1
+                    yield row
+
+                if count == 0:
+                    return
+
+                offset += count
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            next_page: Optional[Future] = executor.submit(fetch, offset)
+            while next_page is not None:
+                rows, count = next_page.result()
+                offset += len(rows)
+                next_page = executor.submit(fetch, offset) if rows and offset < count else None
+                yield from rows
+
+
+def _check_page_limit(page_limit: int):
+    if not 1 <= page_limit <= MAX_PAGE_LIMIT:
+        raise ValueError(f"'page_limit' must be between 1 and {MAX_PAGE_LIMIT}.")
+
+
+def get_search_params(
+    hash_contains: Optional[str] = None,
+    pin_start: Optional[str] = None,
+    pin_end: Optional[str] = None,
+    unpin_start: Optional[str] = None,
+    unpin_end: Optional[str] = None,
+    pin_size_min: Optional[int] = None,
+    pin_size_max: Optional[int] = None,
+    status: Optional[str] = None,
+    page_limit: Optional[int] = None,
+    page_offset: Optional[int] = None,
+) -> Dict:
+    params = {
+        "hashContains": hash_contains,
+        "pinStart": pin_start,
+        "pinEnd": pin_end,
+        "unpinStart": unpin_start,
+        "unpinEnd": unpin_end,
+        "pinSizeMin": pin_size_min,
+        "pinSizeMax": pin_size_max,
+        "status": status,
+        "pageLimit": page_limit,
+        "pageOffset": page_offset,
+    }
+    return {k: v for k, v in params.items() if v is not None}
 
 
 __all__ = ["DataClient"]
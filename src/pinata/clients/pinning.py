@@ -1,9 +1,10 @@
 from pathlib import Path
-from typing import IO, Dict, Union
+from typing import IO, Dict, Optional, Union
 
 from pinata.clients.base import PinataClient
 from pinata.response import PinataResponse
 from pinata.session import PinataAPISession
+from pinata.streaming import JSONEnvelope, MultipartEncoder
 from pinata.utils import json_to_dict
 
 
@@ -11,36 +12,52 @@ class PinningClient(PinataClient):
     def __init__(self, session: PinataAPISession):
         super().__init__(session, "pinning")
 
-    def pin_file(self, file_path: Path) -> PinataResponse:
+    def pin_file(
+        self, file_path: Path, use_mmap: bool = False, recursive: bool = False
+    ) -> PinataResponse:
         """
-        Add and pin any file, or directory, to Pinata's IPFS nodes.
+        Add and pin any file, or directory, to Pinata's IPFS nodes. The request body is
+        streamed in chunks, so memory usage does not grow with the size of the upload.
+        Files are opened one at a time while they are being sent and closed right after.
 
         Args:
             file_path (pathlib.Path): The path to the file to pin.
+            use_mmap (bool): Read the files through a memory map while streaming them.
+            recursive (bool): When pinning a directory, also pin the files in its
+              sub-directories, keeping their paths relative to ``file_path``.
 
         Returns:
             :class:`~pinata.response.PinataResponse`
         """
-        paths = [f for f in file_path.iterdir()] if file_path.is_dir() else [file_path]
-        files = (
-            [("file", (str(path), open(path, "rb"))) for path in paths]
-            if file_path.is_dir()
-            else [("file", open(path, "rb")) for path in paths]
-        )
-        return self._post("pinFileToIPFS", files=files)
+        body = MultipartEncoder.from_path(file_path, recursive=recursive, use_mmap=use_mmap)
+        return self._post("pinFileToIPFS", data=body)
 
-    def pin_json(self, json_arg: Union[Path, IO, Dict]) -> PinataResponse:
+    def pin_json(
+        self, json_arg: Union[Path, IO, Dict], stream: bool = False, validate: bool = True
+    ) -> PinataResponse:
         """
         Add and pin any JSON object they wish to Pinata's IPFS nodes. This endpoint is
         specifically optimized to only handle JSON content.
 
+        With ``stream=True``, a JSON file is not parsed: its bytes are streamed into the
+        request body as they are, so memory usage stays constant however large the file is.
+
         Args:
             json_arg (pathlib.Path): Either the path to a JSON file, a python dictionary,
               or an IO stream of an opened JSON file.
+            stream (bool): Stream a JSON file instead of loading it. Files opened as IO
+              streams must be opened in binary mode. Ignored for dictionaries.
+            validate (bool): When streaming, check that the file holds a JSON object or
+              array by looking at its first and last characters only. The full document
+              is always validated by Pinata.
 
         Returns:
             :class:`~pinata.response.PinataResponse`
         """
+        if stream and not isinstance(json_arg, dict):
+            body = JSONEnvelope(json_arg, validate=validate)
+            return self._post("pinJSONToIPFS", data=body)
+
         json_data = json_to_dict(json_arg)
         data = {"pinataContent": json_data}
         return self._post("pinJSONToIPFS", json=data)
@@ -59,7 +76,37 @@ class PinningClient(PinataClient):
             :class:`~pinata.response.PinataResponse`
         """
         data = {"hashToPin": hash_}
-        return self._post("addHashToPinQueue", json=data)
+        # Queueing a hash that is already queued has no further effect.
+        return self._post("addHashToPinQueue", json=data, idempotent=True)
+
+    def list_pin_jobs(
+        self,
+        status: Optional[str] = None,
+        ipfs_pin_hash: Optional[str] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> PinataResponse:
+        """
+        List the jobs of hashes added with :meth:`pin_hash` that are not pinned yet. A job
+        leaves the listing once its content is pinned; jobs that failed stay in it with
+        their failure status, e.g. ``"expired"``.
+
+        Args:
+            status (str): Only list jobs with this status, e.g. ``"prechecking"``,
+              ``"retrieving"`` or ``"expired"``.
+            ipfs_pin_hash (str): Only list the jobs of this hash.
+            sort (str): ``"ASC"`` or ``"DESC"``, by the date the jobs were queued.
+            limit (int): The number of jobs to return, at most ``1000``.
+            offset (int): The number of jobs to skip, for paging through results.
+
+        Returns:
+            :class:`~pinata.response.PinataResponse`
+        """
+        params = get_pin_job_params(
+            status=status, ipfs_pin_hash=ipfs_pin_hash, sort=sort, limit=limit, offset=offset
+        )
+        return self._get("pinJobs", params=params)
 
     def unpin(self, content_hash: str) -> PinataResponse:
         """
@@ -74,4 +121,21 @@ class PinningClient(PinataClient):
         return self._delete(f"unpin/{content_hash}")
 
 
+def get_pin_job_params(
+    status: Optional[str] = None,
+    ipfs_pin_hash: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+) -> Dict:
+    params = {
+        "status": status,
+        "ipfs_pin_hash": ipfs_pin_hash,
+        "sort": sort,
+        "limit": limit,
+        "offset": offset,
+    }
+    return {k: v for k, v in params.items() if v is not None}
+
+
 __all__ = ["PinningClient"]
@@ -0,0 +1,239 @@
+import gc
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Union
+
+from pinata.exceptions import PinataException
+
+CODEC_ENV_VAR = "PINATA_JSON_CODEC"
+DEFAULT_GC_PAUSE_THRESHOLD = 1024 * 1024
+
+JSONData = Union[bytes, bytearray, memoryview, str]
+
+
+class JSONCodec(ABC):
+    """
+    Encodes and decodes JSON straight to and from UTF-8 ``bytes``, without building an
+    intermediate ``str``. Subclass it and pass an instance to :func:`set_codec` to plug in
+    another JSON library.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        """
+        Encode an object as JSON.
+
+        Args:
+            obj (Any): The object to encode.
+            indent (bool): Indent the output by two spaces per level, for display.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+
+    @abstractmethod
+    def loads(self, data: JSONData) -> Any:
+        """
+        Decode a JSON document.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded object.
+        """
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name}>"
+
+
+class StdlibCodec(JSONCodec):
+    """
+    The codec of the standard library's :mod:`json` module.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2).encode()
+
+        # The output is ASCII, so encoding it is a plain copy.
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: JSONData) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    The codec of `orjson <https://github.com/ijl/orjson>`__, which is several times faster
+    than the standard library. Objects orjson can't encode, such as integers over 64 bits
+    or dictionaries with non-string keys, are encoded with the standard library instead.
+    Note that orjson decodes integers over 64 bits as floats, which loses precision, so
+    it is only used when selected.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._fallback = StdlibCodec()
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            return self._fallback.dumps(obj, indent=indent)
+
+    def loads(self, data: JSONData) -> Any:
+        return self._orjson.loads(data)
+
+
+_CODECS = {"json": StdlibCodec, "orjson": OrjsonCodec}
+_codec: Optional[JSONCodec] = None
+_codec_lock = threading.Lock()
+# Documents from this size on are decoded with the cyclic garbage collector paused.
+_gc_pause_threshold: Optional[int] = None
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+def get_codec() -> JSONCodec:
+    """
+    Get the JSON codec used by the SDK. Unless one was set with :func:`set_codec`, it is
+    chosen by the ``PINATA_JSON_CODEC`` environment variable (``json`` or ``orjson``), or
+    else it is the standard library's. orjson is faster but decodes integers over 64
+    bits as floats, so it has to be selected.
+
+    Returns:
+        :class:`JSONCodec`
+    """
+
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = _create_codec(os.environ.get(CODEC_ENV_VAR))
+
+    return _codec
+
+
+def set_codec(codec: Union[JSONCodec, str, None]):
+    """
+    Set the JSON codec used by the SDK.
+
+    Args:
+        codec (Union[:class:`JSONCodec`, str, None]): A codec, the name of a built-in codec
+          (``json`` or ``orjson``), or ``None`` to go back to the default choice of
+          :func:`get_codec`.
+    """
+
+    global _codec
+    with _codec_lock:
+        if codec is None or isinstance(codec, JSONCodec):
+            _codec = codec
+        else:
+            _codec = _create_codec(codec)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode an object as JSON with the SDK's codec. See :meth:`JSONCodec.dumps`.
+    """
+
+    return get_codec().dumps(obj, indent=indent)
+
+
+def set_gc_pause(threshold: Optional[int] = DEFAULT_GC_PAUSE_THRESHOLD):
+    """
+    Pause the cyclic garbage collector while large documents are decoded by :func:`loads`.
+
+    Decoding a large document creates so many objects that the collector runs over and
+    over, which can take longer than the decoding itself. Decoded JSON never holds
+    reference cycles, so pausing it is safe for the decoding, but the pause applies to the
+    whole process: other threads allocate without collections meanwhile. It is off by
+    default.
+
+    Args:
+        threshold (Optional[int]): The size in bytes from which documents are decoded with
+          the collector paused, or ``None`` to never pause it.
+    """
+
+    global _gc_pause_threshold
+    _gc_pause_threshold = threshold
+
+
+def loads(data: JSONData) -> Any:
+    """
+    Decode a JSON document with the SDK's codec. See :meth:`JSONCodec.loads`. The garbage
+    collector is paused while large documents are decoded if :func:`set_gc_pause` enabled
+    it.
+    """
+
+    json_codec = get_codec()
+    threshold = _gc_pause_threshold
+    if threshold is None or len(data) < threshold:
+        return json_codec.loads(data)
+
+    with _gc_paused():
+        return json_codec.loads(data)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Concurrent decodes share one pause; the collector is re-enabled, if it was enabled
+    # before, when the last of them is done.
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if not _gc_pauses:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+
+        _gc_pauses += 1
+
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if not _gc_pauses and _gc_was_enabled:
+                gc.enable()
+
+
+def _create_codec(name: Optional[str]) -> JSONCodec:
+    if not name:
+        return StdlibCodec()
+
+    if name not in _CODECS:
+        raise PinataException(f"Unknown JSON codec '{name}'. Use 'json' or 'orjson'.")
+
+    try:
+        return _CODECS[name]()
+    except ImportError as err:
+        raise PinataException(
+            f"JSON codec '{name}' is not installed. Install it with 'pip install pynata[{name}]'."
+        ) from err
+
+
+__all__ = [
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibCodec",
+    "dumps",
+    "get_codec",
+    "loads",
+    "set_codec",
+    "set_gc_pause",
+]
@@ -1,6 +1,10 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Union
 
-from requests.exceptions import HTTPError
+if TYPE_CHECKING:
+    from requests.exceptions import HTTPError
+
+NOT_PINNED_REASON = "CURRENT_USER_HAS_NOT_PINNED_CID"
 
 
 class PinataException(Exception):
@@ -18,6 +22,17 @@ class PinataMissingAPIKeyError(PinataException):
         super().__init__(f"API key or secret for profile '{profile_name}' is missing.")
 
 
+class InsecureCredentialsFileError(PinataException):
+    """
+    Raised when a credentials file can be read by users other than its owner.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(
+            f"Credentials file '{path}' must only be accessible by its owner (chmod 600)."
+        )
+
+
 class PinError(PinataException):
     """
     Raised when unable to pin a file.
@@ -52,6 +67,18 @@ class PinataHTTPError(PinataException):
     An error raised when an HTTP request fails.
     """
 
+    def __init__(self, http_error: "HTTPError"):
+        super().__init__(http_error)
+        self.response = http_error.response
+
+    @property
+    def is_not_pinned(self) -> bool:
+        """
+        ``True`` when the request failed because the content is not pinned by the user.
+        """
+
+        return self.response is not None and NOT_PINNED_REASON in (self.response.text or "")
+
 
 class PinataBadRequestError(PinataHTTPError):
     """
@@ -85,7 +112,7 @@ class PinataTooManyRequestsError(PinataHTTPError):
 
 class PinataInternalServiceError(PinataHTTPError):
     """
-    An error raised when receiving the 429 error code.
+    An error raised when receiving a 5xx error code.
     """
 
 
@@ -98,7 +125,30 @@ class NoContentError(PinataException):
         super().__init__(f"No pinned content found with hash '{content_hash}'.")
 
 
-def raise_pinata_http_error(raised_error: HTTPError):
+class PinJobError(PinataException):
+    """
+    Raised when Pinata gives up on pinning a hash added to its pin queue.
+    """
+
+    def __init__(self, content_hash: str, status: str):
+        super().__init__(f"Unable to pin hash '{content_hash}' (status: {status}).")
+        self.content_hash = content_hash
+        self.status = status
+
+
+class GatewayError(PinataException):
+    """
+    Raised when a download from an IPFS gateway is incomplete or malformed.
+    """
+
+
+class AgentError(PinataException):
+    """
+    Raised when a command forwarded to the local agent fails, or the agent can't be reached.
+    """
+
+
+def raise_pinata_http_error(raised_error: "HTTPError"):
     """
     Raise the appropriate :class:`pinata.exceptions.PinataHTTPError` based on the given
     HTTPError's response status code.
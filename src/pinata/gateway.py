@@ -0,0 +1,399 @@
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from requests.exceptions import RequestException
+from requests.sessions import Session
+
+from pinata.bulk import DEFAULT_MAX_WORKERS, run_bounded
+from pinata.exceptions import GatewayError, PinataHTTPError
+from pinata.logger import logger
+from pinata.response import PinataResponse
+from pinata.retry import RetryPolicy
+from pinata.session import PinataAPISession
+
+GATEWAY_ENV_VAR = "PINATA_GATEWAY_URL"
+DEFAULT_GATEWAY_URL = "https://gateway.pinata.cloud/"
+DEFAULT_CACHE_DIR = Path.home() / ".pinata" / "cache"
+DEFAULT_CACHE_SIZE = 1024**3
+DEFAULT_PART_SIZE = 8 * 1024**2
+# The most seconds a ContentCache goes without scanning its directory when entries are added.
+_RESCAN_INTERVAL = 10.0
+
+_READ_SIZE = 1024**2
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+# A CID, optionally followed by a path inside it, e.g. "<cid>/images/1.png".
+_CID_PATH = re.compile(r"[A-Za-z0-9]+(/[^/]+)*")
+
+
+class ContentCache:
+    """
+    A size-bounded cache of downloaded content on disk, keyed by CID. The content of a
+    CID never changes, so entries never go stale; once the cache grows beyond
+    ``max_size``, the least recently used ones are evicted. Each entry is a file named
+    after its CID and is added with an atomic rename, so processes can share a cache.
+    The bound covers the entries of every process: the directory is scanned again when
+    an added entry takes the entries this process knows of beyond ``max_size``, and at
+    most every ``_RESCAN_INTERVAL`` seconds otherwise, with the modification times of the
+    entries recording their last use. Until then, what other processes added may take
+    the cache over the bound. Downloads in progress don't count towards it.
+
+    Args:
+        directory (pathlib.Path): The directory of the cache.
+        max_size (int): The most bytes the cache holds.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # File names and sizes, from the least to the most recently used.
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._last_scan = 0.0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cid: str) -> bool:
+        return (self.directory / _entry_name(cid)).is_file()
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes in the cache.
+        """
+
+        return self._size
+
+    def get(self, cid: str) -> Optional[Path]:
+        """
+        Get the cached file of a CID, and mark it as recently used.
+
+        Args:
+            cid (str): The CID of the content.
+
+        Returns:
+            Optional[pathlib.Path]
+        """
+
+        name = _entry_name(cid)
+        path = self.directory / name
+        try:
+            # The modification time records the last use, for other processes too.
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._entries.pop(name, 0)
+
+            return None
+
+        with self._lock:
+            if name not in self._entries:
+                # Added by another process.
+                self._size += size
+
+            self._entries[name] = size
+            self._entries.move_to_end(name)
+
+        return path
+
+    def add(self, cid: str, path: Path) -> Optional[Path]:
+        """
+        Move a downloaded file into the cache, evicting the least recently used entries to
+        make room for it.
+
+        Args:
+            cid (str): The CID of the content.
+            path (pathlib.Path): The downloaded file. It is moved, not copied.
+
+        Returns:
+            Optional[pathlib.Path]: The cached file, or ``None`` when the file is larger
+            than the whole cache and was left where it is.
+        """
+
+        size = path.stat().st_size
+        if size > self.max_size:
+            return None
+
+        name = _entry_name(cid)
+        target = self.directory / name
+        with self._lock:
+            shutil.move(str(path), str(target))
+            self._size += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            if self._size > self.max_size or time.monotonic() - self._last_scan > _RESCAN_INTERVAL:
+                # Pick up the entries other processes added, used or evicted since.
+                self._load()
+                if name in self._entries:
+                    # Its mtime is when it was downloaded, but it is the most recently used.
+                    self._entries.move_to_end(name)
+
+            self._evict()
+
+        return target
+
+    def clear(self):
+        with self._lock:
+            for name in self._entries:
+                _unlink(self.directory / name)
+
+            self._entries.clear()
+            self._size = 0
+
+    def _load(self):
+        # Called with the lock held, or on creation.
+        entries = []
+        with os.scandir(self.directory) as scanned:
+            for entry in scanned:
+                # Names starting with a dot are downloads in progress.
+                if entry.name.startswith("."):
+                    continue
+
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, entry.name, stat.st_size))
+                except FileNotFoundError:
+                    # Evicted by another process while scanning.
+                    pass
+
+        # Modification times are coarse, so ties keep the order this process knows of.
+        known_order = {name: number for number, name in enumerate(self._entries)}
+        entries.sort(key=lambda e: (e[0], known_order.get(e[1], len(known_order)), e[1]))
+        self._entries.clear()
+        for _, name, size in entries:
+            self._entries[name] = size
+
+        self._size = sum(self._entries.values())
+        self._last_scan = time.monotonic()
+
+    def _evict(self):
+        # Called with the lock held. The newest entry fits, so it is never evicted.
+        while self._size > self.max_size:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            _unlink(self.directory / name)
+            logger.debug(f"Evicted '{name}' from the content cache.")
+
+
+class GatewayClient:
+    """
+    Downloads content from an IPFS gateway straight to disk. Objects larger than
+    ``part_size`` are fetched as parallel HTTP range requests, and a part whose transfer
+    breaks off is resumed from where it stopped. Downloads are kept in a
+    :class:`ContentCache`, so fetching the same CID again doesn't touch the network.
+
+    Args:
+        gateway_url (Optional[str]): The base URL of the gateway. Defaults to
+          ``$PINATA_GATEWAY_URL`` or Pinata's public gateway.
+        gateway_token (Optional[str]): The access token of a dedicated Pinata gateway.
+        cache (Optional[:class:`ContentCache`]): The cache of downloads. Defaults to a
+          cache of 1 GiB in ``~/.pinata/cache``, created when it is first needed.
+        part_size (int): The number of bytes per range request.
+        max_workers (int): The number of range requests to run at the same time.
+        retry_policy (Optional[:class:`~pinata.retry.RetryPolicy`]): Decides whether
+          failed requests are retried. Its ``max_retries`` also bounds how many times a
+          part is resumed.
+    """
+
+    def __init__(
+        self,
+        gateway_url: Optional[str] = None,
+        gateway_token: Optional[str] = None,
+        cache: Optional[ContentCache] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.gateway_url = gateway_url or os.environ.get(GATEWAY_ENV_VAR) or DEFAULT_GATEWAY_URL
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self._cache = cache
+        session = Session()
+        # Ranges are of the content as stored, so it must not be compressed on the way.
+        session.headers = {"Accept-Encoding": "identity", "Connection": "keep-alive"}
+        if gateway_token:
+            session.headers["x-pinata-gateway-token"] = gateway_token
+
+        # Gateways don't take API keys, so requests are sent without them.
+        self.session = PinataAPISession(self.gateway_url, None, session, retry_policy)
+        self.session.set_pool_size(max_workers)
+
+    @property
+    def cache(self) -> ContentCache:
+        if self._cache is None:
+            self._cache = ContentCache()
+
+        return self._cache
+
+    def download(self, cid: str, dest: Path, use_cache: bool = True) -> Path:
+        """
+        Download content to a file.
+
+        Args:
+            cid (str): The CID of the content, optionally followed by a path inside it,
+              e.g. ``"<cid>/images/1.png"``.
+            dest (pathlib.Path): The file to write. Its parent directories are created.
+            use_cache (bool): Copy the content from the cache when it is there, and add
+              it to the cache when it isn't.
+
+        Returns:
+            pathlib.Path: ``dest``.
+        """
+
+        if not _CID_PATH.fullmatch(cid) or any(p in (".", "..") for p in cid.split("/")):
+            raise ValueError(f"Invalid CID '{cid}'.")
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        cached = self.cache.get(cid) if use_cache else None
+        if cached is not None:
+            try:
+                shutil.copyfile(str(cached), str(dest))
+            except FileNotFoundError:
+                # Evicted by another process in the meantime.
+                pass
+            else:
+                logger.debug(f"Copied '{cid}' from the content cache.")
+                return dest
+
+        directory = self.cache.directory if use_cache else dest.parent
+        temp_path = directory / f".{uuid.uuid4().hex}.part"
+        try:
+            size = self._fetch(f"ipfs/{cid}", temp_path)
+            if use_cache and size <= self.cache.max_size:
+                # Copied before it is cached: another process may evict it right away.
+                shutil.copyfile(str(temp_path), str(dest))
+                self.cache.add(cid, temp_path)
+            else:
+                shutil.move(str(temp_path), str(dest))
+        finally:
+            _unlink(temp_path)
+
+        logger.debug(f"Downloaded '{cid}' ({size} bytes).")
+        return dest
+
+    def _fetch(self, url: str, path: Path) -> int:
+        try:
+            first = self._get(url, 0, self.part_size - 1)
+        except PinataHTTPError as err:
+            if err.response is None or err.response.status_code != 416:
+                raise
+
+            # Empty content has no bytes to request a range of.
+            first = self._get(url)
+
+        if first.status_code != 206:
+            # The gateway ignored the range and is sending the whole content.
+            with open(path, "wb") as file:
+                for chunk in first.iter_content(_READ_SIZE):
+                    file.write(chunk)
+
+                return file.tell()
+
+        try:
+            _, first_end, total = _parse_content_range(first)
+        except GatewayError:
+            first.close()
+            raise
+
+        with open(path, "wb") as file:
+            file.truncate(total)
+
+        parts = [(0, first_end, first)]
+        for start in range(first_end + 1, total, self.part_size):
+            parts.append((start, min(start + self.part_size, total) - 1, None))
+
+        if len(parts) > 1:
+            logger.debug(f"Downloading '{url}' in {len(parts)} parts.")
+
+        results = run_bounded(lambda p: self._fetch_part(url, path, *p), parts, self.max_workers)
+        for _, _, error in results:
+            if error is not None:
+                raise error
+
+        return total
+
+    def _fetch_part(
+        self, url: str, path: Path, start: int, end: int, response: Optional[PinataResponse]
+    ):
+        offset = start
+        failures = 0
+        with open(path, "r+b") as file:
+            while offset <= end:
+                error = None
+                try:
+                    if response is None:
+                        response = self._get_part(url, offset, end)
+
+                    file.seek(offset)
+                    for chunk in response.iter_content(_READ_SIZE):
+                        remaining = end + 1 - offset
+                        file.write(chunk[:remaining])
+                        offset += min(len(chunk), remaining)
+                except RequestException as err:
+                    error = err
+                finally:
+                    if response is not None:
+                        # Return the connection to the pool, even if the body wasn't read.
+                        response.close()
+
+                response = None
+                if offset <= end:
+                    failures += 1
+                    if failures > self.session.retry_policy.max_retries:
+                        raise GatewayError(
+                            f"The download of '{url}' stopped at byte {offset}."
+                        ) from error
+
+                    logger.debug(f"Resuming the download of '{url}' at byte {offset}.")
+
+    def _get_part(self, url: str, start: int, end: int) -> PinataResponse:
+        response = self._get(url, start, end)
+        if response.status_code != 206 or _parse_content_range(response)[0] != start:
+            response.close()
+            raise GatewayError(f"The gateway ignored the range requested of '{url}'.")
+
+        return response
+
+    def _get(self, url: str, start: Optional[int] = None, end: Optional[int] = None):
+        headers = {"Accept": "*/*"}
+        if start is not None:
+            headers["Range"] = f"bytes={start}-{end}"
+
+        return self.session.get(url, headers=headers, stream=True)
+
+
+def _parse_content_range(response: PinataResponse) -> Tuple[int, int, int]:
+    value = response.headers.get("Content-Range", "")
+    match = _CONTENT_RANGE.fullmatch(value.strip())
+    if not match:
+        raise GatewayError(f"Unexpected Content-Range '{value}'.")
+
+    start, end, total = (int(group) for group in match.groups())
+    return start, end, total
+
+
+def _entry_name(cid: str) -> str:
+    # Paths inside a CID are part of the key, with their slashes escaped.
+    return quote(cid, safe="")
+
+
+def _unlink(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+__all__ = ["ContentCache", "GatewayClient"]
@@ -0,0 +1,255 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pinata.clients.data import DataClient
+
+DEFAULT_INDEX_PATH = Path.home() / ".pinata" / "pins.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pins (
+    key TEXT PRIMARY KEY,
+    ipfs_pin_hash TEXT NOT NULL,
+    name TEXT,
+    size INTEGER,
+    date_pinned TEXT,
+    date_unpinned TEXT,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pins_name ON pins (name, date_pinned);
+CREATE INDEX IF NOT EXISTS pins_hash ON pins (ipfs_pin_hash);
+CREATE INDEX IF NOT EXISTS pins_date ON pins (date_pinned);
+CREATE INDEX IF NOT EXISTS pins_size ON pins (size);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_PIN_WATERMARK = "pin_watermark"
+_UNPIN_WATERMARK = "unpin_watermark"
+_LAST_SYNC = "last_sync"
+_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+_SYNC_BATCH_SIZE = 1000
+
+
+class PinIndex:
+    """
+    A local, on-disk index of your pins. It is kept up-to-date incrementally: each
+    :meth:`sync` only requests pins pinned (or unpinned) since the previous sync, and lookups
+    are answered from the index without any network requests.
+
+    Args:
+        path (pathlib.Path): The path to the SQLite index file.
+        max_age (Optional[float]): The number of seconds after a sync before the index is
+          considered stale. ``None`` means it only goes stale when it was never synced.
+    """
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH, max_age: Optional[float] = None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """
+        The UNIX time of the last successful sync, if there was one.
+        """
+
+        value = self._get_state(_LAST_SYNC)
+        return float(value) if value else None
+
+    @property
+    def is_stale(self) -> bool:
+        last_sync = self.last_sync
+        if last_sync is None:
+            return True
+
+        return self.max_age is not None and time.time() - last_sync > self.max_age
+
+    def sync(self, data_client: DataClient) -> int:
+        """
+        Bring the index up-to-date with the pins on Pinata.
+
+        Args:
+            data_client (:class:`~pinata.clients.data.DataClient`): The client to
+              request pins with.
+
+        Returns:
+            int: The number of pin records that were added or updated.
+        """
+
+        sync_start = datetime.utcnow().strftime(_DATE_FORMAT)[:-3] + "Z"
+        pin_watermark = self._get_state(_PIN_WATERMARK)
+        unpin_watermark = self._get_state(_UNPIN_WATERMARK)
+        rows = data_client.iter_pins(pin_start=pin_watermark, status="all")
+        if unpin_watermark:
+            unpinned = data_client.iter_pins(unpin_start=unpin_watermark, status="unpinned")
+            rows = chain(rows, unpinned)
+
+        # Unpins only need to be searched for from the first sync onwards.
+        pin_dates: List[Optional[str]] = []
+        unpin_dates: List[Optional[str]] = [unpin_watermark or sync_start]
+        count = 0
+        # Pages are fetched without holding the lock, so lookups aren't blocked by the
+        # network. The watermarks only move once every batch is written; a sync that
+        # fails part way fetches the same pins again next time.
+        for batch in _batches(rows, _SYNC_BATCH_SIZE):
+            records = [_to_record(r) for r in batch]
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO pins VALUES (?, ?, ?, ?, ?, ?, ?)", records
+                )
+
+            pin_dates.append(max((r.get("date_pinned") or "" for r in batch), default=None))
+            unpin_dates.append(max((r.get("date_unpinned") or "" for r in batch), default=None))
+            count += len(batch)
+
+        with self._lock, self._connection:
+            self._set_watermark(_PIN_WATERMARK, pin_dates)
+            self._set_watermark(_UNPIN_WATERMARK, unpin_dates)
+            self._set_state(_LAST_SYNC, str(time.time()))
+
+        return count
+
+    def get_hash(self, name: str) -> Optional[str]:
+        """
+        Get the hash of the most recently pinned content with the given name.
+
+        Args:
+            name (str): The name of the pin.
+
+        Returns:
+            Optional[str]: The content IPFS hash str.
+        """
+
+        row = self._query_one(
+            "SELECT ipfs_pin_hash FROM pins WHERE name = ? AND date_unpinned IS NULL "
+            "ORDER BY date_pinned DESC LIMIT 1",
+            (name,),
+        )
+        return row["ipfs_pin_hash"] if row else None
+
+    def get_metadata(self, content_hash: str) -> Optional[Dict]:
+        """
+        Get the full pin record Pinata returned for the given hash.
+
+        Args:
+            content_hash (str): The content IPFS hash str.
+
+        Returns:
+            Optional[Dict]
+        """
+
+        row = self._query_one(
+            "SELECT row FROM pins WHERE ipfs_pin_hash = ? ORDER BY date_pinned DESC LIMIT 1",
+            (content_hash,),
+        )
+        return json.loads(row["row"]) if row else None
+
+    def search(
+        self,
+        pin_start: Optional[str] = None,
+        pin_end: Optional[str] = None,
+        pin_size_min: Optional[int] = None,
+        pin_size_max: Optional[int] = None,
+        status: str = "pinned",
+    ) -> List[Dict]:
+        """
+        Search the indexed pins. The arguments have the same meaning as in
+        :meth:`~pinata.clients.data.DataClient.search_pins`.
+
+        Returns:
+            List[Dict]: The pin records, most recently pinned first.
+        """
+
+        clauses = []
+        params: List = []
+        for clause, value in (
+            ("date_pinned >= ?", pin_start),
+            ("date_pinned <= ?", pin_end),
+            ("size >= ?", pin_size_min),
+            ("size <= ?", pin_size_max),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        if status == "pinned":
+            clauses.append("date_unpinned IS NULL")
+        elif status == "unpinned":
+            clauses.append("date_unpinned IS NOT NULL")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT row FROM pins {where} ORDER BY date_pinned DESC"
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+
+        return [json.loads(r["row"]) for r in rows]
+
+    def close(self):
+        self._connection.close()
+
+    def _query_one(self, query: str, params) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchone()
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._query_one("SELECT value FROM sync_state WHERE key = ?", (key,))
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str):
+        self._connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    def _set_watermark(self, key: str, dates: Iterable[Optional[str]]):
+        newest = max((d for d in dates if d), default=None)
+        if newest is None:
+            return
+
+        current = self._connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        if current is None or newest > current["value"]:
+            self._set_state(key, newest)
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _key(row: Dict) -> str:
+    return row.get("id") or row["ipfs_pin_hash"]
+
+
+def _to_record(row: Dict) -> tuple:
+    metadata = row.get("metadata") or {}
+    return (
+        _key(row),
+        row["ipfs_pin_hash"],
+        metadata.get("name"),
+        row.get("size"),
+        row.get("date_pinned"),
+        row.get("date_unpinned"),
+        json.dumps(row),
+    )
+
+
+__all__ = ["PinIndex"]
@@ -0,0 +1,337 @@
+import threading
+from collections import Counter
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pinata.bulk import DEFAULT_MAX_WORKERS
+from pinata.clients.pinning import PinningClient
+from pinata.exceptions import PinJobError
+from pinata.logger import logger
+
+# The statuses of jobs Pinata gave up on. Other jobs are still being pinned, e.g.
+# "prechecking" or "retrieving", and pinned ones leave the listing.
+FAILED_STATUSES = frozenset(
+    {"expired", "over_free_limit", "over_max_size", "invalid_object", "bad_host_node"}
+)
+MAX_JOB_PAGE_LIMIT = 1000
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 30.0
+
+
+class PinJobStats(NamedTuple):
+    """
+    A snapshot of a :class:`PinJobTracker`. ``statuses`` counts the jobs of the account's
+    whole pin queue by status as of the last poll, including jobs the tracker didn't add.
+    """
+
+    submitting: int
+    queued: int
+    pinned: int
+    failed: int
+    polls: int
+    poll_interval: float
+    statuses: Dict[str, int]
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of jobs in the account's pin queue that are still being pinned.
+        """
+
+        return sum(n for status, n in self.statuses.items() if status not in FAILED_STATUSES)
+
+
+class PinJobTracker:
+    """
+    Adds hashes to Pinata's pin queue and tracks when they are pinned. Hashes are
+    submitted concurrently, and one background poller follows all of them through the
+    ``pinJobs`` listing, instead of each hash being polled on its own. The poller polls
+    every ``min_interval`` seconds while the queue changes, backs off up to
+    ``max_interval`` while it doesn't, and stops when no tracked job is left.
+
+    Each hash gets a :class:`~concurrent.futures.Future` that resolves to the hash once it
+    is pinned, or raises :class:`~pinata.exceptions.PinJobError` if Pinata gives up on it,
+    or the error of adding it to the queue. :meth:`cancel` stops tracking the hashes that
+    aren't done.
+
+    Args:
+        pinning_client (:class:`~pinata.clients.pinning.PinningClient`): The client to add
+          and poll the jobs with.
+        max_workers (int): The number of hashes to add to the queue at the same time.
+        min_interval (float): The seconds between polls while jobs progress.
+        max_interval (float): The most seconds between polls.
+        backoff (float): What the interval is multiplied by after a poll without progress.
+    """
+
+    def __init__(
+        self,
+        pinning_client: PinningClient,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = 2.0,
+    ):
+        self.pinning = pinning_client
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures: Dict[str, Future] = {}
+        # Queued hashes, with the number of consecutive listings they were missing from.
+        self._queued: Dict[str, int] = {}
+        self._submitting = 0
+        self._pinned = 0
+        self._failed = 0
+        self._polls = 0
+        self._interval = min_interval
+        self._statuses: Dict[str, int] = {}
+        self._poller: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._closed = False
+
+    def __repr__(self) -> str:
+        stats = self.stats
+        return (
+            f"<PinJobTracker submitting={stats.submitting} queued={stats.queued} "
+            f"pinned={stats.pinned} failed={stats.failed}>"
+        )
+
+    def __enter__(self) -> "PinJobTracker":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def stats(self) -> PinJobStats:
+        with self._lock:
+            return PinJobStats(
+                self._submitting,
+                len(self._queued),
+                self._pinned,
+                self._failed,
+                self._polls,
+                self._interval,
+                dict(self._statuses),
+            )
+
+    def submit(self, hash_: str, callback: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Add a hash to the pin queue. A hash that is still tracked isn't added again; its
+        future is returned instead.
+
+        Args:
+            hash_ (str): The hash to pin.
+            callback (Optional[Callable[[Future], None]]): Called with the hash's future
+              once it is done.
+
+        Returns:
+            :class:`~concurrent.futures.Future`
+        """
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit hashes to a closed tracker.")
+
+            future = self._futures.get(hash_)
+            if future is None or future.done():
+                future = self._futures[hash_] = Future()
+                self._submitting += 1
+                self._executor.submit(self._add_to_queue, hash_, future)
+
+        if callback:
+            future.add_done_callback(callback)
+
+        return future
+
+    def submit_many(
+        self, hashes: Iterable[str], callback: Optional[Callable[[Future], None]] = None
+    ) -> Dict[str, Future]:
+        """
+        Add many hashes to the pin queue.
+
+        Args:
+            hashes (Iterable[str]): The hashes to pin.
+            callback (Optional[Callable[[Future], None]]): Called with each hash's future
+              once it is done.
+
+        Returns:
+            Dict[str, :class:`~concurrent.futures.Future`]: The future of each hash.
+        """
+
+        return {hash_: self.submit(hash_, callback) for hash_ in hashes}
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted hash is pinned or failed.
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait.
+
+        Returns:
+            bool: ``True`` when every hash is done.
+        """
+
+        with self._lock:
+            futures = list(self._futures.values())
+
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting hashes.
+
+        Args:
+            wait (bool): Wait until every submitted hash is pinned or failed. Otherwise,
+              the poller keeps resolving them in the background.
+        """
+
+        with self._lock:
+            self._closed = True
+
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self.wait()
+
+    def cancel(self):
+        """
+        Stop accepting hashes and stop tracking the ones that aren't done: hashes that
+        weren't added to the pin queue yet aren't added, and the poller stops. The futures
+        of those hashes raise :class:`~concurrent.futures.CancelledError`. Pinata keeps
+        trying to pin the hashes already in its queue.
+        """
+
+        with self._lock:
+            self._closed = True
+            queued = [self._futures[hash_] for hash_ in self._queued]
+            self._queued.clear()
+            # Hashes waiting for a worker; those being added are cancelled once they are.
+            for future in self._futures.values():
+                future.cancel()
+
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
+        for future in queued:
+            future.set_exception(CancelledError())
+
+        if queued:
+            logger.debug(f"Stopped tracking {len(queued)} queued pin jobs.")
+
+    def _add_to_queue(self, hash_: str, future: Future):
+        if not future.set_running_or_notify_cancel():
+            with self._lock:
+                self._submitting -= 1
+
+            return
+
+        try:
+            self.pinning.pin_hash(hash_)
+        except Exception as err:
+            with self._lock:
+                self._submitting -= 1
+                self._failed += 1
+
+            future.set_exception(err)
+            return
+
+        with self._lock:
+            self._submitting -= 1
+            cancelled = self._stopped.is_set()
+            if not cancelled:
+                self._queued[hash_] = 0
+
+            if not cancelled and self._poller is None:
+                self._interval = self.min_interval
+                self._poller = threading.Thread(target=self._poll_until_done, daemon=True)
+                self._poller.start()
+
+        if cancelled:
+            future.set_exception(CancelledError())
+
+    def _poll_until_done(self):
+        while True:
+            if self._stopped.wait(self._interval):
+                with self._lock:
+                    self._poller = None
+
+                return
+
+            with self._lock:
+                if not self._queued:
+                    self._poller = None
+                    return
+
+            try:
+                jobs, complete = self._list_jobs()
+            except Exception as err:
+                logger.warning(f"Unable to list pin jobs: {err}")
+                with self._lock:
+                    self._interval = min(self._interval * self.backoff, self.max_interval)
+
+                continue
+
+            self._update(jobs, complete)
+
+    def _list_jobs(self) -> Tuple[Dict[str, str], bool]:
+        # Get the status of every job in the queue, and whether they fit in one page.
+        jobs: Dict[str, str] = {}
+        offset = 0
+        while True:
+            response = self.pinning.list_pin_jobs(
+                sort="ASC", limit=MAX_JOB_PAGE_LIMIT, offset=offset
+            )
+            rows = response["rows"]
+            for row in rows:
+                # A hash queued again after it failed has a job of each; the new one wins.
+                if jobs.get(row["ipfs_pin_hash"]) in (None, *FAILED_STATUSES):
+                    jobs[row["ipfs_pin_hash"]] = row["status"]
+
+            if len(rows) < MAX_JOB_PAGE_LIMIT:
+                return jobs, offset == 0
+
+            offset += len(rows)
+
+    def _update(self, jobs: Dict[str, str], complete: bool):
+        done: List[Tuple[Future, Optional[Exception], str]] = []
+        with self._lock:
+            for hash_, misses in list(self._queued.items()):
+                status = jobs.get(hash_)
+                if status is None:
+                    # A job can move between pages while they are fetched and be missed,
+                    # so listings of several pages must agree that it is gone.
+                    if complete or misses:
+                        del self._queued[hash_]
+                        self._pinned += 1
+                        done.append((self._futures[hash_], None, hash_))
+                    else:
+                        self._queued[hash_] = 1
+                elif status in FAILED_STATUSES:
+                    del self._queued[hash_]
+                    self._failed += 1
+                    done.append((self._futures[hash_], PinJobError(hash_, status), hash_))
+                else:
+                    self._queued[hash_] = 0
+
+            statuses = dict(Counter(jobs.values()))
+            if done or statuses != self._statuses:
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self._interval * self.backoff, self.max_interval)
+
+            self._statuses = statuses
+            self._polls += 1
+            logger.debug(
+                f"Polled {len(jobs)} pin jobs: {len(done)} done, {len(self._queued)} tracked, "
+                f"next poll in {self._interval:.1f}s."
+            )
+
+        for future, error, hash_ in done:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(hash_)
+
+
+__all__ = ["PinJobStats", "PinJobTracker"]
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pinata.logger import logger
+
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_FSYNC_EVERY = 100
+
+
+class JournalEntry(NamedTuple):
+    """
+    A completed pin, recorded in a :class:`PinJournal`.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    cid: str
+
+
+class PinJournal:
+    """
+    An append-only log of completed pins, so that an interrupted batch job can resume
+    where it stopped instead of pinning everything again. Each completed pin is recorded
+    with the size and modification time the file had, so files that changed since are
+    pinned again. A directory is recorded with the total size of the files in it and the
+    latest modification time of its files and sub-directories, so adding, removing,
+    renaming or changing any of them pins it again.
+
+    Entries are written in batches: they are flushed and ``fsync``-ed to disk when an
+    entry is recorded and ``fsync_every`` entries are waiting or ``fsync_interval``
+    seconds passed since the last flush, and on :meth:`flush` and :meth:`close`. There is
+    no background flush, so entries recorded just before a pause wait for the next
+    record. A crash loses at most the unflushed entries, and those pins are simply
+    redone. A partly written last line is ignored when loading.
+
+    Args:
+        path (pathlib.Path): The path of the journal file. Entries are appended to an
+          existing journal.
+        fsync_interval (float): The number of seconds after which the next recorded entry
+          flushes the waiting ones.
+        fsync_every (int): The maximum number of entries waiting to be flushed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+    ):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.fsync_every = fsync_every
+        self._entries: Dict[str, JournalEntry] = {}
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        needs_newline = self._load()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            # Don't append to a line left incomplete by a crash.
+            self._file.write("\n")
+
+    def __enter__(self) -> "PinJournal":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_cid(self, file_path: Path) -> Optional[str]:
+        """
+        Get the CID a path was pinned with, if it was pinned and has not changed since.
+
+        Args:
+            file_path (pathlib.Path): The pinned path.
+
+        Returns:
+            Optional[str]: The CID, or ``None`` when the path still has to be pinned.
+        """
+
+        entry = self._entries.get(_key(file_path))
+        if entry is None:
+            return None
+
+        try:
+            signature = _signature(file_path)
+        except OSError:
+            return None
+
+        if signature != (entry.size, entry.mtime_ns):
+            return None
+
+        return entry.cid
+
+    def record(self, file_path: Path, cid: str):
+        """
+        Record a completed pin.
+
+        Args:
+            file_path (pathlib.Path): The pinned path.
+            cid (str): The CID of the pinned content.
+        """
+
+        entry = JournalEntry(_key(file_path), *_signature(file_path), cid)
+        line = json.dumps(entry._asdict())
+        with self._lock:
+            self._entries[entry.path] = entry
+            self._pending.append(line)
+            due = time.monotonic() - self._last_flush >= self.fsync_interval
+            if len(self._pending) >= self.fsync_every or due:
+                self._flush()
+
+    def flush(self):
+        """
+        Write all recorded entries to disk.
+        """
+
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+
+    def _flush(self):
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = []
+
+        self._last_flush = time.monotonic()
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+
+        line = ""
+        with open(self.path, encoding="utf-8") as file:
+            for number, line in enumerate(file, start=1):
+                try:
+                    entry = JournalEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    logger.warning(f"Ignoring invalid line {number} of journal '{self.path}'.")
+                    continue
+
+                self._entries[entry.path] = entry
+
+        return bool(line) and not line.endswith("\n")
+
+
+def _key(file_path: Path) -> str:
+    return str(file_path.resolve())
+
+
+def _signature(file_path: Path) -> Tuple[int, int]:
+    # The size and modification time of a file, or aggregated over a directory tree:
+    # a directory's own size and mtime don't change when a file in it does.
+    stat = file_path.stat()
+    if not file_path.is_dir():
+        return stat.st_size, stat.st_mtime_ns
+
+    size, mtime_ns = 0, stat.st_mtime_ns
+    for root, _, file_names in os.walk(file_path):
+        mtime_ns = max(mtime_ns, os.stat(root).st_mtime_ns)
+        for file_name in file_names:
+            file_stat = os.stat(os.path.join(root, file_name))
+            size += file_stat.st_size
+            mtime_ns = max(mtime_ns, file_stat.st_mtime_ns)
+
+    return size, mtime_ns
+
+
+__all__ = ["JournalEntry", "PinJournal"]
@@ -0,0 +1,191 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+# Parser states
+_START = "start"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_AFTER_VALUE = "after value"
+_ITEM = "item"
+_AFTER_ITEM = "after item"
+_END = "end"
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class JSONArrayParser:
+    """
+    Incrementally parses a JSON object, such as a ``pinList`` response, and returns the
+    items of one of its arrays as soon as each one is complete. Only the item being parsed
+    is held in memory, no matter how long the array is. The object's other fields are
+    collected in :attr:`fields`.
+
+    Args:
+        key (str): The name of the array field, e.g. ``"rows"``.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._state = _START
+        self._field: Optional[str] = None
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the document.
+
+        Args:
+            data (bytes): The chunk, split anywhere.
+
+        Returns:
+            List[Any]: The array items completed by this chunk.
+        """
+
+        self._append(self._utf8.decode(data))
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """
+        Finish parsing once the whole document has been fed.
+
+        Returns:
+            List[Any]: Any remaining array items.
+
+        Raises:
+            ValueError: When the document is incomplete or not valid JSON.
+        """
+
+        self._append(self._utf8.decode(b"", final=True))
+        self._eof = True
+        items = self._parse()
+        if self._state != _END:
+            raise ValueError("The JSON document ended unexpectedly.")
+
+        return items
+
+    def _append(self, text: str):
+        # Drop what has been parsed already, so the buffer only holds the current value.
+        pos = self._pos
+        self._buffer = self._buffer[pos:] + text
+        self._pos = 0
+
+    def _parse(self) -> List[Any]:
+        items: List[Any] = []
+        try:
+            while self._state != _END:
+                self._step(items)
+
+            if self._peek(required=False):
+                raise ValueError("Unexpected data after the JSON document.")
+        except _NeedMoreData:
+            pass
+
+        return items
+
+    def _step(self, items: List[Any]):
+        state = self._state
+        char = self._peek()
+        if state == _START:
+            self._expect(char, "{")
+            self._state = _KEY
+        elif state == _KEY:
+            if char == "}":
+                self._pos += 1
+                self._state = _END
+            else:
+                self._field = self._decode()
+                if not isinstance(self._field, str):
+                    raise ValueError("Expected an object key.")
+
+                self._state = _COLON
+        elif state == _COLON:
+            self._expect(char, ":")
+            self._state = _VALUE
+        elif state == _VALUE:
+            if self._field == self.key:
+                self._expect(char, "[")
+                self._state = _ITEM
+            else:
+                self.fields[self._field] = self._decode()  # type: ignore[index]
+                self._state = _AFTER_VALUE
+        elif state == _AFTER_VALUE:
+            self._expect(char, ",}")
+            self._state = _KEY if char == "," else _END
+        elif state == _ITEM:
+            if char == "]":
+                self._pos += 1
+                self._state = _AFTER_VALUE
+            else:
+                items.append(self._decode())
+                self._state = _AFTER_ITEM
+        elif state == _AFTER_ITEM:
+            self._expect(char, ",]")
+            self._state = _ITEM if char == "," else _AFTER_VALUE
+
+    def _peek(self, required: bool = True) -> str:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+        if self._pos < len(self._buffer):
+            return self._buffer[self._pos]
+        elif required and not self._eof:
+            raise _NeedMoreData()
+        elif required:
+            raise ValueError("The JSON document ended unexpectedly.")
+
+        return ""
+
+    def _expect(self, char: str, expected: str):
+        if char not in expected:
+            raise ValueError(f"Expected one of '{expected}' at '{char}'.")
+
+        self._pos += 1
+
+    def _decode(self) -> Any:
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+
+            raise _NeedMoreData()
+
+        # A number at the end of the buffer may continue in the next chunk.
+        if end == len(self._buffer) and not self._eof:
+            raise _NeedMoreData()
+
+        self._pos = end
+        return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield the items of the array ``key`` of the JSON object read from ``chunks``, one at
+    a time.
+
+    Args:
+        chunks (Iterable[bytes]): The document, e.g. from ``Response.iter_content()``.
+        key (str): The name of the array field.
+
+    Returns:
+        Iterator[Any]
+    """
+
+    parser = JSONArrayParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+    yield from parser.close()
+
+
+__all__ = ["JSONArrayParser", "iter_json_array"]
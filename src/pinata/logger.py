@@ -1,8 +1,101 @@
 import logging
+import re
 import sys
+from typing import Any, Union
+
+from pinata import codec
 
 logger = logging.getLogger("pinata")
 logger.addHandler(logging.StreamHandler(sys.stderr))
 
+DEFAULT_MAX_LOGGED_BODY_SIZE = 2048
+REDACTED = "<redacted>"
+
+# Keys whose values are never logged, e.g. when generating API keys.
+SENSITIVE_KEYS = frozenset(
+    {
+        "api_key",
+        "api_secret",
+        "authorization",
+        "jwt",
+        "password",
+        "pinata_api_key",
+        "pinata_api_secret",
+        "pinata_secret_api_key",
+        "secret",
+        "token",
+    }
+)
+_SENSITIVE_VALUE = re.compile(
+    r'("(?:%s)"\s*:\s*)"(?:[^"\\]|\\.)*"?' % "|".join(sorted(SENSITIVE_KEYS)), re.IGNORECASE
+)
+
+_max_logged_body_size = DEFAULT_MAX_LOGGED_BODY_SIZE
+
+
+def is_debug_enabled() -> bool:
+    """
+    Check whether debug messages are logged, so that callers can skip building them.
+    """
+
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+def set_max_logged_body_size(size: int):
+    """
+    Set the number of characters of request and response bodies included in debug logs.
+
+    Args:
+        size (int): The maximum number of characters. ``0`` leaves bodies out altogether.
+    """
+
+    global _max_logged_body_size
+    _max_logged_body_size = size
+
+
+def format_body(body: Union[bytes, str, dict, list, Any]) -> str:
+    """
+    Format a request or response body for debug logs: sensitive values are redacted and
+    the result is cut off after the size set with :func:`set_max_logged_body_size`. Only
+    the part of a ``bytes`` body that is logged gets decoded.
+    """
+
+    limit = _max_logged_body_size
+    if not limit:
+        return "<omitted>"
+
+    if isinstance(body, (dict, list)):
+        text = codec.dumps(_redact(body), indent=True).decode()
+        size = len(text)
+    elif isinstance(body, (bytes, bytearray)):
+        text = bytes(body[:limit]).decode("utf-8", errors="replace")
+        size = len(body)
+    else:
+        text = str(body)
+        size = len(text)
+
+    text = _SENSITIVE_VALUE.sub(rf'\1"{REDACTED}"', text[:limit])
+    if size > limit:
+        text += f"... ({size} total)"
+
+    return text
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SENSITIVE_KEYS else _redact(v)
+            for k, v in value.items()
+        }
+    elif isinstance(value, list):
+        return [_redact(v) for v in value]
+
+    return value
+
 
-__all__ = ["logger"]
+__all__ = [
+    "format_body",
+    "is_debug_enabled",
+    "logger",
+    "set_max_logged_body_size",
+]
@@ -0,0 +1,360 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_MAX_SAMPLES = 10000
+PHASES = ("total", "connect", "tls", "upload", "ttfb", "body")
+
+# Hashes in paths, e.g. '/pinning/unpin/<hash>', would make every request its own endpoint.
+_HASH_SEGMENT = re.compile(r"^(Qm[1-9A-HJ-NP-Za-km-z]{44}|b[a-z2-7]{58,})$")
+
+
+class RequestTimings(NamedTuple):
+    """
+    Where the time of a request went, in seconds. ``connect`` and ``tls`` are ``0`` when a
+    pooled connection was reused.
+    """
+
+    connect: float = 0.0
+    tls: float = 0.0
+    upload: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    total: float = 0.0
+
+
+class RequestEvent(NamedTuple):
+    """
+    Emitted to the hooks of a :class:`~pinata.session.PinataAPISession` once per request,
+    after its last attempt.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status_code: Optional[int]
+    retries: int
+    elapsed: float
+    timings: RequestTimings
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Optional[Exception] = None
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+def get_endpoint(url: str) -> str:
+    """
+    Get the path of a request URL, with content hashes replaced by ``{hash}``.
+    """
+
+    segments = urlparse(url).path.split("/")
+    return "/".join("{hash}" if _HASH_SEGMENT.match(s) else s for s in segments)
+
+
+class TimingRecorder:
+    """
+    Collects the timings of one request attempt from the instrumented connections.
+    """
+
+    __slots__ = ("tcp", "connect", "upload", "ttfb", "total")
+
+    def __init__(self):
+        self.tcp = 0.0
+        self.connect = 0.0
+        self.upload = 0.0
+        self.ttfb = 0.0
+        self.total = 0.0
+
+    @property
+    def timings(self) -> RequestTimings:
+        tls = max(0.0, self.connect - self.tcp)
+        body = max(0.0, self.total - self.connect - self.upload - self.ttfb)
+        return RequestTimings(self.tcp, tls, self.upload, self.ttfb, body, self.total)
+
+
+_local = threading.local()
+
+
+@contextmanager
+def record_timings(recorder: TimingRecorder) -> Iterator[TimingRecorder]:
+    """
+    Record the timings of the requests sent by this thread within the context.
+    """
+
+    _local.recorder = recorder
+    start = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        recorder.total = time.perf_counter() - start
+        _local.recorder = None
+
+
+def _active_recorder() -> Optional[TimingRecorder]:
+    return getattr(_local, "recorder", None)
+
+
+class _InstrumentedConnectionMixin:
+    def _new_conn(self):
+        recorder = _active_recorder()
+        if recorder is None:
+            return super()._new_conn()  # type: ignore[misc]
+
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()  # type: ignore[misc]
+        finally:
+            recorder.tcp += time.perf_counter() - start
+
+    def connect(self):
+        recorder = _active_recorder()
+        if recorder is None:
+            return super().connect()  # type: ignore[misc]
+
+        start = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        finally:
+            recorder.connect += time.perf_counter() - start
+
+    def request(self, *args, **kwargs):
+        return self._timed_upload(super().request, *args, **kwargs)  # type: ignore[misc]
+
+    def request_chunked(self, *args, **kwargs):
+        # Only exists in urllib3 < 2.
+        return self._timed_upload(super().request_chunked, *args, **kwargs)  # type: ignore
+
+    def getresponse(self, *args, **kwargs):
+        recorder = _active_recorder()
+        if recorder is None:
+            return super().getresponse(*args, **kwargs)  # type: ignore[misc]
+
+        start = time.perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)  # type: ignore[misc]
+        finally:
+            recorder.ttfb += time.perf_counter() - start
+
+    def _timed_upload(self, send, *args, **kwargs):
+        recorder = _active_recorder()
+        if recorder is None:
+            return send(*args, **kwargs)
+
+        # Connections may be opened lazily while sending the request.
+        start = time.perf_counter()
+        connect = recorder.connect
+        try:
+            return send(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            recorder.upload += elapsed - (recorder.connect - connect)
+
+
+class _InstrumentedHTTPConnection(_InstrumentedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _InstrumentedHTTPSConnection(_InstrumentedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _InstrumentedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _InstrumentedHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _InstrumentedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    A transport adapter whose connections report their connect, TLS, upload and
+    time-to-first-byte timings to :func:`record_timings`.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "samples")
+
+    def __init__(self, buckets: Tuple[float, ...], max_samples: int):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _EndpointStats:
+    def __init__(self, buckets: Tuple[float, ...], max_samples: int):
+        self.histograms = {phase: _Histogram(buckets, max_samples) for phase in PHASES}
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+
+class HistogramCollector:
+    """
+    A request hook that keeps latency histograms per endpoint and per phase of the
+    request. Quantiles are computed over the most recent ``max_samples`` requests of each
+    endpoint, while the exported histograms count every request.
+
+    Args:
+        buckets (Tuple[float, ...]): The upper bounds of the histogram buckets in seconds.
+        max_samples (int): The number of recent samples kept per endpoint and phase.
+    """
+
+    def __init__(
+        self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, max_samples: int = DEFAULT_MAX_SAMPLES
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.max_samples = max_samples
+        self._stats: Dict[Tuple[str, str], _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        values = event.timings._replace(total=event.elapsed)
+        status = str(event.status_code) if event.status_code is not None else "error"
+        with self._lock:
+            key = (event.method, event.endpoint)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats(self.buckets, self.max_samples)
+
+            for phase in PHASES:
+                stats.histograms[phase].observe(getattr(values, phase))
+
+            stats.statuses[status] += 1
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            stats.retries += event.retries
+
+    def quantiles(
+        self, phase: str = "total", qs: Tuple[float, ...] = (0.5, 0.95, 0.99)
+    ) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Get latency quantiles per endpoint.
+
+        Args:
+            phase (str): One of ``total``, ``connect``, ``tls``, ``upload``, ``ttfb`` and
+              ``body``.
+            qs (Tuple[float, ...]): The quantiles to compute.
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, float]]: The quantiles, keyed as ``"p50"``,
+            for every ``(method, endpoint)``.
+        """
+
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase '{phase}'.")
+
+        with self._lock:
+            return {
+                key: {f"p{q * 100:g}": stats.histograms[phase].quantile(q) for q in qs}
+                for key, stats in self._stats.items()
+            }
+
+    def to_prometheus(self, prefix: str = "pinata") -> str:
+        """
+        Export the collected metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): The prefix of the metric names.
+
+        Returns:
+            str
+        """
+
+        duration = f"{prefix}_request_duration_seconds"
+        lines: List[str] = [
+            f"# HELP {duration} Time spent on Pinata API requests, by phase.",
+            f"# TYPE {duration} histogram",
+        ]
+        counters: Dict[str, List[str]] = defaultdict(list)
+        with self._lock:
+            for (method, endpoint), stats in sorted(self._stats.items()):
+                labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+                for phase in PHASES:
+                    histogram = stats.histograms[phase]
+                    phase_labels = f'{labels},phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{duration}_bucket{{{phase_labels},le="{bound:g}"}} {cumulative}'
+                        )
+
+                    lines.append(f'{duration}_bucket{{{phase_labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{duration}_sum{{{phase_labels}}} {histogram.sum}")
+                    lines.append(f"{duration}_count{{{phase_labels}}} {histogram.count}")
+
+                for status, count in sorted(stats.statuses.items()):
+                    counters["requests_total"].append(f'{{{labels},status="{status}"}} {count}')
+
+                counters["request_bytes_sent_total"].append(f"{{{labels}}} {stats.bytes_sent}")
+                counters["response_bytes_received_total"].append(
+                    f"{{{labels}}} {stats.bytes_received}"
+                )
+                counters["request_retries_total"].append(f"{{{labels}}} {stats.retries}")
+
+        for name, help_text in _COUNTERS:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.extend(f"{prefix}_{name}{sample}" for sample in counters[name])
+
+        return "\n".join(lines) + "\n"
+
+
+_COUNTERS = (
+    ("requests_total", "Pinata API requests, by response status."),
+    ("request_bytes_sent_total", "Bytes of request bodies sent."),
+    ("response_bytes_received_total", "Bytes of response bodies received."),
+    ("request_retries_total", "Retried request attempts."),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+__all__ = [
+    "HistogramCollector",
+    "InstrumentedAdapter",
+    "RequestEvent",
+    "RequestHook",
+    "RequestTimings",
+    "get_endpoint",
+    "record_timings",
+]
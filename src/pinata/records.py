@@ -0,0 +1,436 @@
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+Timestamp = Union[str, datetime, float]
+
+_NAN = float("nan")
+_COLUMNS = {
+    "cid": "cids",
+    "name": "name_codes",
+    "size": "sizes",
+    "date_pinned": "dates_pinned",
+    "date_unpinned": "dates_unpinned",
+}
+
+
+class PinRecord:
+    """
+    A compact pin record. Timestamps are parsed once, into POSIX seconds (UTC).
+    """
+
+    __slots__ = ("cid", "name", "size", "date_pinned", "date_unpinned", "keyvalues")
+
+    def __init__(
+        self,
+        cid: str,
+        name: Optional[str] = None,
+        size: int = 0,
+        date_pinned: Optional[float] = None,
+        date_unpinned: Optional[float] = None,
+        keyvalues: Optional[Dict] = None,
+    ):
+        self.cid = cid
+        self.name = name
+        self.size = size
+        self.date_pinned = date_pinned
+        self.date_unpinned = date_unpinned
+        self.keyvalues = keyvalues
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "PinRecord":
+        """
+        Create a record from a row of a ``pinList`` response.
+        """
+
+        metadata = row.get("metadata") or {}
+        return cls(
+            row["ipfs_pin_hash"],
+            name=metadata.get("name"),
+            size=row.get("size") or 0,
+            date_pinned=parse_timestamp(row.get("date_pinned")),
+            date_unpinned=parse_timestamp(row.get("date_unpinned")),
+            keyvalues=metadata.get("keyvalues"),
+        )
+
+    def __repr__(self) -> str:
+        return f"<PinRecord cid={self.cid} name={self.name!r} size={self.size}>"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PinRecord):
+            return NotImplemented
+
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    @property
+    def is_pinned(self) -> bool:
+        return self.date_unpinned is None
+
+    @property
+    def pinned_at(self) -> Optional[datetime]:
+        return _to_datetime(self.date_pinned)
+
+    @property
+    def unpinned_at(self) -> Optional[datetime]:
+        return _to_datetime(self.date_unpinned)
+
+
+class PinTable:
+    """
+    Pin records stored column by column, for filtering, sorting and grouping large numbers
+    of pins in memory. Sizes and timestamps are kept in NumPy arrays when NumPy is
+    installed, and in :mod:`array` arrays otherwise; missing timestamps are ``nan``. Names
+    are stored once each, in sorted order, and referenced by their index in
+    ``name_codes``. All operations return a new table.
+
+    Create tables with :meth:`from_rows` or :meth:`from_records`.
+    """
+
+    def __init__(
+        self,
+        cids: Sequence,
+        name_codes: Sequence,
+        name_values: List[str],
+        sizes: Sequence,
+        dates_pinned: Sequence,
+        dates_unpinned: Sequence,
+    ):
+        self.cids = cids
+        self.name_codes = name_codes
+        self.name_values = name_values
+        self.sizes = sizes
+        self.dates_pinned = dates_pinned
+        self.dates_unpinned = dates_unpinned
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], use_numpy: Optional[bool] = None) -> "PinTable":
+        """
+        Create a table from ``pinList`` rows, e.g. from
+        :meth:`~pinata.clients.data.DataClient.iter_pins`.
+
+        Args:
+            rows (Iterable[Dict]): The rows.
+            use_numpy (Optional[bool]): Store the columns in NumPy arrays. Defaults to
+              whether NumPy is installed.
+        """
+
+        return cls.from_records((PinRecord.from_row(r) for r in rows), use_numpy=use_numpy)
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[PinRecord], use_numpy: Optional[bool] = None
+    ) -> "PinTable":
+        """
+        Create a table from :class:`PinRecord` objects.
+
+        Args:
+            records (Iterable[:class:`PinRecord`]): The records.
+            use_numpy (Optional[bool]): Store the columns in NumPy arrays. Defaults to
+              whether NumPy is installed.
+        """
+
+        use_numpy = np is not None if use_numpy is None else use_numpy
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed.")
+
+        cids: List[str] = []
+        codes_by_name: Dict[str, int] = {}
+        name_codes = array("l")
+        sizes = array("q")
+        dates_pinned = array("d")
+        dates_unpinned = array("d")
+        for record in records:
+            cids.append(record.cid)
+            name_codes.append(codes_by_name.setdefault(record.name or "", len(codes_by_name)))
+            sizes.append(record.size)
+            dates_pinned.append(_NAN if record.date_pinned is None else record.date_pinned)
+            dates_unpinned.append(_NAN if record.date_unpinned is None else record.date_unpinned)
+
+        # Renumber the names in sorted order, so that sorting by name can sort the codes.
+        name_values = sorted(codes_by_name)
+        ranks = [0] * len(name_values)
+        for rank, name in enumerate(name_values):
+            ranks[codes_by_name[name]] = rank
+
+        if not use_numpy:
+            name_codes = array("l", (ranks[code] for code in name_codes))
+            return cls(cids, name_codes, name_values, sizes, dates_pinned, dates_unpinned)
+
+        codes = np.frombuffer(name_codes, dtype=np.dtype(f"i{name_codes.itemsize}"))
+        return cls(
+            np.array(cids, dtype="S") if cids else np.array([], dtype="S1"),
+            np.array(ranks, dtype=np.int64)[codes] if len(codes) else codes.astype(np.int64),
+            name_values,
+            np.frombuffer(sizes, dtype=np.int64).copy(),
+            np.frombuffer(dates_pinned, dtype=np.float64).copy(),
+            np.frombuffer(dates_unpinned, dtype=np.float64).copy(),
+        )
+
+    @property
+    def names(self) -> List[str]:
+        """
+        The name of every record, ``""`` when it has none.
+        """
+
+        return [self.name_values[code] for code in self.name_codes]
+
+    @property
+    def uses_numpy(self) -> bool:
+        return np is not None and isinstance(self.sizes, np.ndarray)
+
+    @property
+    def total_size(self) -> int:
+        return int(self.sizes.sum()) if self.uses_numpy else sum(self.sizes)
+
+    @property
+    def is_pinned(self) -> Sequence[bool]:
+        """
+        A mask of the records that are still pinned.
+        """
+
+        if self.uses_numpy:
+            return np.isnan(self.dates_unpinned)
+
+        return [math.isnan(d) for d in self.dates_unpinned]
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __repr__(self) -> str:
+        return f"<PinTable pins={len(self)} total_size={self.total_size}>"
+
+    def __iter__(self) -> Iterator[PinRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index: int) -> PinRecord:
+        cid = self.cids[index]
+        return PinRecord(
+            cid.decode() if isinstance(cid, bytes) else cid,
+            name=self.name_values[self.name_codes[index]] or None,
+            size=int(self.sizes[index]),
+            date_pinned=_from_float(self.dates_pinned[index]),
+            date_unpinned=_from_float(self.dates_unpinned[index]),
+        )
+
+    def filter(self, mask: Sequence[bool]) -> "PinTable":
+        """
+        Keep the records where ``mask`` is true, e.g. ``table.filter(table.sizes > 1024)``.
+
+        Args:
+            mask (Sequence[bool]): One boolean per record.
+        """
+
+        if len(mask) != len(self):
+            raise ValueError("The mask must have one value per record.")
+
+        if self.uses_numpy:
+            return self._take(np.flatnonzero(np.asarray(mask, dtype=bool)))
+
+        return self._take([i for i, keep in enumerate(mask) if keep])
+
+    def where(
+        self,
+        status: Optional[str] = None,
+        pinned_after: Optional[Timestamp] = None,
+        pinned_before: Optional[Timestamp] = None,
+        size_min: Optional[int] = None,
+        size_max: Optional[int] = None,
+        cid_prefix: Optional[str] = None,
+    ) -> "PinTable":
+        """
+        Keep the records matching all the given conditions.
+
+        Args:
+            status (Optional[str]): ``"pinned"`` or ``"unpinned"``.
+            pinned_after (Optional[Union[str, datetime, float]]): Exclude records pinned
+              before this time.
+            pinned_before (Optional[Union[str, datetime, float]]): Exclude records pinned
+              after this time.
+            size_min (Optional[int]): The minimum size in bytes.
+            size_max (Optional[int]): The maximum size in bytes.
+            cid_prefix (Optional[str]): Only CIDs starting with this prefix.
+        """
+
+        if self.uses_numpy:
+            mask = np.ones(len(self), dtype=bool)
+            if status is not None:
+                mask &= self.is_pinned if status == "pinned" else ~self.is_pinned
+            if pinned_after is not None:
+                mask &= self.dates_pinned >= _to_timestamp(pinned_after)
+            if pinned_before is not None:
+                mask &= self.dates_pinned <= _to_timestamp(pinned_before)
+            if size_min is not None:
+                mask &= self.sizes >= size_min
+            if size_max is not None:
+                mask &= self.sizes <= size_max
+            if cid_prefix is not None:
+                mask &= np.char.startswith(self.cids, cid_prefix.encode())
+
+            return self.filter(mask)
+
+        after = _to_timestamp(pinned_after) if pinned_after is not None else None
+        before = _to_timestamp(pinned_before) if pinned_before is not None else None
+        pinned = self.is_pinned
+
+        def matches(i: int) -> bool:
+            date = self.dates_pinned[i]
+            size = self.sizes[i]
+            return (
+                (status is None or pinned[i] == (status == "pinned"))
+                and (after is None or date >= after)
+                and (before is None or date <= before)
+                and (size_min is None or size >= size_min)
+                and (size_max is None or size <= size_max)
+                and (cid_prefix is None or self.cids[i].startswith(cid_prefix))
+            )
+
+        return self._take([i for i in range(len(self)) if matches(i)])
+
+    def sort(self, by: str = "date_pinned", descending: bool = False) -> "PinTable":
+        """
+        Sort the records by a column. Records with missing dates sort last.
+
+        Args:
+            by (str): One of ``cid``, ``name``, ``size``, ``date_pinned`` and
+              ``date_unpinned``.
+            descending (bool): Sort from largest to smallest.
+        """
+
+        column = self._column(by)
+        if self.uses_numpy:
+            if not descending:
+                order = np.argsort(column, kind="stable")
+            elif column.dtype.kind in "if":
+                order = np.argsort(-column, kind="stable")
+            else:
+                # A stable descending sort: equal values keep their order.
+                order = len(self) - 1 - np.argsort(column[::-1], kind="stable")[::-1]
+
+            return self._take(order)
+
+        present = [i for i in range(len(self)) if not _is_missing(column[i])]
+        missing = [i for i in range(len(self)) if _is_missing(column[i])]
+        order = sorted(present, key=column.__getitem__, reverse=descending) + missing
+        return self._take(order)
+
+    def group_by(self, key: Union[str, Sequence]) -> Dict[Any, "PinTable"]:
+        """
+        Split the table into one table per distinct key, e.g. ``table.group_by("name")``
+        to find content pinned under the same name, or
+        ``table.group_by(table.dates_pinned // 86400)`` to group by day.
+
+        Args:
+            key (Union[str, Sequence]): A column name, or one key per record.
+
+        Returns:
+            Dict[Any, :class:`PinTable`]: The tables, keyed by the distinct keys in order.
+              Records with a missing (``nan``) key are grouped last, under a single ``nan``.
+        """
+
+        keys = self._column(key) if isinstance(key, str) else key
+        is_name = isinstance(key, str) and key == "name"
+        to_key = self.name_values.__getitem__ if is_name else _to_python
+        if len(keys) != len(self):
+            raise ValueError("The keys must have one value per record.")
+
+        if self.uses_numpy:
+            unique, inverse = np.unique(np.asarray(keys), return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.cumsum(np.bincount(inverse, minlength=len(unique)))[:-1]
+            groups = np.split(order, bounds)
+            return {to_key(k): self._take(indices) for k, indices in zip(unique.tolist(), groups)}
+
+        indices_by_key: Dict[Any, List[int]] = {}
+        missing: List[int] = []
+        for i, k in enumerate(keys):
+            if _is_missing(k):
+                # nan != nan, so each one would get a group of its own.
+                missing.append(i)
+            else:
+                indices_by_key.setdefault(k, []).append(i)
+
+        groups = {to_key(k): self._take(indices_by_key[k]) for k in sorted(indices_by_key)}
+        if missing:
+            groups[_NAN] = self._take(missing)
+
+        return groups
+
+    def _column(self, name: str) -> Sequence:
+        if name not in _COLUMNS:
+            raise ValueError(f"Unknown column '{name}'.")
+
+        return getattr(self, _COLUMNS[name])
+
+    def _take(self, indices) -> "PinTable":
+        if self.uses_numpy:
+            return PinTable(
+                self.cids[indices],
+                self.name_codes[indices],
+                self.name_values,
+                self.sizes[indices],
+                self.dates_pinned[indices],
+                self.dates_unpinned[indices],
+            )
+
+        return PinTable(
+            [self.cids[i] for i in indices],
+            array("l", (self.name_codes[i] for i in indices)),
+            self.name_values,
+            array("q", (self.sizes[i] for i in indices)),
+            array("d", (self.dates_pinned[i] for i in indices)),
+            array("d", (self.dates_unpinned[i] for i in indices)),
+        )
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an ISO 8601 date string from Pinata, e.g. ``2021-01-01T00:00:00.000Z``, into
+    POSIX seconds.
+    """
+
+    if not value:
+        return None
+
+    if value.endswith("Z"):
+        value = value[:-1]
+
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return date.timestamp()
+
+
+def _to_timestamp(value: Timestamp) -> float:
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    elif isinstance(value, str):
+        return parse_timestamp(value)  # type: ignore[return-value]
+
+    return float(value)
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def _is_missing(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _to_python(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+__all__ = ["PinRecord", "PinTable", "parse_timestamp"]
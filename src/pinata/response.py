@@ -1,22 +1,80 @@
-import json
+from typing import Any, Iterator
 
+from pinata import codec
 from pinata.exceptions import PinataResponseKeyError
+from pinata.json_stream import iter_json_array
+
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class PinataResponse:
-    def __init__(self, requests_response):
+    def __init__(self, requests_response, retries: int = 0, retry_delay: float = 0.0):
         self._response = requests_response
         self._data = None
+        self.retries = retries
+        self.retry_delay = retry_delay
 
     @property
     def data(self):
         try:
-            self._data = self._data or json.loads(self._response.text)
+            self._data = self._data or codec.loads(self._response.content)
         except ValueError:
             self._data = self._response.text or ""
 
         return self._data
 
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def headers(self):
+        return self._response.headers
+
+    def iter_content(self, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Read the body of a response sent with ``stream=True`` in chunks, e.g. to write a
+        download to disk. The response is closed once the body is read.
+
+        Args:
+            chunk_size (int): The number of bytes to read at a time.
+
+        Returns:
+            Iterator[bytes]
+        """
+
+        try:
+            yield from self._response.iter_content(chunk_size)
+        finally:
+            self._response.close()
+
+    def close(self):
+        self._response.close()
+
+    def iter_items(self, key: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        Parse the array ``key`` of the response incrementally and yield its items one at a
+        time, e.g. the ``rows`` of a ``pinList`` response. When the request was sent with
+        ``stream=True``, the body is read off the connection as the items are consumed, so
+        only one item is held in memory at a time.
+
+        Args:
+            key (str): The name of the array in the response.
+            chunk_size (int): The number of bytes to read at a time.
+
+        Returns:
+            Iterator[Any]
+        """
+
+        if self._data is not None:
+            yield from self._data[key]
+            return
+
+        try:
+            yield from iter_json_array(self._response.iter_content(chunk_size), key)
+        finally:
+            self._response.close()
+
     def __getitem__(self, key):
         try:
             return self.data[key]
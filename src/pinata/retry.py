@@ -0,0 +1,236 @@
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, FrozenSet, Optional
+
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, Timeout
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# A 429 means the request was rejected before being processed, so it is always safe to retry.
+_ALWAYS_RETRYABLE_STATUS_CODES = frozenset({429})
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent recently, so that retries can't
+    multiply the load on the service during an outage.
+
+    Args:
+        ratio (float): The number of retries allowed per request sent within the window.
+        min_retries_per_second (float): Retries that are always allowed, so that a
+          client sending few requests can still retry.
+        window (float): The number of seconds to look back over.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_retries_per_second: float = 1.0, window: float = 10.0
+    ):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            now = time.monotonic()
+            self._requests.append(now)
+            self._expire(now)
+
+    def try_spend(self) -> bool:
+        """
+        Take a retry out of the budget.
+
+        Returns:
+            bool: ``False`` when the budget is used up and the retry should not happen.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            allowed = self.ratio * len(self._requests) + self.min_retries_per_second * self.window
+            if len(self._retries) >= allowed:
+                return False
+
+            self._retries.append(now)
+            return True
+
+    def _expire(self, now: float):
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < now - self.window:
+                timestamps.popleft()
+
+
+class RetryStats:
+    """
+    Counters of the retries a session has made.
+    """
+
+    def __init__(self):
+        self.retries = 0
+        self.total_delay = 0.0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RetryStats retries={self.retries} total_delay={self.total_delay:.2f}s "
+            f"gave_up={self.gave_up} budget_exhausted={self.budget_exhausted}>"
+        )
+
+    def record_retry(self, delay: float):
+        with self._lock:
+            self.retries += 1
+            self.total_delay += delay
+
+    def record_give_up(self, budget_exhausted: bool = False):
+        with self._lock:
+            self.gave_up += 1
+            self.budget_exhausted += int(budget_exhausted)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first. Waits grow
+    exponentially with "full jitter", and a ``Retry-After`` header takes precedence.
+
+    Only requests that are safe to repeat are retried after a server error or a broken
+    connection: those with an idempotent method, or those explicitly sent with
+    ``idempotent=True``. A ``429`` response or a failure to connect is retried for any
+    request, since the service never processed it.
+
+    Args:
+        max_retries (int): The maximum number of retries per request. ``0`` disables
+          retrying.
+        backoff_factor (float): The base wait in seconds, doubled for every retry.
+        max_backoff (float): The longest wait in seconds between attempts.
+        max_retry_after (float): Give up instead of waiting when the service asks to wait
+          longer than this many seconds.
+        jitter (bool): Randomize waits so that clients don't retry in lockstep.
+        status_codes (FrozenSet[int]): The response status codes to retry.
+        methods (FrozenSet[str]): The HTTP methods that are safe to repeat.
+        budget (Optional[:class:`~pinata.retry.RetryBudget`]): Limits retries overall.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        jitter: bool = True,
+        status_codes: FrozenSet[int] = RETRY_STATUS_CODES,
+        methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.status_codes = status_codes
+        self.methods = methods
+        self.budget = budget or RetryBudget()
+        self.stats = RetryStats()
+
+    def get_retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        idempotent: Optional[bool] = None,
+        response: Optional[Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Get the number of seconds to wait before retrying a failed attempt.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of retries already made.
+            idempotent (Optional[bool]): Whether the request is safe to repeat. Defaults
+              to whether ``method`` is idempotent.
+            response (Optional[``requests.Response``]): The failed response, if any.
+            error (Optional[Exception]): The connection error, if there was no response.
+
+        Returns:
+            Optional[float]: The delay, or ``None`` when the request should not be retried.
+        """
+
+        if not self._is_retryable(method, idempotent, response, error):
+            return None
+
+        if attempt >= self.max_retries:
+            self.stats.record_give_up()
+            return None
+
+        retry_after = _get_retry_after(response) if response is not None else None
+        if retry_after is not None and retry_after > self.max_retry_after:
+            self.stats.record_give_up()
+            return None
+
+        if not self.budget.try_spend():
+            self.stats.record_give_up(budget_exhausted=True)
+            return None
+
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+            delay = random.uniform(0, delay) if self.jitter else delay
+
+        self.stats.record_retry(delay)
+        return delay
+
+    def _is_retryable(
+        self,
+        method: str,
+        idempotent: Optional[bool],
+        response: Optional[Response],
+        error: Optional[Exception],
+    ) -> bool:
+        if idempotent is None:
+            idempotent = method.upper() in self.methods
+
+        if response is not None:
+            if response.status_code not in self.status_codes:
+                return False
+
+            return idempotent or response.status_code in _ALWAYS_RETRYABLE_STATUS_CODES
+
+        if isinstance(error, ConnectTimeout):
+            return True
+
+        return idempotent and isinstance(error, (RequestsConnectionError, Timeout))
+
+
+def _get_retry_after(response: Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+__all__ = ["RetryBudget", "RetryPolicy", "RetryStats"]
@@ -1,39 +1,86 @@
+import concurrent.futures
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from project_nft import Pin, PinningAPI
 
 from pinata.api_key import get_key_manager
+from pinata.bulk import (
+    DEFAULT_MAX_WORKERS,
+    PinHashReport,
+    PinResult,
+    ProgressCallback,
+    ProgressTracker,
+    UnpinReport,
+    run_bounded,
+)
+from pinata.cid import compute_cid
 from pinata.clients.data import DataClient
 from pinata.clients.pinning import PinningClient
 from pinata.exceptions import (
     NoContentError,
     PinataBadRequestError,
+    PinataException,
+    PinataHTTPError,
     PinataInternalServiceError,
     PinError,
 )
+from pinata.journal import PinJournal
+from pinata.logger import logger
 from pinata.session import PinataAPISession
+from pinata.throttle import Throttle
+
+# The modules of the optional features, NumPy among them, are only imported by the methods
+# that use them, so that importing the SDK stays cheap.
+if TYPE_CHECKING:
+    from pinata.gateway import GatewayClient
+    from pinata.index import PinIndex
+    from pinata.records import PinTable
+    from pinata.sync import SyncItem, SyncManifest, SyncReport
 
 
 class Pinata(PinningAPI):
-    def __init__(self, pinning_client: PinningClient, data_client: DataClient):
+    def __init__(
+        self,
+        pinning_client: PinningClient,
+        data_client: DataClient,
+        index: Optional["PinIndex"] = None,
+        gateway: Optional["GatewayClient"] = None,
+    ):
         self.pinning = pinning_client
         self.data = data_client
+        self.index = index
+        self._gateway = gateway
 
     @classmethod
-    def from_profile_name(cls, profile_name: str) -> "Pinata":
+    def from_profile_name(
+        cls,
+        profile_name: str,
+        index: Optional["PinIndex"] = None,
+        throttle: Optional[Throttle] = None,
+    ) -> "Pinata":
         """
         Create an instance of the Pinata SDK from a stored profile name.
 
         Args:
             profile_name (str): The name of the API key profile to use.
+            index (Optional[:class:`~pinata.index.PinIndex`]): A local pin index to answer
+              pin lookups from.
+            throttle (Optional[:class:`~pinata.throttle.Throttle`]): Limits the rate and
+              concurrency of requests.
         """
         key_manager = get_key_manager()
         api_key, api_secret = key_manager.get_key_pair(profile_name)
-        return cls.from_api_key(api_key, api_secret)
+        return cls.from_api_key(api_key, api_secret, index=index, throttle=throttle)
 
     @classmethod
-    def from_api_key(cls, api_key: str, api_secret: str) -> "Pinata":
+    def from_api_key(
+        cls,
+        api_key: str,
+        api_secret: str,
+        index: Optional["PinIndex"] = None,
+        throttle: Optional[Throttle] = None,
+    ) -> "Pinata":
         """
         Create an instance of the Pinata SDK from an API key.
         `Guide on API key <https://docs.pinata.cloud/user/generate-api-key>`__.
@@ -41,23 +88,83 @@ class Pinata(PinningAPI):
         Args:
             api_key (str): The API key.
             api_secret (str): The API secret.
+            index (Optional[:class:`~pinata.index.PinIndex`]): A local pin index to answer
+              pin lookups from.
+            throttle (Optional[:class:`~pinata.throttle.Throttle`]): Limits the rate and
+              concurrency of requests, e.g. a :class:`~pinata.throttle.ProcessThrottle`
+              shared by several worker processes.
         """
-        session = PinataAPISession.from_api_key(api_key, api_secret)
+        session = PinataAPISession.from_api_key(api_key, api_secret, throttle=throttle)
         pinning_client = PinningClient(session)
         data_client = DataClient(session)
-        return cls(pinning_client, data_client)
+        return cls(pinning_client, data_client, index=index)
+
+    @property
+    def gateway(self) -> "GatewayClient":
+        """
+        The client that downloads content, created on first use with the gateway of
+        ``$PINATA_GATEWAY_URL``, or Pinata's public gateway.
+        """
+
+        if self._gateway is None:
+            from pinata.gateway import GatewayClient
+
+            self._gateway = GatewayClient()
+
+        return self._gateway
+
+    def sync_index(self) -> int:
+        """
+        Bring the local pin index up-to-date. Only pins that changed since the last sync
+        are requested.
+
+        Returns:
+            int: The number of pin records that were added or updated.
+        """
+
+        if not self.index:
+            raise PinataException("This SDK instance was not created with a pin index.")
+
+        return self.index.sync(self.data)
 
     def get_pins(self) -> List[Pin]:
         """
-        Get all pins.
+        Get all pins. When the SDK has a pin index, the pins are read from the index, which
+        is only synced first when it is stale.
 
         Returns:
             List[``Pin``]
         """
 
-        pins = self.data.search_pins(status="pinned")["rows"]
+        if self.index:
+            self._ensure_index_synced()
+            pins = self.index.search(status="pinned")
+        else:
+            pins = self.data.iter_pins(status="pinned")
+
         return [Pin(content_hash=p["ipfs_pin_hash"], file_name=p["metadata"]["name"]) for p in pins]
 
+    def get_pin_table(self, status: str = "pinned") -> "PinTable":
+        """
+        Get pins as a :class:`~pinata.records.PinTable`, for filtering, sorting and
+        grouping large numbers of pins in memory. Uses the pin index when the SDK has one.
+
+        Args:
+            status (str): ``"all"``, ``"pinned"`` or ``"unpinned"``.
+
+        Returns:
+            :class:`~pinata.records.PinTable`
+        """
+        from pinata.records import PinTable
+
+        if self.index:
+            self._ensure_index_synced()
+            rows = self.index.search(status=status)
+        else:
+            rows = self.data.iter_pins(status=status)
+
+        return PinTable.from_rows(rows)
+
     def get_hash(self, file_name: str) -> Optional[str]:
         """
         Get the hash of a pinned file by file name.
@@ -70,6 +177,10 @@ class Pinata(PinningAPI):
             Optional[str]: The content IPFS hash str.
         """
 
+        if self.index:
+            self._ensure_index_synced()
+            return self.index.get_hash(file_name)
+
         pins = self.get_pins()
         for pin in pins:
             if pin.file_name == file_name:
@@ -77,27 +188,353 @@ class Pinata(PinningAPI):
 
         return None
 
-    def pin_file(self, file_path: Path) -> str:
+    def pin_file(
+        self,
+        file_path: Path,
+        recursive: bool = False,
+        skip_existing: bool = False,
+        stream_json: bool = False,
+    ) -> str:
         """
-        Add and pin any file, or directory, to Pinata's IPFS nodes.
+        Add and pin any file, or directory, to Pinata's IPFS nodes. JSON files are pinned
+        as JSON content.
 
         Args:
             file_path (pathlib.Path): The path to the file to pin.
+            recursive (bool): When pinning a directory, include its sub-directories.
+            skip_existing (bool): Compute the CID locally first and skip the upload
+              when that content is already pinned.
+            stream_json (bool): Stream JSON files into the request as they are, instead of
+              parsing them, so memory stays flat for large documents. Only a JSON object or
+              array is checked for; the rest of the document is left to Pinata to reject.
 
         Returns:
             :class:`~pinata.response.PinataResponse`
         """
 
         is_json = file_path.suffix == ".json"
+        if skip_existing and not is_json:
+            cid = self._get_pinned_cid(file_path, recursive)
+            if cid:
+                return cid
+
         try:
             response = (
-                self.pinning.pin_json(file_path) if is_json else self.pinning.pin_file(file_path)
+                self.pinning.pin_json(file_path, stream=stream_json)
+                if is_json
+                else self.pinning.pin_file(file_path, recursive=recursive)
             )
         except PinataBadRequestError as err:
             raise PinError(file_path) from err
 
         return response.data["IpfsHash"]
 
+    def pin_many(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        recursive: bool = False,
+        skip_existing: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        journal: Optional[PinJournal] = None,
+    ) -> List[PinResult]:
+        """
+        Pin many files, or directories, concurrently. Failures do not stop the other
+        uploads; each one is reported in its own result instead. The connection pool is
+        grown to ``max_workers`` if it is smaller.
+
+        To make a long-running job resumable, pass a :class:`~pinata.journal.PinJournal`:
+        every completed pin is recorded in it, and paths it has recorded, unchanged, are
+        not pinned again when the job is restarted with the same journal.
+
+        Args:
+            file_paths (Iterable[pathlib.Path]): The paths to pin.
+            max_workers (int): The number of uploads to run at the same time.
+            recursive (bool): When pinning a directory, include its sub-directories.
+            skip_existing (bool): Skip uploading content that is already pinned.
+            progress (Optional[Callable]): Called with a
+              :class:`~pinata.bulk.BulkProgress` after each path is done.
+            journal (Optional[:class:`~pinata.journal.PinJournal`]): Records completed
+              pins, and skips the paths it already recorded.
+
+        Returns:
+            List[:class:`~pinata.bulk.PinResult`]: One result per path, in input order.
+        """
+
+        paths = list(file_paths)
+        self._ensure_pool_size(max_workers)
+
+        def pin(indexed_path: Tuple[int, Path]) -> str:
+            path = indexed_path[1]
+            cid = self.pin_file(path, recursive=recursive, skip_existing=skip_existing)
+            if journal is not None:
+                journal.record(path, cid)
+
+            return cid
+
+        tracker = ProgressTracker(total=len(paths), callback=progress)
+        results: List[Optional[PinResult]] = [None] * len(paths)
+        pending = []
+        for position, path in enumerate(paths):
+            cid = journal.get_cid(path) if journal is not None else None
+            if cid:
+                results[position] = PinResult(path, cid)
+                tracker.update()
+            else:
+                pending.append((position, path))
+
+        if len(pending) < len(paths):
+            logger.info(f"Resuming: {len(paths) - len(pending)} paths were already pinned.")
+
+        for (position, path), cid, error in run_bounded(pin, pending, max_workers):
+            results[position] = PinResult(path, cid, error)
+            size = path.stat().st_size if not error and path.is_file() else 0
+            tracker.update(failed=error is not None, bytes_sent=size)
+
+        summary = tracker.progress
+        logger.info(
+            "Pinned %s of %s paths in %.1fs (%.1f paths/s, %.1f MB/s).",
+            summary.completed - summary.failed,
+            len(paths),
+            summary.elapsed,
+            summary.items_per_second,
+            summary.bytes_per_second / 1024**2,
+        )
+        if journal is not None:
+            journal.flush()
+
+        return [r for r in results if r is not None]
+
+    def pin_hashes(
+        self,
+        hashes: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> PinHashReport:
+        """
+        Add many hashes to Pinata's pin queue concurrently and wait until they are pinned.
+        Their jobs are followed by a single :class:`~pinata.jobs.PinJobTracker` poller,
+        however many hashes there are. Duplicate hashes are only added once. Use the
+        tracker directly to get a future for each hash instead of waiting for all of them.
+
+        Args:
+            hashes (Iterable[str]): The hashes to pin.
+            max_workers (int): The number of hashes to add to the queue at the same time.
+            timeout (Optional[float]): The most seconds to wait. Hashes that aren't pinned
+              by then are reported as failed with a ``TimeoutError`` and are no longer
+              polled, though Pinata keeps trying to pin those already in its queue.
+            min_interval (Optional[float]): The seconds between polls of the pin queue while
+              its jobs progress. Defaults to ``pinata.jobs.DEFAULT_MIN_INTERVAL``.
+            max_interval (Optional[float]): The most seconds between polls of the pin queue.
+              Defaults to ``pinata.jobs.DEFAULT_MAX_INTERVAL``.
+            progress (Optional[Callable]): Called with a
+              :class:`~pinata.bulk.BulkProgress` after each hash is done.
+
+        Returns:
+            :class:`~pinata.bulk.PinHashReport`
+        """
+        from pinata.jobs import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, PinJobTracker
+
+        min_interval = DEFAULT_MIN_INTERVAL if min_interval is None else min_interval
+        max_interval = DEFAULT_MAX_INTERVAL if max_interval is None else max_interval
+        self._ensure_pool_size(max_workers)
+        report = PinHashReport()
+        hashes = list(hashes)
+        unique_hashes = list(dict.fromkeys(hashes))
+        tracker = PinJobTracker(self.pinning, max_workers, min_interval, max_interval)
+        futures = {tracker.submit(hash_): hash_ for hash_ in unique_hashes}
+        report.duplicates = len(hashes) - len(unique_hashes)
+        progress_tracker = ProgressTracker(total=len(futures), callback=progress)
+        reported: Set[concurrent.futures.Future] = set()
+
+        def record(future: concurrent.futures.Future):
+            error = future.exception()
+            if error is None:
+                report.pinned.append(futures[future])
+            else:
+                report.failed[futures[future]] = error
+
+            reported.add(future)
+            progress_tracker.update(failed=error is not None)
+
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                record(future)
+        except concurrent.futures.TimeoutError:
+            # Stop polling; the hashes that weren't done by now are given up on.
+            tracker.cancel()
+            for future, hash_ in futures.items():
+                if future in reported:
+                    continue
+
+                if future.done() and not future.cancelled():
+                    if not isinstance(future.exception(), concurrent.futures.CancelledError):
+                        record(future)
+                        continue
+
+                report.failed[hash_] = TimeoutError(f"Hash '{hash_}' isn't pinned yet.")
+        finally:
+            tracker.close(wait=False)
+
+        logger.info(f"Finished pinning hashes: {report}.")
+        return report
+
+    def sync_directory(
+        self,
+        directory: Path,
+        manifest: Optional["SyncManifest"] = None,
+        dry_run: bool = False,
+        unpin_removed: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> "SyncReport":
+        """
+        Bring the pins of a directory tree up-to-date: pin the files that are new or
+        changed, and unpin the content of files that were deleted or changed, unless
+        another file still has it. Only content this directory's syncs uploaded is ever
+        unpinned; files whose content was already pinned are adopted, and their pins are
+        left alone. Each file is pinned on its own. What was pinned is kept
+        in a local :class:`~pinata.sync.SyncManifest`, so only files whose size, mtime or
+        inode changed since the last sync are hashed, and content that is already pinned
+        isn't uploaded again.
+
+        Files are pinned as they are, JSON files included, so that their CIDs can be
+        computed locally. A file that fails to upload keeps its previous CID, and is
+        retried by the next sync, as are failed unpins.
+
+        Args:
+            directory (pathlib.Path): The directory to sync, with its sub-directories.
+            manifest (Optional[:class:`~pinata.sync.SyncManifest`]): The manifest of the
+              directory. Defaults to :meth:`~pinata.sync.SyncManifest.for_directory`.
+            dry_run (bool): Only plan the changes, see :attr:`SyncReport.plan`.
+            unpin_removed (bool): Unpin content no file of the directory has anymore.
+            max_workers (int): The number of files to hash or upload at the same time.
+            progress (Optional[Callable]): Called with a
+              :class:`~pinata.bulk.BulkProgress` after each upload.
+
+        Returns:
+            :class:`~pinata.sync.SyncReport`
+        """
+        from pinata.sync import SyncManifest, SyncReport
+
+        own_manifest = manifest is None
+        if manifest is None:
+            manifest = SyncManifest.for_directory(directory)
+
+        try:
+            plan = manifest.plan(directory, self._is_pinned, max_workers=max_workers)
+            if not unpin_removed:
+                plan.unpin = []
+
+            report = SyncReport(plan)
+            logger.info(f"Sync plan for '{directory}': {plan}.")
+            if not dry_run:
+                self._apply_sync_plan(manifest, report, max_workers, unpin_removed, progress)
+
+            return report
+        finally:
+            if own_manifest:
+                manifest.close()
+
+    def _apply_sync_plan(
+        self,
+        manifest: "SyncManifest",
+        report: "SyncReport",
+        max_workers: int,
+        unpin_removed: bool,
+        progress: Optional[ProgressCallback],
+    ):
+        plan = report.plan
+        self._ensure_pool_size(max_workers)
+
+        def upload(item: "SyncItem") -> str:
+            file_path = plan.directory / item.path
+            try:
+                return self.pinning.pin_file(file_path).data["IpfsHash"]
+            except PinataBadRequestError as err:
+                raise PinError(file_path) from err
+
+        failed_cids: Dict[str, Exception] = {}
+        tracker = ProgressTracker(total=len(plan.upload), callback=progress)
+        for item, cid, error in run_bounded(upload, plan.upload, max_workers):
+            if error:
+                report.failed[item.path] = error
+                failed_cids[item.cid] = error
+            else:
+                if cid != item.cid:
+                    logger.warning(f"'{item.path}' was pinned as {cid}, not {item.cid}.")
+
+                manifest.record([item._replace(cid=cid, owned=True)])
+                report.uploaded.append(item.path)
+
+            tracker.update(failed=error is not None, bytes_sent=0 if error else item.size)
+
+        adopted = []
+        for item in plan.adopt:
+            if item.cid in failed_cids:
+                # It was going to share the content of a file that failed to upload.
+                report.failed[item.path] = failed_cids[item.cid]
+            else:
+                adopted.append(item)
+
+        manifest.record(plan.touch + adopted)
+        manifest.forget(item.path for item in plan.remove)
+        if unpin_removed:
+            cids = manifest.add_pending_unpins(plan.unpin)
+            unpin_report = self.unpin_many(cids, max_workers=max_workers)
+            report.unpinned = unpin_report.unpinned + unpin_report.already_unpinned
+            report.failed.update(unpin_report.failed)
+            manifest.remove_pending_unpins(report.unpinned)
+
+        logger.info(f"Finished syncing '{plan.directory}': {report}.")
+
+    def _ensure_pool_size(self, pool_size: int):
+        for session in {self.pinning.session, self.data.session}:
+            if session.pool_size < pool_size:
+                session.set_pool_size(pool_size)
+
+    def _ensure_index_synced(self):
+        if self.index and self.index.is_stale:
+            self.sync_index()
+
+    def _get_pinned_cid(self, file_path: Path, recursive: bool) -> Optional[str]:
+        try:
+            cid = compute_cid(file_path, recursive=recursive)
+        except ValueError:
+            # Content that can't be hashed locally gets uploaded as usual.
+            return None
+
+        return cid if self._is_pinned(cid) else None
+
+    def _is_pinned(self, cid: str) -> bool:
+        if self.index:
+            self._ensure_index_synced()
+            pin = self.index.get_metadata(cid)
+            return bool(pin) and not pin.get("date_unpinned")
+
+        pins = self.data.search_pins(hash_contains=cid, status="pinned")["rows"]
+        return any(p["ipfs_pin_hash"] == cid for p in pins)
+
+    def get_content(self, cid: str, dest: Path, use_cache: bool = True) -> Path:
+        """
+        Download content from the IPFS gateway straight to a file. Large objects are
+        fetched as parallel range requests, and downloads are kept in a local cache, so
+        getting the same CID again costs no network. See
+        :class:`~pinata.gateway.GatewayClient`.
+
+        Args:
+            cid (str): The CID of the content, optionally followed by a path inside it.
+            dest (pathlib.Path): The file to write.
+            use_cache (bool): Use the local cache of downloads.
+
+        Returns:
+            pathlib.Path: ``dest``.
+        """
+        return self.gateway.download(cid, dest, use_cache=use_cache)
+
     def unpin(self, content_hash: str, ignore_errors: bool = False):
         """
         Unpin content they previously uploaded to Pinata's IPFS nodes.
@@ -111,8 +548,63 @@ class Pinata(PinningAPI):
         """
         try:
             self.pinning.unpin(content_hash)
-        except PinataInternalServiceError as err:
-            if ignore_errors:
+        except PinataHTTPError as err:
+            if err.is_not_pinned:
+                if ignore_errors:
+                    return
+
+                raise NoContentError(content_hash) from err
+
+            elif ignore_errors and isinstance(err, PinataInternalServiceError):
                 return
 
-            raise NoContentError(content_hash) from err
+            raise
+
+    def unpin_many(
+        self,
+        content_hashes: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> UnpinReport:
+        """
+        Unpin many hashes concurrently. Duplicate hashes are only unpinned once, content
+        that is already unpinned counts as a success and other failures are collected in
+        the report instead of being raised. ``content_hashes`` is consumed lazily, so it
+        can be a stream of any length.
+
+        Args:
+            content_hashes (Iterable[str]): The hashes of the content to stop pinning.
+            max_workers (int): The number of requests to run at the same time.
+            progress (Optional[Callable]): Called with a
+              :class:`~pinata.bulk.BulkProgress` after each hash is done.
+
+        Returns:
+            :class:`~pinata.bulk.UnpinReport`
+        """
+
+        self._ensure_pool_size(max_workers)
+        report = UnpinReport()
+        seen: Set[str] = set()
+
+        def unique_hashes() -> Iterator[str]:
+            for content_hash in content_hashes:
+                if content_hash in seen:
+                    report.duplicates += 1
+                    continue
+
+                seen.add(content_hash)
+                yield content_hash
+
+        tracker = ProgressTracker(callback=progress)
+        for content_hash, _, error in run_bounded(self.unpin, unique_hashes(), max_workers):
+            if isinstance(error, NoContentError):
+                report.already_unpinned.append(content_hash)
+            elif error is not None:
+                report.failed[content_hash] = error
+            else:
+                report.unpinned.append(content_hash)
+
+            tracker.update(failed=content_hash in report.failed)
+
+        logger.info(f"Finished unpinning: {report}.")
+        return report
@@ -1,21 +1,52 @@
+import time
+from contextlib import nullcontext
+from typing import List, Optional
 from urllib.parse import urljoin, urlparse
 
 from requests import HTTPError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
 from requests.sessions import HTTPAdapter, Request, Session
 
+from pinata import codec
 from pinata.auth import PinataAuth
 from pinata.exceptions import MissingResponseError, raise_pinata_http_error
-from pinata.logger import logger
+from pinata.logger import format_body, is_debug_enabled, logger
+from pinata.metrics import (
+    InstrumentedAdapter,
+    RequestEvent,
+    RequestHook,
+    TimingRecorder,
+    get_endpoint,
+    record_timings,
+)
 from pinata.response import PinataResponse
+from pinata.retry import RetryPolicy, RetryStats
+from pinata.streaming import StreamingBody
+from pinata.throttle import Throttle
 from pinata.utils import format_dict
 
+DEFAULT_POOL_MAXSIZE = 4
+_PREFIXES = ("https://", "http://")
+
 
 class PinataAPISession:
-    def __init__(self, url: str, auth: PinataAuth, session: Session):
+    def __init__(
+        self,
+        url: str,
+        auth: Optional[PinataAuth],
+        session: Session,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+    ):
         self._url = url
         self._auth = auth
         self._session = session
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.throttle = throttle
+        self._hooks: List[RequestHook] = []
         self._headers = self._session.headers.copy()
+        self._pool_size = DEFAULT_POOL_MAXSIZE
 
     @classmethod
     def from_api_key(
@@ -23,17 +54,79 @@ class PinataAPISession:
         api_key: str,
         api_secret: str,
         host_address: str = "https://api.pinata.cloud/",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
     ) -> "PinataAPISession":
-        adapter = HTTPAdapter(pool_connections=200, pool_maxsize=4, pool_block=True)
         session = Session()
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
         session.headers = {
             "Accept-Encoding": "gzip, deflate",
             "Connection": "keep-alive",
         }
         auth = PinataAuth(api_key, api_secret)
-        return PinataAPISession(host_address, auth, session)
+        api_session = PinataAPISession(
+            host_address, auth, session, retry_policy=retry_policy, throttle=throttle
+        )
+        api_session.set_pool_size(pool_maxsize)
+        return api_session
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """
+        The number of retries made, and the total time spent waiting, by this session.
+        """
+
+        return self.retry_policy.stats
+
+    @property
+    def pool_size(self) -> int:
+        """
+        The maximum number of connections kept open to each host. Requests beyond that
+        wait for a free connection.
+        """
+
+        return self._pool_size
+
+    def add_hook(self, hook: RequestHook):
+        """
+        Call ``hook`` with a :class:`~pinata.metrics.RequestEvent` after every request,
+        e.g. a :class:`~pinata.metrics.HistogramCollector`. Requests are only timed while
+        hooks are registered.
+
+        Args:
+            hook (Callable[[:class:`~pinata.metrics.RequestEvent`], None]): The hook.
+        """
+
+        self._hooks.append(hook)
+        if len(self._hooks) == 1:
+            self.set_pool_size(self._pool_size)
+
+    def remove_hook(self, hook: RequestHook):
+        self._hooks.remove(hook)
+        if not self._hooks:
+            self.set_pool_size(self._pool_size)
+
+    def set_pool_size(self, pool_maxsize: int):
+        """
+        Resize the connection pool, e.g. to match the number of threads sending requests
+        through this session.
+
+        Args:
+            pool_maxsize (int): The maximum number of connections per host.
+        """
+
+        # Only the instrumented connections record timings, so they are only used when needed.
+        adapter_class = InstrumentedAdapter if self._hooks else HTTPAdapter
+        adapter = adapter_class(pool_connections=200, pool_maxsize=pool_maxsize, pool_block=True)
+        old_adapters = {id(a): a for p, a in self._session.adapters.items() if p in _PREFIXES}
+        for prefix in _PREFIXES:
+            self._session.mount(prefix, adapter)
+
+        # Close the replaced pools, or their connections stay open until collected.
+        for old_adapter in old_adapters.values():
+            old_adapter.close()
+
+        self._pool_size = pool_maxsize
 
     def get(self, url, **kwargs):
         return self.request("GET", url, **kwargs)
@@ -72,6 +165,7 @@ class PinataAPISession:
         timeout=60,
         cert=None,
         proxies=None,
+        idempotent=None,
     ):
         request = self._prepare_request(
             method,
@@ -85,8 +179,10 @@ class PinataAPISession:
             auth=auth,
             hooks=hooks,
         )
-        response = self._session.send(
+        response, retries, retry_delay = self._send(
+            method,
             request,
+            idempotent,
             stream=stream,
             timeout=timeout,
             verify=True,
@@ -95,16 +191,17 @@ class PinataAPISession:
         )
 
         if response is not None:
-            logger.debug(f"Response status: {response.status_code}")
             if not stream:
                 # setting this manually speeds up read times
                 response.encoding = "utf-8"
-                logger.debug(f"Response data: {response.text}")
-            else:
-                logger.debug("Response data: <streamed>")
+
+            if is_debug_enabled():
+                logger.debug(f"Response status: {response.status_code}")
+                body = "<streamed>" if stream else format_body(response.content)
+                logger.debug(f"Response data: {body}")
 
             if 200 <= response.status_code <= 399:
-                return PinataResponse(response)
+                return PinataResponse(response, retries=retries, retry_delay=retry_delay)
 
         else:
             logger.debug("ERROR: Could not retrieve response.")
@@ -112,6 +209,80 @@ class PinataAPISession:
         # If we get here, an error has occurred.
         _handle_error(method, url, response)
 
+    def _send(self, method, request, idempotent, **send_kwargs):
+        start = time.perf_counter()
+        retries = 0
+        retry_delay = 0.0
+        while True:
+            self.retry_policy.budget.record_request()
+            response = None
+            error = None
+            recorder = TimingRecorder() if self._hooks else None
+            try:
+                with self._throttled(), self._recording(recorder):
+                    response = self._session.send(request, **send_kwargs)
+            except (RequestsConnectionError, Timeout) as err:
+                error = err
+
+            if response is not None and response.status_code < 400:
+                break
+
+            delay = self.retry_policy.get_retry_delay(
+                method, retries, idempotent=idempotent, response=response, error=error
+            )
+            if self.throttle and response is not None and response.status_code == 429:
+                # Hold back every request sharing the throttle, not just this one.
+                self.throttle.pause(delay or 0.0)
+
+            if delay is None:
+                break
+
+            reason = response.status_code if response is not None else type(error).__name__
+            logger.debug(f"Retrying {method} {request.url} after {reason} in {delay:.2f}s.")
+            if response is not None:
+                response.close()
+
+            time.sleep(delay)
+            if isinstance(request.body, StreamingBody):
+                request.body.reset()
+
+            retries += 1
+            retry_delay += delay
+
+        if recorder is not None:
+            elapsed = time.perf_counter() - start
+            self._emit(method, request, response, error, recorder, retries, elapsed)
+
+        if error is not None:
+            raise error
+
+        return response, retries, retry_delay
+
+    def _emit(self, method, request, response, error, recorder, retries, elapsed):
+        event = RequestEvent(
+            method=method,
+            url=request.url,
+            endpoint=get_endpoint(request.url),
+            status_code=response.status_code if response is not None else None,
+            retries=retries,
+            elapsed=elapsed,
+            timings=recorder.timings,
+            bytes_sent=_get_body_size(request.body),
+            bytes_received=_get_received_size(response),
+            error=error,
+        )
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as err:
+                logger.warning(f"Request hook '{hook}' failed: {err}")
+
+    def _recording(self, recorder):
+        return record_timings(recorder) if recorder is not None else nullcontext()
+
+    def _throttled(self):
+        return self.throttle.acquire() if self.throttle else nullcontext()
+
     def _prepare_request(
         self,
         method,
@@ -130,25 +301,29 @@ class PinataAPISession:
 
         headers = headers or {}
         headers.update(self._headers)
-        if data and "Content-Type" not in headers:
+        _print_request(method, url, params=params, data=data, json=json)
+
+        if data is None and json is not None:
+            # Encode with the SDK's codec instead of letting 'requests' go through 'str'.
+            data = codec.dumps(json)
+        elif isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if isinstance(data, StreamingBody):
+            headers.update({"Content-Type": data.content_type})
+        elif data and "Content-Type" not in headers:
             headers.update({"Content-Type": "application/json"})
         if "Accept" not in headers:
             headers.update({"Accept": "application/json"})
 
         headers = _create_user_headers(headers)
 
-        _print_request(method, url, params=params, data=data, json=json)
-
-        if isinstance(data, str):
-            data = data.encode("utf-8")
-
         request = Request(
             method=method,
             url=url,
             headers=headers,
             files=files,
             data=data,
-            json=json,
             params=params,
             auth=auth or self._auth,
             cookies=cookies,
@@ -184,11 +359,34 @@ def _handle_error(method, url, response):
         raise_pinata_http_error(err)
 
 
+def _get_body_size(body) -> int:
+    if body is None:
+        return 0
+    elif isinstance(body, (bytes, str, StreamingBody)):
+        return len(body)
+
+    return 0
+
+
+def _get_received_size(response) -> int:
+    if response is None:
+        return 0
+
+    # The number of bytes read off the wire, before decompression.
+    try:
+        return response.raw.tell()
+    except (AttributeError, ValueError):
+        return len(response.content or b"")
+
+
 def _print_request(method, url, params=None, data=None, json=None):
+    if not is_debug_enabled():
+        return
+
     logger.debug(f"{method.ljust(8)}{url}")
     if params:
         logger.debug(format_dict(params, "  params"))
     if json:
-        logger.debug(format_dict(json, "  json"))
+        logger.debug(f"  json {format_body(json)}")
     if data:
-        logger.debug(data, "  data")
+        logger.debug(f"  data {data if isinstance(data, StreamingBody) else format_body(data)}")
@@ -0,0 +1,349 @@
+import io
+import json
+import mmap
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from pinata.utils import iter_files
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_OPEN_FILES = 64
+MMAP_WINDOW_SIZE = 16 * 1024 * 1024
+
+_JSON_WHITESPACE = b" \t\r\n"
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+FileSpec = Union[IO, Path, Tuple[str, Union[IO, Path]]]
+
+_open_files = threading.BoundedSemaphore(DEFAULT_MAX_OPEN_FILES)
+
+
+def set_max_open_files(max_open_files: int):
+    """
+    Set how many files all streaming uploads in this process may hold open at once.
+    Uploads that would go over the limit wait for another upload to finish a file.
+
+    Args:
+        max_open_files (int): The maximum number of open upload file descriptors.
+    """
+
+    global _open_files
+    if max_open_files < 1:
+        raise ValueError("'max_open_files' must be at least 1.")
+
+    _open_files = threading.BoundedSemaphore(max_open_files)
+
+
+class StreamingBody(ABC):
+    """
+    A request body that is produced lazily, chunk by chunk, so that it never has to be held
+    in memory all at once. ``requests`` treats instances as file-like streams and sends them
+    with a ``Content-Length`` header computed up front.
+    """
+
+    content_type = "application/octet-stream"
+
+    def __init__(self):
+        self._iterator: Optional[Iterator[bytes]] = None
+        self._buffer = bytearray()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._generate()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} content_type={self.content_type} length={len(self)}>"
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to ``size`` bytes of the body. Reading the whole body at once (the default)
+        defeats the purpose of streaming and is only supported for completeness.
+        """
+
+        if self._iterator is None:
+            self._iterator = self._generate()
+
+        if size is None or size < 0:
+            data = bytes(self._buffer) + b"".join(self._iterator)
+            self._buffer.clear()
+            return data
+
+        while len(self._buffer) < size:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                break
+
+            self._buffer += chunk
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def reset(self):
+        """
+        Rewind the body so that it can be sent again.
+        """
+
+        if self._iterator is not None:
+            # Closing the generator releases any file it still has open.
+            self._iterator.close()
+
+        self._iterator = None
+        self._buffer.clear()
+
+    @abstractmethod
+    def _generate(self) -> Iterator[bytes]:
+        pass
+
+
+class MultipartEncoder(StreamingBody):
+    """
+    A ``multipart/form-data`` body that streams its files in fixed-size chunks, keeping
+    memory usage constant regardless of how large the files are.
+
+    Args:
+        files (List): Field name and file pairs, in the same shape ``requests`` accepts for
+          its ``files=`` argument: ``("file", file_obj)`` or ``("file", (name, file_obj))``.
+          A :class:`pathlib.Path` may be given instead of a file object, in which case the
+          file is only opened while its part is being sent and closed right after.
+        chunk_size (int): The number of bytes to read from a file at a time.
+        use_mmap (bool): Read files through a memory map instead of ``read()`` calls.
+    """
+
+    def __init__(
+        self,
+        files: List[Tuple[str, FileSpec]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_mmap: bool = False,
+    ):
+        super().__init__()
+        self.boundary = uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self._parts = [_FilePart(field, spec) for field, spec in files]
+        self._closing = f"--{self.boundary}--\r\n".encode()
+
+    @classmethod
+    def from_path(
+        cls, file_path: Path, recursive: bool = False, use_mmap: bool = False
+    ) -> "MultipartEncoder":
+        """
+        Create the body for pinning a file, or directory. Files in a directory are named
+        ``<directory name>/<path relative to the directory>``.
+
+        Args:
+            file_path (pathlib.Path): The path to the file or directory.
+            recursive (bool): Include the files in sub-directories.
+            use_mmap (bool): Read files through a memory map instead of ``read()`` calls.
+        """
+
+        if file_path.is_dir():
+            files = [
+                ("file", (f"{file_path.name}/{path.relative_to(file_path).as_posix()}", path))
+                for path in iter_files(file_path, recursive)
+            ]
+        else:
+            files = [("file", (file_path.name, file_path))]
+
+        return cls(files, use_mmap=use_mmap)
+
+    def __len__(self) -> int:
+        parts_length = sum(len(self._part_header(p)) + p.size + len(b"\r\n") for p in self._parts)
+        return parts_length + len(self._closing)
+
+    def _generate(self) -> Iterator[bytes]:
+        for part in self._parts:
+            yield self._part_header(part)
+            with part.open() as file:
+                yield from _read_chunks(file, part.size, self.chunk_size, self.use_mmap)
+
+            yield b"\r\n"
+
+        yield self._closing
+
+    def _part_header(self, part: "_FilePart") -> bytes:
+        field = _quote(part.field)
+        file_name = _quote(part.file_name)
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{file_name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+
+
+class JSONEnvelope(StreamingBody):
+    """
+    A JSON body that wraps the content of a JSON file in an object, e.g.
+    ``{"pinataContent": <file>}``, without parsing it: the file's bytes are streamed into
+    the body as they are, in fixed-size chunks. Memory usage stays constant regardless of
+    how large the file is, and the content is never serialized again.
+
+    Args:
+        source (Union[pathlib.Path, IO]): The path to the JSON file, or the file opened in
+          binary mode. A path is only opened while the body is being sent.
+        key (str): The member of the envelope holding the file's content.
+        validate (bool): Check that the file holds a JSON object or array. Only its first and
+          last characters are looked at, so malformed content in between is left for the
+          server to reject.
+        chunk_size (int): The number of bytes to read from the file at a time.
+    """
+
+    content_type = "application/json"
+
+    def __init__(
+        self,
+        source: Union[Path, IO],
+        key: str = "pinataContent",
+        validate: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        super().__init__()
+        if isinstance(source, io.TextIOBase):
+            raise ValueError("JSON files must be opened in binary mode to be streamed.")
+        elif isinstance(source, Path) and not source.is_file():
+            raise ValueError(f"File '{source}' does not exist.")
+
+        self.chunk_size = chunk_size
+        self._part = _FilePart(key, source)
+        self._prefix = f"{{{json.dumps(key)}:".encode()
+        self._suffix = b"}"
+        with self._part.open() as file:
+            # JSON text can't start with a byte order mark once it is embedded.
+            self._skip = len(_UTF8_BOM) if file.read(len(_UTF8_BOM)) == _UTF8_BOM else 0
+            if validate:
+                self._validate(file)
+
+    def __len__(self) -> int:
+        return len(self._prefix) + self._part.size - self._skip + len(self._suffix)
+
+    def _generate(self) -> Iterator[bytes]:
+        yield self._prefix
+        with self._part.open() as file:
+            file.seek(self._part.offset + self._skip)
+            size = self._part.size - self._skip
+            yield from _read_chunks(file, size, self.chunk_size, use_mmap=False)
+
+        yield self._suffix
+
+    def _validate(self, file: IO):
+        start = self._part.offset + self._skip
+        end = self._part.offset + self._part.size
+        first = _first_json_char(file, start, end, self.chunk_size)
+        last = _last_json_char(file, start, end, self.chunk_size)
+        if (first, last) not in ((b"{", b"}"), (b"[", b"]")):
+            name = self._part.path or self._part.file_name
+            raise ValueError(f"File at path '{name}' is not a JSON object or array.")
+
+
+class _FilePart:
+    __slots__ = ("field", "file_name", "file", "path", "offset", "size")
+
+    def __init__(self, field: str, spec: FileSpec):
+        if isinstance(spec, tuple):
+            file_name, source = spec
+        else:
+            source = spec
+            file_name = os.path.basename(getattr(source, "name", None) or str(source) or field)
+
+        self.field = field
+        self.file_name = str(file_name)
+        if isinstance(source, Path):
+            self.file = None
+            self.path = source
+            self.offset = 0
+            self.size = source.stat().st_size
+        else:
+            self.file = source
+            self.path = None
+            self.offset = source.tell()
+            self.size = os.fstat(source.fileno()).st_size - self.offset
+
+    @contextmanager
+    def open(self) -> Iterator[IO]:
+        if self.file is not None:
+            self.file.seek(self.offset)
+            yield self.file
+            return
+
+        with _open_files:
+            with open(self.path, "rb") as file:
+                yield file
+
+
+def _read_chunks(file: IO, size: int, chunk_size: int, use_mmap: bool) -> Iterator[bytes]:
+    if use_mmap and size:
+        yield from _read_mapped_chunks(file, size, chunk_size)
+        return
+
+    remaining = size
+    while remaining > 0:
+        chunk = file.read(min(chunk_size, remaining))
+        if not chunk:
+            raise IOError(f"File '{file.name}' was truncated while being uploaded.")
+
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _read_mapped_chunks(file: IO, size: int, chunk_size: int) -> Iterator[bytes]:
+    # Map the file one window at a time so mapped pages are released as the upload
+    # progresses instead of accumulating in the resident set.
+    position = file.tell()
+    end = position + size
+    while position < end:
+        window_start = position - position % mmap.ALLOCATIONGRANULARITY
+        window_length = min(MMAP_WINDOW_SIZE, end - window_start)
+        with mmap.mmap(
+            file.fileno(), window_length, access=mmap.ACCESS_READ, offset=window_start
+        ) as mapped:
+            window_end = window_start + window_length
+            while position < window_end:
+                chunk_start = position - window_start
+                chunk_end = min(position + chunk_size, window_end) - window_start
+                yield mapped[chunk_start:chunk_end]
+                position = window_start + chunk_end
+
+
+def _first_json_char(file: IO, start: int, end: int, chunk_size: int) -> bytes:
+    file.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = file.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+
+        remaining -= len(chunk)
+        chunk = chunk.lstrip(_JSON_WHITESPACE)
+        if chunk:
+            return chunk[:1]
+
+    return b""
+
+
+def _last_json_char(file: IO, start: int, end: int, chunk_size: int) -> bytes:
+    position = end
+    while position > start:
+        length = min(chunk_size, position - start)
+        position -= length
+        file.seek(position)
+        chunk = file.read(length).rstrip(_JSON_WHITESPACE)
+        if chunk:
+            return chunk[-1:]
+
+    return b""
+
+
+def _quote(value: str) -> str:
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+__all__ = ["JSONEnvelope", "MultipartEncoder", "StreamingBody", "set_max_open_files"]
@@ -0,0 +1,395 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from pinata.bulk import DEFAULT_MAX_WORKERS, run_bounded
+from pinata.cid import compute_cid
+from pinata.index import _batches
+from pinata.logger import logger
+
+DEFAULT_MANIFEST_DIR = Path.home() / ".pinata" / "sync"
+# A file modified this close to a scan could be modified again without its mtime changing,
+# so it is hashed again by the next sync instead of being trusted.
+RACY_WINDOW_NS = 2 * 10**9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    cid TEXT NOT NULL,
+    owned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_cid ON files (cid);
+CREATE TABLE IF NOT EXISTS pending_unpins (
+    cid TEXT PRIMARY KEY
+);
+CREATE TEMP TABLE IF NOT EXISTS scan (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL
+);
+"""
+_CHANGED_QUERY = """
+SELECT s.path, s.size, s.mtime_ns, s.inode, f.cid, f.owned
+FROM scan s LEFT JOIN files f USING (path)
+WHERE f.path IS NULL OR f.size != s.size OR f.mtime_ns != s.mtime_ns OR f.inode != s.inode
+ORDER BY s.path
+"""
+_REMOVED_QUERY = """
+SELECT f.path, f.cid, f.owned FROM files f LEFT JOIN scan s USING (path) WHERE s.path IS NULL
+ORDER BY f.path
+"""
+_RECORD_QUERY = """
+INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, cid, owned)
+VALUES (?, ?, ?, ?, ?, ? OR EXISTS (SELECT 1 FROM files WHERE cid = ? AND owned))
+"""
+_SCAN_BATCH_SIZE = 1000
+
+
+class SyncItem(NamedTuple):
+    """
+    A file a :class:`SyncPlan` acts on. ``path`` is relative to the synced directory, and
+    ``old_cid`` is the CID the manifest had for it, if any. ``owned`` tells whether the
+    manifest's syncs pinned the content of ``old_cid``, or of ``cid`` once recorded.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+    cid: Optional[str] = None
+    old_cid: Optional[str] = None
+    owned: bool = False
+
+
+class SyncPlan:
+    """
+    The changes that bring the pins of a directory up-to-date, computed by
+    :meth:`SyncManifest.plan`.
+
+    Args:
+        directory (pathlib.Path): The synced directory.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        # New or changed files whose content isn't pinned yet.
+        self.upload: List[SyncItem] = []
+        # New or changed files whose content is already pinned; they are only recorded.
+        self.adopt: List[SyncItem] = []
+        # Files whose size, mtime or inode changed but whose content didn't.
+        self.touch: List[SyncItem] = []
+        # Files deleted from the directory.
+        self.remove: List[SyncItem] = []
+        # CIDs the manifest's syncs pinned that no file of the directory has anymore.
+        self.unpin: List[str] = []
+        self.unchanged = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncPlan upload={len(self.upload)} adopt={len(self.adopt)} "
+            f"touch={len(self.touch)} remove={len(self.remove)} unpin={len(self.unpin)} "
+            f"unchanged={self.unchanged}>"
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.upload or self.adopt or self.touch or self.remove or self.unpin)
+
+    def describe(self) -> Iterator[str]:
+        """
+        Describe the plan one change per line, e.g. for a dry run.
+        """
+
+        for action, items in (("upload", self.upload), ("adopt", self.adopt)):
+            for item in items:
+                yield f"{action} {item.path} ({item.cid})"
+
+        for item in self.remove:
+            yield f"remove {item.path} ({item.old_cid})"
+
+        for cid in self.unpin:
+            yield f"unpin {cid}"
+
+
+class SyncReport:
+    """
+    The outcomes of :meth:`~pinata.sdk.Pinata.sync_directory`.
+    """
+
+    def __init__(self, plan: SyncPlan):
+        self.plan = plan
+        self.uploaded: List[str] = []
+        self.unpinned: List[str] = []
+        # Failed paths and CIDs.
+        self.failed: Dict[str, Exception] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncReport uploaded={len(self.uploaded)} unpinned={len(self.unpinned)} "
+            f"failed={len(self.failed)}>"
+        )
+
+    @property
+    def success(self) -> bool:
+        return not self.failed
+
+
+class SyncManifest:
+    """
+    The local record of a directory kept in sync with Pinata: the CID of each file, with
+    the size, modification time and inode the file had when it was hashed. Files whose
+    metadata still matches are not read again, so a sync only hashes the files that
+    changed, and its network requests and uploads scale with the change too.
+
+    The manifest also records which CIDs its syncs uploaded. Only those are ever unpinned:
+    content that was already pinned when a file was synced, e.g. by another directory or
+    another tool, is adopted and left alone.
+
+    Args:
+        path (pathlib.Path): The path to the SQLite manifest file.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(files)")]
+            if columns and "owned" not in columns:
+                # Manifests from before ownership was recorded. Their CIDs count as adopted.
+                self._connection.execute(
+                    "ALTER TABLE files ADD COLUMN owned INTEGER NOT NULL DEFAULT 0"
+                )
+
+            self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> "SyncManifest":
+        """
+        Open the default manifest of a directory, kept in ``~/.pinata/sync``.
+
+        Args:
+            directory (pathlib.Path): The synced directory.
+        """
+
+        digest = hashlib.sha1(str(directory.resolve()).encode()).hexdigest()
+        return cls(DEFAULT_MANIFEST_DIR / f"{digest}.sqlite")
+
+    def __enter__(self) -> "SyncManifest":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def get_cid(self, path: str) -> Optional[str]:
+        """
+        Get the CID recorded for a file.
+
+        Args:
+            path (str): The path of the file, relative to the synced directory.
+
+        Returns:
+            Optional[str]
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT cid FROM files WHERE path = ?", (path,)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def plan(
+        self,
+        directory: Path,
+        is_pinned: Callable[[str], bool],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> SyncPlan:
+        """
+        Compare a directory with the manifest and plan the changes that bring its pins
+        up-to-date. Only new files and files whose size, mtime or inode changed are hashed.
+
+        Args:
+            directory (pathlib.Path): The synced directory. Its sub-directories are included.
+            is_pinned (Callable[[str], bool]): Tells whether a CID is pinned already. It is
+              only called for the content of new or changed files.
+            max_workers (int): The number of files to hash, and of CIDs to look up, at a time.
+
+        Returns:
+            :class:`SyncPlan`
+        """
+
+        root = directory.resolve()
+        plan = SyncPlan(directory)
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        exclude = {f"{self.path.resolve()}{suffix}" for suffix in ("", "-journal", "-wal")}
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM scan")
+            for batch in _batches(_scan(root, exclude), _SCAN_BATCH_SIZE):
+                self._connection.executemany("INSERT INTO scan VALUES (?, ?, ?, ?)", batch)
+
+            # Racy files are recorded with no mtime, so that the next sync hashes them again.
+            changed = [
+                SyncItem(
+                    path,
+                    size,
+                    0 if mtime_ns >= racy_after else mtime_ns,
+                    inode,
+                    None,
+                    cid,
+                    bool(owned),
+                )
+                for path, size, mtime_ns, inode, cid, owned in self._connection.execute(
+                    _CHANGED_QUERY
+                )
+            ]
+            plan.remove = [
+                SyncItem(path, 0, 0, 0, None, cid, bool(owned))
+                for path, cid, owned in self._connection.execute(_REMOVED_QUERY)
+            ]
+            scanned = self._connection.execute("SELECT COUNT(*) FROM scan").fetchone()[0]
+            self._connection.execute("DELETE FROM scan")
+
+        plan.unchanged = scanned - len(changed)
+        hashed = []
+        hash_results = run_bounded(lambda i: compute_cid(root / i.path), changed, max_workers)
+        for item, cid, error in hash_results:
+            if error:
+                # E.g. deleted since the scan; it is picked up by the next sync.
+                logger.warning(f"Skipping '{item.path}': {error}")
+            else:
+                hashed.append(item._replace(cid=cid))
+
+        dirty = {item.path for item in changed} | {item.path for item in plan.remove}
+        new_cids: Set[str] = set()
+        lookups = []
+        for item in sorted(hashed):
+            if item.cid == item.old_cid:
+                plan.touch.append(item)
+                continue
+
+            # Whether the new content is owned is only known once it is recorded.
+            item = item._replace(owned=False)
+            if item.cid in new_cids or self._is_referenced(item.cid, dirty):
+                plan.adopt.append(item)
+            else:
+                lookups.append(item)
+
+            new_cids.add(item.cid)
+
+        lookup_results = run_bounded(lambda i: is_pinned(i.cid), lookups, max_workers)
+        for item, pinned, error in sorted(lookup_results, key=lambda r: r[0]):
+            # Content whose status can't be looked up is uploaded again.
+            (plan.adopt if pinned and not error else plan.upload).append(item)
+
+        plan.adopt.sort()
+        old_cids = {i.old_cid for i in changed + plan.remove if i.old_cid and i.owned}
+        old_cids.update(self._get_pending_unpins())
+        plan.unpin = sorted(
+            cid for cid in old_cids - new_cids if not self._is_referenced(cid, dirty)
+        )
+        return plan
+
+    def record(self, items: Iterable[SyncItem]):
+        """
+        Record files with their CIDs. A file is owned if ``owned`` is set, i.e. its content
+        was just uploaded, or if a recorded file already owns the same CID.
+
+        Args:
+            items (Iterable[:class:`SyncItem`]): The files to record.
+        """
+
+        rows = [(i.path, i.size, i.mtime_ns, i.inode, i.cid, i.owned, i.cid) for i in items]
+        with self._lock, self._connection:
+            self._connection.executemany(_RECORD_QUERY, rows)
+
+    def forget(self, paths: Iterable[str]):
+        """
+        Remove files from the manifest.
+
+        Args:
+            paths (Iterable[str]): The paths of the files, relative to the synced directory.
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in paths))
+
+    def add_pending_unpins(self, cids: Iterable[str]) -> List[str]:
+        """
+        Queue CIDs to be unpinned, so that unpins that fail are retried by the next sync.
+
+        Args:
+            cids (Iterable[str]): The CIDs to unpin.
+
+        Returns:
+            List[str]: All queued CIDs that no recorded file has.
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO pending_unpins VALUES (?)", ((c,) for c in cids)
+            )
+            # CIDs that a file got again don't need unpinning anymore.
+            self._connection.execute(
+                "DELETE FROM pending_unpins WHERE cid IN (SELECT cid FROM files)"
+            )
+
+        return self._get_pending_unpins()
+
+    def remove_pending_unpins(self, cids: Iterable[str]):
+        """
+        Dequeue CIDs that were unpinned.
+
+        Args:
+            cids (Iterable[str]): The unpinned CIDs.
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM pending_unpins WHERE cid = ?", ((c,) for c in cids)
+            )
+
+    def close(self):
+        self._connection.close()
+
+    def _get_pending_unpins(self) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT cid FROM pending_unpins ORDER BY cid")
+            return [row[0] for row in rows]
+
+    def _is_referenced(self, cid: str, exclude: Set[str]) -> bool:
+        with self._lock:
+            rows = self._connection.execute("SELECT path FROM files WHERE cid = ?", (cid,))
+            return any(path not in exclude for (path,) in rows)
+
+
+def _scan(root: Path, exclude: Set[str]) -> Iterator[Tuple[str, int, int, int]]:
+    # Walk the tree with 'os.scandir', which gets each entry's type, and on some platforms
+    # its inode, without extra system calls. Paths are relative and use forward slashes.
+    prefix_length = len(str(root)) + 1
+    directories = [str(root)]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.is_file() and entry.path not in exclude:
+                    stat = entry.stat()
+                    path = entry.path[prefix_length:].replace(os.sep, "/")
+                    yield path, stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+__all__ = ["SyncItem", "SyncManifest", "SyncPlan", "SyncReport"]
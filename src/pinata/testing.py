@@ -0,0 +1,903 @@
+import argparse
+import json
+import random
+import re
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qs, urlparse
+
+from pinata.cid import _DAG_PB, DEFAULT_CHUNK_SIZE, _cid_to_str, _DagBuilder, _make_cid, _Node
+from pinata.exceptions import NOT_PINNED_REASON
+from pinata.records import parse_timestamp
+
+READ_SIZE = 64 * 1024
+DEFAULT_PAGE_LIMIT = 10
+DEFAULT_JOB_PAGE_LIMIT = 5
+MAX_PAGE_LIMIT = 1000
+DEFAULT_ERROR_STATUSES = (429, 500, 502, 503)
+FAKE_USER_ID = "00000000-0000-0000-0000-000000000000"
+
+# A queued fault that resets the connection instead of responding.
+RESET = "reset"
+
+Latency = Union[float, Callable[[], float]]
+
+
+class FakePinataServer:
+    """
+    An in-process stand-in for the Pinata API, to test and load-test code that uses the
+    SDK without touching the real service. It implements the endpoints the SDK uses:
+    ``pinFileToIPFS``, ``pinJSONToIPFS``, ``addHashToPinQueue``, ``pinJobs``,
+    ``unpin/<cid>``, ``pinList`` with its filters and paging, and ``testAuthentication``.
+    Pins are kept in memory, and uploads get the CID IPFS would give their content. Point
+    a session at it with ``PinataAPISession.from_api_key(..., host_address=server.url)``.
+    It also serves as a gateway: ``/ipfs/<cid>`` returns content added with
+    :meth:`add_content`, with support for range requests.
+
+    The server can be made slow and unreliable: ``latency`` delays each response,
+    ``bandwidth`` caps how fast each request and response is transferred, and a share of
+    requests can fail with a 429 or 5xx status or have their connection reset. Faults can
+    also be queued for the next requests with :meth:`fail_next` and :meth:`reset_next`.
+
+    Args:
+        latency (Union[float, Callable[[], float]]): The seconds to wait before each
+          response, or a function returning them, e.g.
+          ``lambda: random.expovariate(1 / 0.05)``.
+        bandwidth (Optional[int]): The maximum bytes per second of each request and
+          response body.
+        error_rate (float): The share of requests that fail with one of
+          ``error_statuses``.
+        error_statuses (Sequence[int]): The statuses failed requests get, picked at
+          random.
+        reset_rate (float): The share of requests whose connection is reset.
+        retry_after (Optional[float]): The ``Retry-After`` of 429 responses.
+        compute_cids (bool): Compute the real CIDs of uploads. Disable it when hashing
+          uploads would make the server the bottleneck of a load test; uploads then get
+          unique made-up CIDs.
+        hash_pin_delay (float): The seconds it takes to pin a hash added with
+          ``addHashToPinQueue``. Its job is ``"prechecking"`` for the first half of them,
+          then ``"retrieving"``.
+        api_key (Optional[str]): When given, requests must use this API key.
+        api_secret (Optional[str]): When given, requests must use this API secret.
+        seed (Optional[int]): Seeds the random faults.
+        host (str): The address to listen on.
+        port (int): The port to listen on, ``0`` for any free port.
+    """
+
+    def __init__(
+        self,
+        latency: Latency = 0.0,
+        bandwidth: Optional[int] = None,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = DEFAULT_ERROR_STATUSES,
+        reset_rate: float = 0.0,
+        retry_after: Optional[float] = None,
+        compute_cids: bool = True,
+        hash_pin_delay: float = 0.0,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.reset_rate = reset_rate
+        self.retry_after = retry_after
+        self.compute_cids = compute_cids
+        self.hash_pin_delay = hash_pin_delay
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pins: Dict[str, _Pin] = {}
+        self._jobs: Dict[str, Tuple[float, Dict]] = {}
+        self._failing_hashes: Dict[str, str] = {}
+        self._contents: Dict[str, bytes] = {}
+        self._faults: Deque[Union[int, str]] = deque()
+        self._stats: Counter = Counter()
+        self._server: Optional[_Server] = None
+
+    def __enter__(self) -> "FakePinataServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the running server, to use as a session's ``host_address``.
+        """
+
+        if self._server is None:
+            raise RuntimeError("The server is not running.")
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def stats(self) -> Counter:
+        """
+        The number of requests per endpoint, e.g. ``stats["pinList"]``, and of injected
+        ``"errors"`` and ``"resets"``.
+        """
+
+        with self._lock:
+            return Counter(self._stats)
+
+    def start(self) -> str:
+        """
+        Start serving in a background thread.
+
+        Returns:
+            str: The base URL of the server.
+        """
+
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.fake = self
+        # A short poll interval makes stop() return quickly.
+        thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """
+        Make the next requests fail with the given status.
+
+        Args:
+            count (int): The number of requests to fail.
+            status (int): The HTTP status to respond with.
+        """
+
+        with self._lock:
+            self._faults.extend([status] * count)
+
+    def reset_next(self, count: int = 1):
+        """
+        Reset the connection of the next requests instead of responding.
+
+        Args:
+            count (int): The number of requests to reset.
+        """
+
+        with self._lock:
+            self._faults.extend([RESET] * count)
+
+    def fail_pin_job(self, cid: str, status: str = "expired"):
+        """
+        Make the jobs of a hash added with ``addHashToPinQueue`` end with a failure status
+        instead of pinning it. Failed jobs stay in the ``pinJobs`` listing.
+
+        Args:
+            cid (str): The hash whose jobs fail.
+            status (str): The failure status, e.g. ``"expired"`` or ``"over_max_size"``.
+        """
+
+        with self._lock:
+            self._failing_hashes[cid] = status
+
+    def add_pin(
+        self,
+        cid: str,
+        name: Optional[str] = None,
+        size: int = 0,
+        date_pinned: Optional[datetime] = None,
+        keyvalues: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        Add a pin directly, e.g. to fill the server with pins before a test.
+
+        Args:
+            cid (str): The CID of the pinned content.
+            name (Optional[str]): The name of the pin.
+            size (int): The size of the pinned content in bytes.
+            date_pinned (Optional[datetime]): When the content was pinned. Defaults to now.
+            keyvalues (Optional[Dict]): The pin's metadata key-values.
+
+        Returns:
+            Dict: The pin as a ``pinList`` row.
+        """
+
+        pinned_at = date_pinned.timestamp() if date_pinned else time.time()
+        with self._lock:
+            pin = _Pin(cid, name, size, keyvalues, pinned_at)
+            self._pins[cid] = pin
+            return pin.to_row()
+
+    def add_content(self, content: bytes, name: Optional[str] = None) -> str:
+        """
+        Pin content and serve it from the gateway, e.g. to test downloads.
+
+        Args:
+            content (bytes): The content.
+            name (Optional[str]): The name of the pin.
+
+        Returns:
+            str: The CID of the content.
+        """
+
+        node = self._hash_content([content])
+        cid = _cid_to_str(node.cid, 0)
+        with self._lock:
+            self._pins[cid] = _Pin(cid, name, node.tsize, None, time.time())
+            self._contents[cid] = content
+
+        return cid
+
+    def get_pin(self, cid: str) -> Optional[Dict]:
+        """
+        Get a pin as a ``pinList`` row, whether it is pinned or not.
+
+        Args:
+            cid (str): The CID of the pinned content.
+
+        Returns:
+            Optional[Dict]
+        """
+
+        with self._lock:
+            self._process_jobs()
+            pin = self._pins.get(cid)
+            return pin.to_row() if pin else None
+
+    def _next_fault(self) -> Optional[Union[int, str]]:
+        with self._lock:
+            if self._faults:
+                fault: Optional[Union[int, str]] = self._faults.popleft()
+            else:
+                roll = self._random.random()
+                if roll < self.reset_rate:
+                    fault = RESET
+                elif roll < self.reset_rate + self.error_rate:
+                    fault = self._random.choice(self.error_statuses)
+                else:
+                    fault = None
+
+            if fault is not None:
+                self._stats["resets" if fault == RESET else "errors"] += 1
+
+            return fault
+
+    def _get_latency(self) -> float:
+        latency = self.latency() if callable(self.latency) else self.latency
+        return max(0.0, latency)
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self._stats[endpoint] += 1
+
+    def _is_authorized(self, headers) -> bool:
+        api_key = self.api_key is None or headers.get("pinata_api_key") == self.api_key
+        secret = self.api_secret is None or headers.get("pinata_secret_api_key") == self.api_secret
+        return api_key and secret
+
+    def _pin_file(self, body: "_BodyReader", content_type: str) -> Dict:
+        match = re.search(r"boundary=\"?([^\";]+)\"?", content_type)
+        if not match:
+            raise _HTTPError(400, "Expected a multipart/form-data body.")
+
+        files: List[Tuple[str, _Node]] = []
+        metadata: Dict = {}
+        for headers, content in _MultipartReader(body.read, match.group(1)).iter_parts():
+            file_name = _get_header_param(headers, "filename")
+            if file_name is None:
+                value = b"".join(content)
+                if _get_header_param(headers, "name") == "pinataMetadata":
+                    metadata = _load_json(value)
+            else:
+                files.append((file_name, self._hash_content(content)))
+
+        if not files:
+            raise _HTTPError(400, "No file was provided.")
+
+        if len(files) == 1 and "/" not in files[0][0]:
+            name, node = files[0]
+        else:
+            name, node = self._hash_directory(files)
+
+        return self._add_upload(
+            _cid_to_str(node.cid, 0), metadata.get("name") or name, node, metadata
+        )
+
+    def _pin_json(self, data: Dict) -> Dict:
+        if "pinataContent" not in data:
+            raise _HTTPError(400, "pinataContent is required.")
+
+        content = json.dumps(data["pinataContent"]).encode()
+        node = self._hash_content([content])
+        metadata = data.get("pinataMetadata") or {}
+        return self._add_upload(_cid_to_str(node.cid, 0), metadata.get("name"), node, metadata)
+
+    def _queue_hash(self, data: Dict) -> Dict:
+        cid = data.get("hashToPin")
+        if not cid:
+            raise _HTTPError(400, "hashToPin is required.")
+
+        metadata = data.get("pinataMetadata") or {}
+        job = {
+            "id": str(uuid.uuid4()),
+            "ipfs_pin_hash": cid,
+            "date_queued": _format_timestamp(time.time()),
+            "name": metadata.get("name"),
+            "status": "prechecking",
+            "keyvalues": metadata.get("keyvalues"),
+        }
+        with self._lock:
+            self._jobs[job["id"]] = (time.monotonic() + self.hash_pin_delay, job)
+
+        return {"id": job["id"], "ipfsHash": cid, "status": job["status"], "name": job["name"]}
+
+    def _unpin(self, cid: str) -> str:
+        with self._lock:
+            self._process_jobs()
+            pin = self._pins.get(cid)
+            if pin is None or pin.unpinned_at is not None:
+                details = f"The current user has not pinned the cid: {cid}"
+                raise _HTTPError(400, {"reason": NOT_PINNED_REASON, "details": details})
+
+            pin.unpinned_at = time.time()
+
+        return "OK"
+
+    def _get_content(self, cid: str, range_header: Optional[str]) -> Union[bytes, "_ByteRange"]:
+        with self._lock:
+            content = self._contents.get(cid)
+
+        if content is None:
+            raise _HTTPError(404, f"No content found for '{cid}'.")
+
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if not match:
+            return content
+
+        start = int(match.group(1))
+        end = min(int(match.group(2) or len(content) - 1), len(content) - 1)
+        if start > end:
+            raise _HTTPError(416, "Range Not Satisfiable")
+
+        stop = end + 1
+        return _ByteRange(content[start:stop], start, end, len(content))
+
+    def _list_pin_jobs(self, query: str) -> Dict:
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        try:
+            limit = int(params.get("limit", DEFAULT_JOB_PAGE_LIMIT))
+            offset = int(params.get("offset", 0))
+        except ValueError as err:
+            raise _HTTPError(400, str(err)) from err
+
+        if not 1 <= limit <= MAX_PAGE_LIMIT or offset < 0:
+            raise _HTTPError(400, f"limit must be between 1 and {MAX_PAGE_LIMIT}.")
+
+        status, cid = params.get("status"), params.get("ipfs_pin_hash")
+        with self._lock:
+            self._process_jobs()
+            jobs = [
+                dict(job)
+                for _, job in self._jobs.values()
+                if (not status or job["status"] == status)
+                and (not cid or job["ipfs_pin_hash"] == cid)
+            ]
+
+        # Timestamps of the same precision sort like the times they stand for.
+        jobs.sort(key=lambda j: j["date_queued"], reverse=params.get("sort") == "DESC")
+        end = offset + limit
+        return {"count": len(jobs), "rows": jobs[offset:end]}
+
+    def _list_pins(self, query: str) -> Dict:
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        try:
+            limit = int(params.get("pageLimit", DEFAULT_PAGE_LIMIT))
+            offset = int(params.get("pageOffset", 0))
+            filters = _PinFilters(params)
+        except ValueError as err:
+            raise _HTTPError(400, str(err)) from err
+
+        if not 1 <= limit <= MAX_PAGE_LIMIT or offset < 0:
+            raise _HTTPError(400, f"pageLimit must be between 1 and {MAX_PAGE_LIMIT}.")
+
+        with self._lock:
+            self._process_jobs()
+            pins = [p for p in self._pins.values() if filters.match(p)]
+
+        pins.sort(key=lambda p: p.pinned_at, reverse=True)
+        end = offset + limit
+        rows = [p.to_row() for p in pins[offset:end]]
+        return {"count": len(pins), "rows": rows}
+
+    def _hash_content(self, content: Iterable[bytes]) -> _Node:
+        if self.compute_cids:
+            builder = _DagBuilder(0, DEFAULT_CHUNK_SIZE, raw_leaves=False)
+            return builder.add_chunks(_fixed_size_chunks(content, DEFAULT_CHUNK_SIZE))
+
+        size = sum(len(piece) for piece in content)
+        return _Node(_make_cid(uuid.uuid4().bytes, _DAG_PB, 0), size, size)
+
+    def _hash_directory(self, files: List[Tuple[str, _Node]]) -> Tuple[str, _Node]:
+        # Files of a directory are named "<directory name>/<relative path>".
+        root_names = {name.split("/", 1)[0] for name, _ in files}
+        if len(root_names) != 1 or any("/" not in name for name, _ in files):
+            raise _HTTPError(400, "Files must be in the same directory.")
+
+        tree: Dict = {}
+        for name, node in files:
+            parts = name.split("/")[1:]
+            subtree = tree
+            for part in parts[:-1]:
+                subtree = subtree.setdefault(part, {})
+
+            subtree[parts[-1]] = node
+
+        if not self.compute_cids:
+            size = sum(node.file_size for _, node in files)
+            return root_names.pop(), _Node(_make_cid(uuid.uuid4().bytes, _DAG_PB, 0), size, 0)
+
+        builder = _DagBuilder(0, DEFAULT_CHUNK_SIZE, raw_leaves=False)
+        return root_names.pop(), builder._directory_node(tree)
+
+    def _add_upload(self, cid: str, name: Optional[str], node: _Node, metadata: Dict) -> Dict:
+        now = time.time()
+        with self._lock:
+            pin = self._pins.get(cid)
+            is_duplicate = pin is not None and pin.unpinned_at is None
+            if not is_duplicate:
+                pin = _Pin(cid, name, node.tsize, metadata.get("keyvalues"), now)
+                self._pins[cid] = pin
+
+        response = {"IpfsHash": cid, "PinSize": node.tsize, "Timestamp": _format_timestamp(now)}
+        if is_duplicate:
+            response["isDuplicate"] = True
+
+        return response
+
+    def _process_jobs(self):
+        # Pin the queued hashes whose time has come. Called with the lock held.
+        now = time.monotonic()
+        for job_id, (due, job) in list(self._jobs.items()):
+            cid = job["ipfs_pin_hash"]
+            if due > now:
+                if due - now <= self.hash_pin_delay / 2:
+                    job["status"] = "retrieving"
+            elif cid in self._failing_hashes:
+                self._jobs[job_id] = (float("inf"), job)
+                job["status"] = self._failing_hashes[cid]
+            else:
+                del self._jobs[job_id]
+                self._pins[cid] = _Pin(cid, job["name"], 0, job["keyvalues"], time.time())
+
+
+class _Pin:
+    __slots__ = ("id", "cid", "name", "size", "keyvalues", "pinned_at", "unpinned_at")
+
+    def __init__(
+        self, cid: str, name: Optional[str], size: int, keyvalues: Optional[Dict], pinned_at: float
+    ):
+        self.id = str(uuid.uuid4())
+        self.cid = cid
+        self.name = name
+        self.size = size
+        self.keyvalues = keyvalues
+        self.pinned_at = pinned_at
+        self.unpinned_at: Optional[float] = None
+
+    def to_row(self) -> Dict:
+        unpinned_at = self.unpinned_at
+        return {
+            "id": self.id,
+            "ipfs_pin_hash": self.cid,
+            "size": self.size,
+            "user_id": FAKE_USER_ID,
+            "date_pinned": _format_timestamp(self.pinned_at),
+            "date_unpinned": _format_timestamp(unpinned_at) if unpinned_at else None,
+            "metadata": {"name": self.name, "keyvalues": self.keyvalues},
+            "regions": [{"regionId": "FRA1", "currentReplicationCount": 1}],
+        }
+
+
+class _PinFilters:
+    def __init__(self, params: Dict[str, str]):
+        self.status = params.get("status", "all")
+        if self.status not in ("all", "pinned", "unpinned"):
+            raise ValueError(f"Invalid status '{self.status}'.")
+
+        self.hash_contains = params.get("hashContains")
+        self.pin_start = parse_timestamp(params.get("pinStart"))
+        self.pin_end = parse_timestamp(params.get("pinEnd"))
+        self.unpin_start = parse_timestamp(params.get("unpinStart"))
+        self.unpin_end = parse_timestamp(params.get("unpinEnd"))
+        size_min, size_max = params.get("pinSizeMin"), params.get("pinSizeMax")
+        self.size_min = int(size_min) if size_min else None
+        self.size_max = int(size_max) if size_max else None
+
+    def match(self, pin: _Pin) -> bool:
+        unpinned = pin.unpinned_at is not None
+        if (self.status == "pinned" and unpinned) or (self.status == "unpinned" and not unpinned):
+            return False
+        if self.hash_contains and self.hash_contains not in pin.cid:
+            return False
+        if not _in_range(pin.pinned_at, self.pin_start, self.pin_end):
+            return False
+        if self.unpin_start is not None or self.unpin_end is not None:
+            if not unpinned or not _in_range(pin.unpinned_at, self.unpin_start, self.unpin_end):
+                return False
+
+        return _in_range(pin.size, self.size_min, self.size_max)
+
+
+def _in_range(value, low, high) -> bool:
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+class _ByteRange(NamedTuple):
+    content: bytes
+    start: int
+    end: int
+    total: int
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, error: Union[str, Dict]):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    fake: FakePinataServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately, so without this every response on a
+    # kept-alive connection stalls on delayed ACKs.
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def log_message(self, *args):
+        pass
+
+    def _handle(self):
+        fake = self.server.fake
+        url = urlparse(self.path)
+        endpoint = _get_endpoint(url.path)
+        fake._count(endpoint)
+        limiter = _RateLimiter(fake.bandwidth)
+        fault = fake._next_fault()
+        if fault == RESET:
+            self._reset()
+            return
+
+        body = _BodyReader(self.rfile, self.headers, limiter)
+        headers: Dict[str, str] = {}
+        try:
+            if fault is not None:
+                if fault == 429 and fake.retry_after is not None:
+                    headers["Retry-After"] = f"{fake.retry_after:g}"
+
+                raise _HTTPError(int(fault), "Injected fault.")
+            elif endpoint != "ipfs" and not fake._is_authorized(self.headers):
+                raise _HTTPError(401, "Invalid authentication credentials.")
+
+            status, data = 200, self._route(fake, url.path, url.query, body)
+            if isinstance(data, _ByteRange):
+                status = 206
+                headers["Content-Range"] = f"bytes {data.start}-{data.end}/{data.total}"
+                data = data.content
+        except _HTTPError as err:
+            status, data = err.status, {"error": err.error}
+
+        body.drain()
+        time.sleep(fake._get_latency())
+        self._respond(status, data, headers, limiter)
+
+    def _route(self, fake: FakePinataServer, path: str, query: str, body: "_BodyReader") -> Any:
+        method = self.command
+        path = path.strip("/")
+        if method == "POST" and path == "pinning/pinFileToIPFS":
+            return fake._pin_file(body, self.headers.get("Content-Type", ""))
+        elif method == "POST" and path == "pinning/pinJSONToIPFS":
+            return fake._pin_json(_load_json(body.read_all()))
+        elif method == "POST" and path == "pinning/addHashToPinQueue":
+            return fake._queue_hash(_load_json(body.read_all()))
+        elif method == "GET" and path == "pinning/pinJobs":
+            return fake._list_pin_jobs(query)
+        elif method == "DELETE" and path.startswith("pinning/unpin/"):
+            return fake._unpin(path.split("/", 2)[2])
+        elif method == "GET" and path == "data/pinList":
+            return fake._list_pins(query)
+        elif method == "GET" and path.startswith("ipfs/"):
+            return fake._get_content(path.split("/", 1)[1], self.headers.get("Range"))
+        elif method == "GET" and path == "data/testAuthentication":
+            return {"message": "Congratulations! You are communicating with the Pinata API!"}
+
+        raise _HTTPError(404, f"Cannot {method} /{path}")
+
+    def _respond(self, status: int, data: Any, headers: Dict[str, str], limiter: "_RateLimiter"):
+        if isinstance(data, bytes):
+            body, content_type = data, "application/octet-stream"
+        elif isinstance(data, str):
+            body, content_type = data.encode(), "text/plain; charset=utf-8"
+        else:
+            body, content_type = json.dumps(data).encode(), "application/json; charset=utf-8"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        view = memoryview(body)
+        for start in range(0, len(body), READ_SIZE):
+            end = start + READ_SIZE
+            chunk = view[start:end]
+            self.wfile.write(chunk)
+            limiter.consume(len(chunk))
+
+    def _reset(self):
+        # Closing with a zero linger time sends a RST instead of a FIN.
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.connection.close()
+        self.close_connection = True
+
+
+class _RateLimiter:
+    def __init__(self, rate: Optional[int]):
+        self.rate = rate
+        self._start = time.monotonic()
+        self._bytes = 0
+
+    def consume(self, size: int):
+        if not self.rate:
+            return
+
+        self._bytes += size
+        delay = self._bytes / self.rate - (time.monotonic() - self._start)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _BodyReader:
+    """
+    Reads a request body with a ``Content-Length`` or in chunked transfer encoding.
+    """
+
+    def __init__(self, rfile, headers, limiter: _RateLimiter):
+        self._rfile = rfile
+        self._limiter = limiter
+        self._chunked = "chunked" in headers.get("Transfer-Encoding", "").lower()
+        self._remaining = 0 if self._chunked else int(headers.get("Content-Length") or 0)
+        self._done = not self._chunked and not self._remaining
+
+    def read(self, size: int = READ_SIZE) -> bytes:
+        if self._done:
+            return b""
+
+        if self._chunked and not self._remaining:
+            self._remaining = int(self._rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if not self._remaining:
+                # Skip the trailers.
+                while self._rfile.readline().strip():
+                    pass
+
+                self._done = True
+                return b""
+
+        data = self._rfile.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        if not data:
+            raise _HTTPError(400, "The request body ended unexpectedly.")
+        elif self._chunked and not self._remaining:
+            self._rfile.readline()
+        elif not self._remaining:
+            self._done = True
+
+        self._limiter.consume(len(data))
+        return data
+
+    def read_all(self) -> bytes:
+        return b"".join(iter(self.read, b""))
+
+    def drain(self):
+        try:
+            while self.read():
+                pass
+        except _HTTPError:
+            pass
+
+
+class _MultipartReader:
+    """
+    Splits a ``multipart/form-data`` body into parts while it is being read, without
+    holding more than one read in memory.
+    """
+
+    def __init__(self, read: Callable[[], bytes], boundary: str):
+        self._read = read
+        self._delimiter = b"\r\n--" + boundary.encode()
+        # The first delimiter isn't preceded by a line break.
+        self._buffer = b"\r\n"
+
+    def iter_parts(self) -> Iterator[Tuple[str, Iterator[bytes]]]:
+        """
+        Yield the headers and an iterator over the content of each part.
+        """
+
+        for _ in self._iter_content():
+            pass  # The preamble.
+
+        while True:
+            self._fill(2)
+            if self._buffer.startswith(b"--"):
+                return
+
+            headers = self._read_headers()
+            content = self._iter_content()
+            yield headers, content
+            for _ in content:
+                pass  # Whatever the caller didn't read.
+
+    def _fill(self, size: int):
+        while len(self._buffer) < size:
+            self._buffer += self._read_more()
+
+    def _read_more(self) -> bytes:
+        data = self._read()
+        if not data:
+            raise _HTTPError(400, "The multipart body ended unexpectedly.")
+
+        return data
+
+    def _read_headers(self) -> str:
+        end = self._buffer.find(b"\r\n\r\n")
+        while end < 0:
+            self._buffer += self._read_more()
+            end = self._buffer.find(b"\r\n\r\n")
+
+        # The headers start after the line break that ends the delimiter.
+        headers = self._buffer[2:end].decode("utf-8", "replace")
+        start = end + 4
+        self._buffer = self._buffer[start:]
+        return headers
+
+    def _iter_content(self) -> Iterator[bytes]:
+        delimiter = self._delimiter
+        keep = len(delimiter) - 1
+        while True:
+            index = self._buffer.find(delimiter)
+            if index >= 0:
+                if index:
+                    yield self._buffer[:index]
+
+                end = index + len(delimiter)
+                self._buffer = self._buffer[end:]
+                return
+
+            # Keep enough bytes to find a delimiter split across reads.
+            if len(self._buffer) > keep:
+                yield self._buffer[:-keep]
+                self._buffer = self._buffer[-keep:]
+
+            self._buffer += self._read_more()
+
+
+def _get_header_param(headers: str, name: str) -> Optional[str]:
+    match = re.search(rf'\b{name}="([^"]*)"', headers)
+    if not match:
+        return None
+
+    # Undo the quoting of pinata.streaming.MultipartEncoder.
+    return match.group(1).replace("%22", '"').replace("%0D", "\r").replace("%0A", "\n")
+
+
+def _fixed_size_chunks(pieces: Iterable[bytes], size: int) -> Iterator[bytes]:
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def _get_endpoint(path: str) -> str:
+    # E.g. "/pinning/unpin/Qm..." -> "unpin", and "/ipfs/Qm..." -> "ipfs".
+    parts = path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 and parts[0] != "ipfs" else parts[0]
+
+
+def _load_json(data: bytes) -> Dict:
+    try:
+        value = json.loads(data)
+    except ValueError as err:
+        raise _HTTPError(400, f"Invalid JSON: {err}") from err
+
+    if not isinstance(value, dict):
+        raise _HTTPError(400, "Expected a JSON object.")
+
+    return value
+
+
+def _format_timestamp(timestamp: float) -> str:
+    date = datetime.fromtimestamp(timestamp, timezone.utc)
+    return date.strftime("%Y-%m-%dT%H:%M:%S.") + f"{date.microsecond // 1000:03d}Z"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Pinata API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response.")
+    parser.add_argument("--bandwidth", type=int, help="Bytes per second per connection.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reset-rate", type=float, default=0.0)
+    parser.add_argument("--no-cids", action="store_true", help="Don't hash uploads.")
+    args = parser.parse_args()
+
+    server = FakePinataServer(
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        reset_rate=args.reset_rate,
+        compute_cids=not args.no_cids,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving a fake Pinata API at {server.start()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["FakePinataServer"]
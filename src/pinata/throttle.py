@@ -0,0 +1,252 @@
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from pinata.exceptions import PinataException
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_THROTTLE_PATH = Path.home() / ".pinata" / "throttle"
+
+# tokens, time of the last refill, time until which requests are paused
+_STATE = struct.Struct("<ddd")
+_SLOT_POLL_INTERVAL = 0.005
+_MAX_SLOT_POLL_INTERVAL = 0.05
+
+
+class Throttle:
+    """
+    Limits the rate and concurrency of the requests made by all threads in this process.
+    The rate is enforced with a token bucket: requests beyond ``burst`` are scheduled
+    ``1 / rate`` seconds apart, in the order they arrive.
+
+    Args:
+        rate (Optional[float]): The maximum number of requests per second. ``None`` for no
+          limit.
+        burst (Optional[int]): The number of requests that may be sent at once after an
+          idle period. Defaults to one second's worth of ``rate``.
+        max_concurrency (Optional[int]): The maximum number of requests in flight.
+          ``None`` for no limit.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if rate is not None and rate <= 0:
+            raise ValueError("The rate must be positive.")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("The maximum concurrency must be at least 1.")
+
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else int(rate or 1))
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._state = (float(self.burst), time.time(), 0.0)
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._wait_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} rate={self.rate} burst={self.burst} "
+            f"max_concurrency={self.max_concurrency}>"
+        )
+
+    @property
+    def wait_time(self) -> float:
+        """
+        The total number of seconds requests have waited for this throttle.
+        """
+
+        return self._wait_time
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """
+        Wait until a request may be sent. The request counts against the concurrency limit
+        until the context exits.
+        """
+
+        start = time.perf_counter()
+        with self._concurrency_slot():
+            delay = self._reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._lock:
+                self._wait_time += time.perf_counter() - start
+
+            yield
+
+    def pause(self, seconds: float):
+        """
+        Hold back all requests for the given number of seconds, e.g. after the service
+        responded with ``429 Too Many Requests``. Requests are sent at ``rate`` again
+        afterwards, instead of all at once.
+
+        Args:
+            seconds (float): The number of seconds to pause for.
+        """
+
+        with self._state_lock():
+            self._write_state(self._paused(self._read_state(), seconds, time.time()))
+
+    def _reserve(self) -> float:
+        with self._state_lock():
+            state, delay = self._take_token(self._read_state(), time.time())
+            self._write_state(state)
+
+        return delay
+
+    def _take_token(
+        self, state: Tuple[float, float, float], now: float
+    ) -> Tuple[Tuple[float, float, float], float]:
+        tokens, updated, paused_until = state
+        delay = max(0.0, paused_until - now)
+        if self.rate is None:
+            return state, delay
+
+        # Tokens can go negative: the debt is the time the caller has to wait for its turn.
+        tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate) - 1
+        if tokens < 0:
+            delay = max(delay, -tokens / self.rate)
+
+        return (tokens, now, paused_until), delay
+
+    def _paused(
+        self, state: Tuple[float, float, float], seconds: float, now: float
+    ) -> Tuple[float, float, float]:
+        tokens, updated, paused_until = state
+        paused_until = max(paused_until, now + seconds)
+        if self.rate is not None:
+            # Drop any saved-up burst and go into debt for the pause, so that requests
+            # resume at the regular rate.
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate)
+            tokens = min(tokens, 0.0) - seconds * self.rate
+            updated = now
+
+        return tokens, updated, paused_until
+
+    @contextmanager
+    def _concurrency_slot(self) -> Iterator[None]:
+        if self._slots is None:
+            yield
+            return
+
+        with self._slots:
+            yield
+
+    @contextmanager
+    def _state_lock(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _read_state(self) -> Tuple[float, float, float]:
+        return self._state
+
+    def _write_state(self, state: Tuple[float, float, float]):
+        self._state = state
+
+
+class ProcessThrottle(Throttle):
+    """
+    A :class:`Throttle` shared by every process on this machine that uses the same
+    ``path``, e.g. a fleet of workers pinning with the same account. The token bucket is
+    kept in a small file updated under an exclusive lock, and each concurrency slot is a
+    lock file, so the slots held by a process are released even if it crashes.
+
+    Args:
+        path (pathlib.Path): The path of the shared state file. The slot lock files are
+          created next to it.
+        rate (Optional[float]): The maximum number of requests per second for all
+          processes combined.
+        burst (Optional[int]): The number of requests that may be sent at once after an
+          idle period.
+        max_concurrency (Optional[int]): The maximum number of requests in flight for all
+          processes combined.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_THROTTLE_PATH,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if fcntl is None:
+            raise PinataException("Sharing a throttle between processes requires 'fcntl'.")
+
+        super().__init__(rate=rate, burst=burst, max_concurrency=max_concurrency)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o600)
+        self._slot_paths: List[Path] = [
+            path.with_name(f"{path.name}.slot{i}") for i in range(max_concurrency or 0)
+        ]
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    @contextmanager
+    def _concurrency_slot(self) -> Iterator[None]:
+        # Limit the threads of this process first so that they don't all poll the files.
+        with super()._concurrency_slot():
+            if not self._slot_paths:
+                yield
+                return
+
+            fd = self._lock_slot()
+            try:
+                yield
+            finally:
+                os.close(fd)
+
+    def _lock_slot(self) -> int:
+        interval = _SLOT_POLL_INTERVAL
+        while True:
+            for slot_path in self._slot_paths:
+                fd = os.open(str(slot_path), os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    continue
+
+                return fd
+
+            time.sleep(interval)
+            interval = min(interval * 2, _MAX_SLOT_POLL_INTERVAL)
+
+    @contextmanager
+    def _state_lock(self) -> Iterator[None]:
+        # 'flock()' locks are held per open file, so threads sharing the file need a lock too.
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Tuple[float, float, float]:
+        data = os.pread(self._fd, _STATE.size, 0)
+        if len(data) < _STATE.size:
+            return float(self.burst), time.time(), 0.0
+
+        return _STATE.unpack(data)
+
+    def _write_state(self, state: Tuple[float, float, float]):
+        os.pwrite(self._fd, _STATE.pack(*state), 0)
+
+
+__all__ = ["ProcessThrottle", "Throttle"]
@@ -1,18 +1,29 @@
-import json
-from datetime import datetime
+import os
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import IO, Dict, Union
+from typing import IO, Dict, Iterator, Optional, Union
+
+from pinata import codec
+
+_PRETTY_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 def format_dict(dict_, label=None):
-    indented_dict = json.dumps(dict_, indent=4)
+    indented_dict = codec.dumps(dict_, indent=True).decode()
     res = f"{label} {indented_dict}" if label else indented_dict
     return res
 
 
 def prettify_date(date_str: str):
     date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%fZ")
-    return date.strftime("%Y-%m-%d %H:%M:%S")
+    return date.strftime(_PRETTY_DATE_FORMAT)
+
+
+def prettify_timestamp(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return ""
+
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(_PRETTY_DATE_FORMAT)
 
 
 def json_to_dict(json_arg: Union[Path, IO, Dict]):
@@ -21,18 +32,29 @@ def json_to_dict(json_arg: Union[Path, IO, Dict]):
 
     def _get_json_from_file(file: IO) -> Dict:
         try:
-            return json.load(file)
-        except json.JSONDecodeError as err:
+            return codec.loads(file.read())
+        except ValueError as err:
             raise ValueError(f"File at path '{json_arg}' is not JSON.") from err
 
     if isinstance(json_arg, Path):
         if not json_arg.exists():
             raise ValueError(f"File '{json_arg}' does not exist.")
 
-        with open(str(json_arg)) as json_file:
+        with open(str(json_arg), "rb") as json_file:
             return _get_json_from_file(json_file)
 
     elif not isinstance(json_arg, dict):
         return _get_json_from_file(json_arg)
 
     return json_arg
+
+
+def iter_files(directory: Path, recursive: bool = False) -> Iterator[Path]:
+    if not recursive:
+        yield from sorted(p for p in directory.iterdir() if p.is_file())
+        return
+
+    for root, dir_names, file_names in os.walk(directory):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            yield Path(root) / file_name
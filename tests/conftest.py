@@ -1,10 +1,15 @@
 import pytest
 from click.testing import CliRunner
 
+from pinata.agent import DISABLE_ENV_VAR
 from pinata.api_key import KeyringManager
 from pinata.cli import cli
 from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.retry import RetryPolicy
 from pinata.sdk import Pinata
+from pinata.session import PinataAPISession
+from pinata.testing import FakePinataServer
 
 MOCK_FILE_NAME_1 = "MOCK_FILE_1.jpeg"
 MOCK_FILE_NAME_2 = "MOCK_FILE_2.jpeg"
@@ -18,6 +23,9 @@ MOCK_PIN_DATE_2 = "2020-01-05T04:24:21.234Z"
 MOCK_API_KEY = "MOCK_API_KEY"
 MOCK_API_SECRET = "MOCK_API_SECRET"
 
+NO_RETRIES = RetryPolicy(max_retries=0)
+FAST_RETRIES = RetryPolicy(max_retries=2, backoff_factor=0.001, jitter=False)
+
 
 @pytest.fixture
 def runner():
@@ -29,6 +37,12 @@ def root_cli():
     return cli
 
 
+@pytest.fixture(autouse=True)
+def no_agent(monkeypatch):
+    # Don't forward commands to an agent the developer may have running.
+    monkeypatch.setenv(DISABLE_ENV_VAR, "1")
+
+
 @pytest.fixture(autouse=True)
 def mock_keys(mocker):
     mock = mocker.MagicMock(spec=KeyringManager)
@@ -47,7 +61,7 @@ def mock_data_client(mocker):
 def mock_pinata(mocker, mock_data_client):
     mock = mocker.MagicMock(spec=Pinata)
     mock.data = mock_data_client
-    patch = mocker.patch("pinata.cli.Pinata.from_api_key")
+    patch = mocker.patch("pinata.sdk.Pinata.from_api_key")
     patch.return_value = mock
     return mock
 
@@ -68,3 +82,27 @@ def pins_data():
             },
         ]
     }
+
+
+@pytest.fixture
+def fake_server(request):
+    # Parametrize indirectly with FakePinataServer arguments, e.g. {"hash_pin_delay": 0.1}.
+    with FakePinataServer(**{"seed": 0, **getattr(request, "param", {})}) as server:
+        yield server
+
+
+@pytest.fixture
+def make_session(fake_server):
+    def factory(api_key: str = "key", api_secret: str = "secret", **kwargs) -> PinataAPISession:
+        kwargs.setdefault("retry_policy", NO_RETRIES)
+        return PinataAPISession.from_api_key(
+            api_key, api_secret, host_address=fake_server.url, **kwargs
+        )
+
+    return factory
+
+
+@pytest.fixture
+def fake_sdk(make_session):
+    session = make_session()
+    return Pinata(PinningClient(session), DataClient(session))
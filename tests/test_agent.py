@@ -0,0 +1,188 @@
+import stat
+import time
+
+import pytest
+
+from pinata.agent import DISABLE_ENV_VAR, SOCKET_ENV_VAR, AgentClient, PinataAgent
+from pinata.api_key import FileBackend, KeyringManager
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.exceptions import AgentError, NoContentError
+from pinata.sdk import Pinata
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = tmp_path / "agent.sock"
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(path))
+    monkeypatch.delenv(DISABLE_ENV_VAR)
+    return path
+
+
+@pytest.fixture
+def file_keys(tmp_path, monkeypatch, mocker, make_session):
+    # Keys in a credentials file, read through the real key manager and
+    # Pinata.from_profile_name, with SDKs that talk to the fake server.
+    path = tmp_path / "credentials"
+    KeyringManager(FileBackend(path)).set_key_pair("work", "key", "secret")
+    monkeypatch.setattr("pinata.api_key._key_manager", KeyringManager(FileBackend(path)))
+
+    def from_api_key(api_key, api_secret, **kwargs):
+        session = make_session(api_key=api_key, api_secret=api_secret)
+        return Pinata(PinningClient(session), DataClient(session))
+
+    mocker.patch("pinata.sdk.Pinata.from_api_key", side_effect=from_api_key)
+    return path
+
+
+@pytest.fixture
+def agent_sdk(mocker):
+    sdk = mocker.MagicMock(spec=Pinata)
+    sdk.pin_file.return_value = "QmPinned"
+    return sdk
+
+
+@pytest.fixture
+def agent(socket_path, agent_sdk, mocker):
+    factory = mocker.Mock(return_value=agent_sdk)
+    with PinataAgent(socket_path, sdk_factory=factory) as running_agent:
+        yield running_agent
+
+
+def test_agent_runs_commands(agent, agent_sdk, tmp_path):
+    client = AgentClient.connect()
+
+    assert client.call("pin", "work", file_path=str(tmp_path), recursive=True) == "QmPinned"
+    client.call("unpin", "work", content_hash="QmPinned")
+
+    agent_sdk.pin_file.assert_called_once_with(tmp_path, recursive=True, skip_existing=False)
+    agent_sdk.unpin.assert_called_once_with("QmPinned")
+    assert client.call("ping")["profiles"] == ["work"]
+
+
+def test_agent_reuses_sdk_per_profile(agent, socket_path):
+    client = AgentClient(socket_path)
+    for _ in range(3):
+        client.call("unpin", "work", content_hash="QmPinned")
+
+    client.call("unpin", "other", content_hash="QmPinned")
+    assert agent._sdk_factory.call_count == 2
+
+
+def test_agent_returns_errors(agent, agent_sdk, socket_path):
+    agent_sdk.unpin.side_effect = NoContentError("QmMissing")
+    client = AgentClient(socket_path)
+
+    with pytest.raises(AgentError, match="No pinned content found with hash 'QmMissing'"):
+        client.call("unpin", "work", content_hash="QmMissing")
+
+    with pytest.raises(AgentError, match="Unknown command"):
+        client.call("format", "work")
+
+
+def test_agent_socket_is_private(agent, socket_path):
+    assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+
+def test_agent_replaces_stale_socket(socket_path):
+    socket_path.write_text("")
+    with PinataAgent(socket_path):
+        assert AgentClient(socket_path).is_running()
+
+    assert not socket_path.exists()
+
+
+def test_agent_when_already_running(agent, socket_path):
+    with pytest.raises(AgentError):
+        PinataAgent(socket_path).start()
+
+
+def test_agent_shutdown(agent, socket_path):
+    AgentClient(socket_path).call("shutdown")
+    agent._thread.join(timeout=5)
+
+    assert not socket_path.exists()
+    assert AgentClient.connect() is None
+
+
+def test_agent_stops_when_idle(socket_path):
+    agent = PinataAgent(socket_path, idle_timeout=0.1)
+    agent.start()
+    agent._thread.join(timeout=5)
+
+    assert not agent._thread.is_alive()
+    assert not socket_path.exists()
+
+
+def test_agent_does_not_stop_during_commands(socket_path, agent_sdk):
+    agent_sdk.unpin.side_effect = lambda cid: time.sleep(0.5)
+    agent = PinataAgent(socket_path, idle_timeout=0.2, sdk_factory=lambda p: agent_sdk)
+    agent.start()
+    AgentClient(socket_path).call("unpin", "work", content_hash="QmPinned")
+
+    # The idle time counts from when the command finished.
+    assert agent._thread.is_alive()
+    agent._thread.join(timeout=5)
+    assert not agent._thread.is_alive()
+
+
+def test_agent_reloads_rejected_keys(file_keys, fake_server, socket_path):
+    for cid in ("QmOne", "QmTwo"):
+        fake_server.add_pin(cid)
+
+    fake_server.api_secret = "rotated"
+    with PinataAgent(socket_path):
+        client = AgentClient(socket_path)
+        # The keys on disk are rejected too, so the command isn't run again.
+        with pytest.raises(AgentError, match="401"):
+            client.call("unpin", "work", content_hash="QmOne")
+
+        assert fake_server.stats["unpin"] == 1
+        # Another process stores the new keys.
+        KeyringManager(FileBackend(file_keys)).set_key_pair("work", "key", "rotated")
+        client.call("unpin", "work", content_hash="QmTwo")
+
+    assert fake_server.stats["unpin"] == 3
+    assert fake_server.get_pin("QmTwo")["date_unpinned"]
+
+
+def test_cli_key_changes_reach_agent(runner, root_cli, file_keys, fake_server, socket_path, mocker):
+    for cid in ("QmOne", "QmTwo"):
+        fake_server.add_pin(cid)
+
+    # The CLI runs in its own process, with its own key manager.
+    mocker.patch("pinata.cli.get_key_manager", return_value=KeyringManager(FileBackend(file_keys)))
+    with PinataAgent(socket_path):
+        client = AgentClient(socket_path)
+        client.call("unpin", "work", content_hash="QmOne")
+        fake_server.api_secret = "rotated"
+
+        args = ["api-key", "import", "work", "--api-key", "key", "--api-secret", "rotated"]
+        result = runner.invoke(root_cli, args)
+        client.call("unpin", "work", content_hash="QmTwo")
+
+    assert result.exit_code == 0, result.output
+    # The agent used the new keys right away, without being rejected first.
+    assert fake_server.stats["unpin"] == 2
+
+
+def test_cli_forwards_to_agent(
+    runner, root_cli, agent, agent_sdk, mock_keys, mock_pinata, tmp_path
+):
+    file_path = tmp_path / "file.txt"
+    file_path.write_text("content")
+
+    result = runner.invoke(root_cli, ["pin", str(file_path), "--profile", "work"])
+
+    assert result.exit_code == 0, result.output
+    assert "CID=QmPinned" in result.output
+    assert not mock_keys.get_key_pair.called
+    assert not mock_pinata.pin_file.called
+    agent_sdk.pin_file.assert_called_once_with(file_path, recursive=False, skip_existing=False)
+
+
+def test_cli_without_agent(runner, root_cli, socket_path, mock_pinata):
+    result = runner.invoke(root_cli, ["unpin", "QmPinned"])
+
+    assert result.exit_code == 0, result.output
+    mock_pinata.unpin.assert_called_once_with("QmPinned")
@@ -0,0 +1,150 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+import pytest
+
+from pinata.api_key import (
+    EnvironmentBackend,
+    FileBackend,
+    KeyBackend,
+    KeyringManager,
+    get_key_backend,
+)
+from pinata.exceptions import (
+    InsecureCredentialsFileError,
+    PinataException,
+    PinataMissingAPIKeyError,
+)
+
+
+class MemoryBackend(KeyBackend):
+    def __init__(self, passwords: Optional[Dict[str, str]] = None):
+        self.passwords = dict(passwords or {})
+        self.reads: List[str] = []
+        self.writes: List[str] = []
+
+    def get_password(self, username):
+        self.reads.append(username)
+        return self.passwords.get(username)
+
+    def set_password(self, username, password):
+        self.writes.append(username)
+        self.passwords[username] = password
+
+    def delete_password(self, username):
+        self.writes.append(username)
+        del self.passwords[username]
+
+
+@pytest.fixture
+def backend():
+    return MemoryBackend(
+        {
+            "pinata-mgmt": json.dumps({"profiles": ["main", "other"], "default": "main"}),
+            "main-api-key": "key",
+            "main-api-secret": "secret",
+        }
+    )
+
+
+def test_reads_are_cached(backend):
+    manager = KeyringManager(backend)
+    for _ in range(3):
+        assert manager.default_profile_name == "main"
+        assert manager.profile_names == ["main", "other"]
+        assert manager.get_key_pair("main") == ("key", "secret")
+
+    assert sorted(backend.reads) == ["main-api-key", "main-api-secret", "pinata-mgmt"]
+    assert not backend.writes
+
+
+def test_reads_do_not_write():
+    backend = MemoryBackend({"main-api-key": "key", "main-api-secret": "secret"})
+    manager = KeyringManager(backend)
+
+    assert manager.profile_names == []
+    assert manager.get_key_pair("main") == ("key", "secret")
+    with pytest.raises(PinataMissingAPIKeyError):
+        manager.get_key_pair("missing")
+
+    assert not backend.writes
+
+
+def test_invalidate(backend):
+    manager = KeyringManager(backend)
+    assert manager.get_key_pair("main") == ("key", "secret")
+    backend.passwords["main-api-key"] = "new key"
+    assert manager.get_key_pair("main") == ("key", "secret")
+
+    manager.invalidate()
+    assert manager.get_key_pair("main") == ("new key", "secret")
+
+
+def test_changes_update_cache(backend):
+    manager = KeyringManager(backend)
+    manager.set_key_pair("new", "new key", "new secret")
+    manager.rename_key_pair("main", "renamed")
+    backend.reads.clear()
+
+    assert manager.profile_names == ["other", "new", "renamed"]
+    assert manager.default_profile_name == "renamed"
+    assert manager.get_key_pair("new") == ("new key", "new secret")
+    assert not backend.reads
+    assert json.loads(backend.passwords["pinata-mgmt"])["default"] == "renamed"
+
+
+def test_key_backend_must_be_complete():
+    class ReadOnlyBackend(KeyBackend):
+        def get_password(self, username):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyBackend()
+
+
+def test_environment_backend(monkeypatch):
+    monkeypatch.setenv("PINATA_API_KEY", "key")
+    monkeypatch.setenv("PINATA_API_SECRET", "secret")
+    monkeypatch.setenv("PINATA_CI_BOT_API_KEY", "bot key")
+    monkeypatch.setenv("PINATA_CI_BOT_API_SECRET", "bot secret")
+    manager = KeyringManager(EnvironmentBackend())
+
+    assert manager.profile_names == ["default", "ci-bot"]
+    assert manager.default_profile_name == "default"
+    assert manager.get_key_pair("default") == ("key", "secret")
+    assert manager.get_key_pair("ci-bot") == ("bot key", "bot secret")
+    with pytest.raises(PinataException):
+        manager.set_key_pair("default", "key", "secret")
+
+
+def test_file_backend(tmp_path):
+    path = tmp_path / "pinata" / "credentials"
+    KeyringManager(FileBackend(path)).set_key_pair("main", "key", "secret")
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    manager = KeyringManager(FileBackend(path))
+    assert manager.profile_names == ["main"]
+    assert manager.get_key_pair("main") == ("key", "secret")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file permissions")
+def test_file_backend_rejects_readable_file(tmp_path):
+    path = tmp_path / "credentials"
+    path.write_text("{}")
+    path.chmod(0o644)
+
+    with pytest.raises(InsecureCredentialsFileError):
+        FileBackend(path).get_password("main-api-key")
+
+
+def test_get_key_backend(monkeypatch, tmp_path):
+    monkeypatch.setenv("PINATA_KEY_BACKEND", "file")
+    monkeypatch.setenv("PINATA_CREDENTIALS_FILE", str(tmp_path / "credentials"))
+    backend = get_key_backend()
+    assert isinstance(backend, FileBackend)
+    assert backend.path == tmp_path / "credentials"
+
+    monkeypatch.setenv("PINATA_KEY_BACKEND", "unknown")
+    with pytest.raises(PinataException):
+        get_key_backend()
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from pinata.bulk import ProgressTracker, run_bounded
+from pinata.exceptions import PinataInternalServiceError
+
+
+def test_run_bounded_collects_results_and_errors():
+    def func(item):
+        if item % 3 == 0:
+            raise ValueError(item)
+
+        return item * 2
+
+    outcomes = {item: (result, error) for item, result, error in run_bounded(func, range(30), 4)}
+
+    assert len(outcomes) == 30
+    assert outcomes[1] == (2, None)
+    assert isinstance(outcomes[3][1], ValueError)
+
+
+def test_run_bounded_limits_items_in_flight():
+    max_workers = 2
+    pulled = []
+    done = []
+    lock = threading.Lock()
+    in_flight = []
+
+    def items():
+        for item in range(50):
+            pulled.append(item)
+            yield item
+
+    def func(item):
+        with lock:
+            in_flight.append(len(pulled) - len(done))
+
+    for item, _, _ in run_bounded(func, items(), max_workers):
+        done.append(item)
+
+    assert max(in_flight) <= 2 * max_workers
+
+
+@pytest.mark.parametrize("total", (None, 10))
+def test_progress_tracker(total):
+    reports = []
+    tracker = ProgressTracker(total=total, callback=reports.append)
+    tracker.update(bytes_sent=100)
+    tracker.update(failed=True)
+
+    assert reports[-1].completed == 2
+    assert reports[-1].failed == 1
+    assert reports[-1].bytes_sent == 100
+    assert reports[-1].total == total
+
+
+def test_unpin_many(fake_sdk, fake_server):
+    for cid in ("QmA", "QmB", "QmGone"):
+        fake_server.add_pin(cid)
+
+    fake_sdk.unpin("QmGone")
+    progress = []
+
+    report = fake_sdk.unpin_many(
+        iter(["QmA", "QmB", "QmA", "QmGone", "QmNever", "QmB"]), progress=progress.append
+    )
+
+    assert sorted(report.unpinned) == ["QmA", "QmB"]
+    assert sorted(report.already_unpinned) == ["QmGone", "QmNever"]
+    assert report.duplicates == 2
+    assert report.success
+    assert progress[-1].completed == 4
+    assert fake_server.stats["unpin"] == 5
+
+
+def test_unpin_many_collects_failures(fake_sdk, fake_server):
+    for cid in ("QmA", "QmB", "QmC"):
+        fake_server.add_pin(cid)
+
+    fake_server.fail_next(count=1, status=500)
+    report = fake_sdk.unpin_many(["QmA", "QmB", "QmC"], max_workers=1)
+
+    assert list(report.failed) == ["QmA"]
+    assert isinstance(report.failed["QmA"], PinataInternalServiceError)
+    assert report.unpinned == ["QmB", "QmC"]
+    assert not report.success
+    assert fake_server.get_pin("QmA")["date_unpinned"] is None
@@ -0,0 +1,43 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pinata.cid import compute_cid
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.mark.parametrize(
+    "content,version,expected",
+    [
+        (b"", 0, "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"),
+        (b"hello world\n", 0, "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"),
+        (b"", 1, "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"),
+    ],
+)
+def test_compute_cid_when_file(temp_dir, content, version, expected):
+    path = temp_dir / "test_file"
+    path.write_bytes(content)
+    assert compute_cid(path, version=version) == expected
+
+
+def test_compute_cid_when_empty_directory(temp_dir):
+    assert compute_cid(temp_dir) == "QmUNLLsPACCz1vLxQVkXqqLX5R1X345qqfHbsf67hvA3Nn"
+
+
+def test_compute_cid_when_chunked(temp_dir):
+    path = temp_dir / "test_file"
+    path.write_bytes(b"0123456789" * 1000)
+    chunked = compute_cid(path, chunk_size=10)
+    assert chunked.startswith("Qm")
+    assert chunked != compute_cid(path)
+
+
+def test_compute_cid_when_missing(temp_dir):
+    with pytest.raises(ValueError):
+        compute_cid(temp_dir / "missing")
@@ -1,3 +1,10 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pinata.cli as cli_module
+from pinata.bulk import UnpinReport
 from pinata.utils import prettify_date
 
 from .conftest import (
@@ -11,7 +18,7 @@ from .conftest import (
 
 
 def test_list_pins(runner, root_cli, mock_data_client, pins_data):
-    mock_data_client.search_pins.return_value = pins_data
+    mock_data_client.iter_pins.return_value = iter(pins_data["rows"])
 
     result = runner.invoke(root_cli, ["list-pins"])
 
@@ -27,3 +34,62 @@ def test_list_pins(runner, root_cli, mock_data_client, pins_data):
     assert MOCK_PIN_HASH_2 in result.output
     assert expected_date_1 in result.output
     assert expected_date_2 in result.output
+
+
+def test_cid(runner, root_cli, mock_keys):
+    with runner.isolated_filesystem():
+        Path("hello.txt").write_bytes(b"hello world\n")
+        result = runner.invoke(root_cli, ["cid", "hello.txt"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+    assert not mock_keys.get_key_pair.called
+
+
+def test_unpin_from_file(runner, root_cli, mock_pinata):
+    mock_pinata.unpin_many.return_value = UnpinReport()
+
+    result = runner.invoke(root_cli, ["unpin", "--from-file", "-"], input="hash1\n\nhash2\n")
+
+    assert result.exit_code == 0, result.output
+    hashes = mock_pinata.unpin_many.call_args[0][0]
+    assert list(hashes) == ["hash1", "hash2"]
+
+
+def test_unpin_requires_hash_or_file(runner, root_cli):
+    result = runner.invoke(root_cli, ["unpin"])
+    assert result.exit_code != 0
+
+
+def test_help_does_not_read_keys(runner, root_cli):
+    for args in (["--help"], ["list-pins", "--help"], ["pin", "--help"]):
+        result = runner.invoke(root_cli, args)
+        assert result.exit_code == 0, result.output
+
+    assert not cli_module.get_key_manager.called
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, pinata.cli; "
+        "print(' '.join(m for m in ('requests', 'keyring', 'numpy', 'project_nft', "
+        "'pinata.sdk') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split() == []
+
+
+def test_sdk_import_is_lazy():
+    code = (
+        "import sys, pinata.sdk; "
+        "print(' '.join(m for m in ('numpy', 'pinata.records', 'pinata.gateway', "
+        "'pinata.index', 'pinata.jobs', 'pinata.sync') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split() == []
@@ -0,0 +1,132 @@
+import gc
+
+import pytest
+from requests import Response
+
+from pinata import codec
+from pinata.exceptions import PinataException
+from pinata.response import PinataResponse
+from pinata.session import PinataAPISession
+
+DOCUMENT = {"name": "café", "rows": [{"size": 12, "ok": True, "date_unpinned": None}]}
+
+
+def _codecs():
+    codecs = [codec.StdlibCodec()]
+    try:
+        codecs.append(codec.OrjsonCodec())
+    except ImportError:
+        pass
+
+    return codecs
+
+
+@pytest.fixture(autouse=True)
+def reset_codec():
+    yield
+    codec.set_codec(None)
+    codec.set_gc_pause(None)
+
+
+@pytest.mark.parametrize("json_codec", _codecs(), ids=lambda c: c.name)
+def test_codec_round_trip(json_codec):
+    encoded = json_codec.dumps(DOCUMENT)
+
+    assert isinstance(encoded, bytes)
+    assert b", " not in encoded
+    assert json_codec.loads(encoded) == DOCUMENT
+    assert json_codec.loads(encoded.decode()) == DOCUMENT
+    assert json_codec.loads(memoryview(encoded)) == DOCUMENT
+
+
+@pytest.mark.parametrize("json_codec", _codecs(), ids=lambda c: c.name)
+def test_codec_indent(json_codec):
+    assert json_codec.dumps({"a": [1]}, indent=True) == b'{\n  "a": [\n    1\n  ]\n}'
+
+
+@pytest.mark.parametrize("json_codec", _codecs(), ids=lambda c: c.name)
+def test_codec_loads_when_invalid(json_codec):
+    with pytest.raises(ValueError):
+        json_codec.loads(b"{")
+
+
+def test_orjson_codec_falls_back_to_stdlib():
+    pytest.importorskip("orjson")
+    orjson_codec = codec.OrjsonCodec()
+    encoded = orjson_codec.dumps({1: 2**70 + 1})
+    assert codec.StdlibCodec().loads(encoded) == {"1": 2**70 + 1}
+
+
+def test_set_codec():
+    codec.set_codec("json")
+    assert isinstance(codec.get_codec(), codec.StdlibCodec)
+
+    custom = codec.StdlibCodec()
+    codec.set_codec(custom)
+    assert codec.get_codec() is custom
+
+
+def test_set_codec_when_unknown():
+    with pytest.raises(PinataException):
+        codec.set_codec("yaml")
+
+
+def test_codec_must_implement_loads():
+    class EncodeOnlyCodec(codec.JSONCodec):
+        def dumps(self, obj, indent=False):
+            return b""
+
+    with pytest.raises(TypeError):
+        EncodeOnlyCodec()
+
+
+def test_get_codec_from_environment(monkeypatch):
+    monkeypatch.setenv(codec.CODEC_ENV_VAR, "json")
+    codec.set_codec(None)
+    assert codec.get_codec().name == "json"
+
+
+def test_get_codec_defaults_to_stdlib(monkeypatch):
+    # orjson decodes integers over 64 bits as floats, so it is never picked on its own.
+    monkeypatch.delenv(codec.CODEC_ENV_VAR, raising=False)
+    codec.set_codec(None)
+    assert codec.loads(b"[123456789012345678901234567890]") == [123456789012345678901234567890]
+    assert isinstance(codec.get_codec(), codec.StdlibCodec)
+
+
+def test_loads_pauses_gc_for_large_documents():
+    class RecordingCodec(codec.StdlibCodec):
+        gc_enabled = []
+
+        def loads(self, data):
+            self.gc_enabled.append(gc.isenabled())
+            return super().loads(data)
+
+    codec.set_codec(RecordingCodec())
+    large = b"[" + b"1," * 10 + b"1]"
+    codec.loads(large)
+    codec.set_gc_pause(10)
+    codec.loads(b"[1]")
+    codec.loads(large)
+
+    # The collector is only paused once enabled.
+    assert RecordingCodec.gc_enabled == [True, True, False]
+    assert gc.isenabled()
+
+
+def test_response_data_uses_codec(mocker):
+    codec.set_codec("json")
+    loads = mocker.spy(codec.get_codec(), "loads")
+    response = Response()
+    response._content = codec.dumps(DOCUMENT)
+
+    assert PinataResponse(response).data == DOCUMENT
+    loads.assert_called_once_with(response._content)
+
+
+def test_session_encodes_json_body_with_codec():
+    session = PinataAPISession.from_api_key("key", "secret")
+    request = session._prepare_request("POST", "pinning/pinJSONToIPFS", json=DOCUMENT)
+
+    assert request.body == codec.dumps(DOCUMENT)
+    assert request.headers["Content-Type"] == "application/json"
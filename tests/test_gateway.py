@@ -0,0 +1,183 @@
+import os
+
+import pytest
+from requests.exceptions import ChunkedEncodingError
+
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.exceptions import GatewayError
+from pinata.gateway import ContentCache, GatewayClient
+from pinata.response import PinataResponse
+from pinata.sdk import Pinata
+
+from .conftest import FAST_RETRIES
+
+CONTENT = os.urandom(100000)
+PART_SIZE = 16384
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ContentCache(tmp_path / "cache", max_size=10**6)
+
+
+@pytest.fixture
+def gateway(fake_server, cache):
+    return GatewayClient(
+        fake_server.url, cache=cache, part_size=PART_SIZE, retry_policy=FAST_RETRIES
+    )
+
+
+def test_download_in_parts(gateway, fake_server, tmp_path):
+    cid = fake_server.add_content(CONTENT)
+
+    dest = gateway.download(cid, tmp_path / "out" / "content.bin")
+
+    assert dest.read_bytes() == CONTENT
+    assert fake_server.stats["ipfs"] == 7
+    assert cid in gateway.cache
+
+
+def test_download_from_cache(gateway, fake_server, tmp_path):
+    cid = fake_server.add_content(b"cached")
+    gateway.download(cid, tmp_path / "first")
+
+    dest = gateway.download(cid, tmp_path / "second")
+
+    assert dest.read_bytes() == b"cached"
+    assert fake_server.stats["ipfs"] == 1
+
+
+def test_download_when_evicted_right_away(gateway, fake_server, tmp_path, mocker):
+    cid = fake_server.add_content(b"evicted")
+    add = gateway.cache.add
+
+    def add_then_evict(cid, path):
+        # Another process sharing the cache evicts the new entry at once.
+        cached = add(cid, path)
+        cached.unlink()
+        return cached
+
+    mocker.patch.object(gateway.cache, "add", side_effect=add_then_evict)
+
+    assert gateway.download(cid, tmp_path / "content").read_bytes() == b"evicted"
+
+
+def test_download_without_cache(gateway, fake_server, tmp_path):
+    cid = fake_server.add_content(b"uncached")
+    for name in ("first", "second"):
+        assert gateway.download(cid, tmp_path / name, use_cache=False).read_bytes() == b"uncached"
+
+    assert fake_server.stats["ipfs"] == 2
+    assert len(gateway.cache) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache", "first", "second"]
+
+
+def test_download_empty_content(gateway, fake_server, tmp_path):
+    cid = fake_server.add_content(b"")
+
+    assert gateway.download(cid, tmp_path / "empty").read_bytes() == b""
+
+
+def test_download_resumes_broken_parts(gateway, fake_server, tmp_path, mocker):
+    mocker.patch("pinata.gateway._READ_SIZE", 1000)
+    gateway.max_workers = 1
+    iter_content = PinataResponse.iter_content
+    calls = []
+
+    def break_second_part(response, chunk_size):
+        calls.append(chunk_size)
+        for number, chunk in enumerate(iter_content(response, chunk_size)):
+            if len(calls) == 2 and number == 3:
+                raise ChunkedEncodingError("Connection broken.")
+
+            yield chunk
+
+    mocker.patch.object(PinataResponse, "iter_content", break_second_part)
+    cid = fake_server.add_content(CONTENT)
+
+    assert gateway.download(cid, tmp_path / "content.bin").read_bytes() == CONTENT
+    assert fake_server.stats["ipfs"] == 8
+
+
+def test_download_gives_up(gateway, fake_server, tmp_path, mocker):
+    def always_break(response, chunk_size):
+        raise ChunkedEncodingError("Connection broken.")
+        yield
+
+    mocker.patch.object(PinataResponse, "iter_content", always_break)
+    cid = fake_server.add_content(CONTENT)
+
+    with pytest.raises(GatewayError, match="stopped at byte 0"):
+        gateway.download(cid, tmp_path / "content.bin")
+
+    assert not (tmp_path / "content.bin").exists()
+    assert not list(gateway.cache.directory.iterdir())
+
+
+def test_download_invalid_cid(gateway, tmp_path):
+    with pytest.raises(ValueError):
+        gateway.download("Qm/../../etc", tmp_path / "out")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(tmp_path / "cache", max_size=250)
+    for cid in ("QmA", "QmB"):
+        (tmp_path / cid).write_bytes(b"x" * 100)
+        cache.add(cid, tmp_path / cid)
+
+    assert cache.get("QmA")
+    (tmp_path / "QmC").write_bytes(b"x" * 100)
+    cache.add("QmC", tmp_path / "QmC")
+
+    assert "QmB" not in cache
+    assert cache.get("QmB") is None
+    assert cache.size == 200
+    assert sorted(p.name for p in cache.directory.iterdir()) == ["QmA", "QmC"]
+    (tmp_path / "QmLarge").write_bytes(b"x" * 300)
+    assert cache.add("QmLarge", tmp_path / "QmLarge") is None
+    assert len(ContentCache(tmp_path / "cache", max_size=250)) == 2
+
+
+def test_cache_is_bounded_across_instances(tmp_path, mocker):
+    mocker.patch("pinata.gateway._RESCAN_INTERVAL", -1)
+    caches = [ContentCache(tmp_path / "cache", max_size=250) for _ in range(2)]
+    for cid, cache in zip(("QmA", "QmB", "QmC"), caches + caches):
+        (tmp_path / cid).write_bytes(b"x" * 100)
+        cache.add(cid, tmp_path / cid)
+
+    # Each instance only added 200 bytes, but together they went over the bound.
+    assert sorted(p.name for p in caches[0].directory.iterdir()) == ["QmB", "QmC"]
+    assert caches[0].size == 200
+
+
+def test_cache_only_rescans_over_its_bound(tmp_path, mocker):
+    cache = ContentCache(tmp_path / "cache", max_size=250)
+    load = mocker.spy(cache, "_load")
+    for cid in ("QmA", "QmB", "QmC"):
+        (tmp_path / cid).write_bytes(b"x" * 100)
+        cache.add(cid, tmp_path / cid)
+
+    assert load.call_count == 1
+    assert list(cache._entries) == ["QmB", "QmC"]
+    assert cache.size == 200
+
+
+def test_get_content(gateway, fake_server, make_session, tmp_path):
+    session = make_session()
+    sdk = Pinata(PinningClient(session), DataClient(session), gateway=gateway)
+    cid = fake_server.add_content(b"content")
+
+    assert sdk.get_content(cid, tmp_path / "content").read_bytes() == b"content"
+
+
+def test_get_cli(runner, root_cli, fake_server, tmp_path):
+    cid = fake_server.add_content(b"content")
+    dest = tmp_path / "content"
+
+    result = runner.invoke(
+        root_cli, ["get", cid, str(dest), "--gateway", fake_server.url, "--no-cache"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert dest.read_bytes() == b"content"
@@ -0,0 +1,72 @@
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from pinata.index import PinIndex
+
+from .conftest import MOCK_FILE_NAME_1, MOCK_PIN_DATE_1, MOCK_PIN_HASH_1, MOCK_PIN_HASH_2
+
+
+@pytest.fixture
+def index():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = PinIndex(Path(temp_dir) / "pins.sqlite")
+        yield index
+        index.close()
+
+
+def test_sync(index, mock_data_client, pins_data):
+    mock_data_client.iter_pins.side_effect = lambda **kwargs: iter(pins_data["rows"])
+
+    assert index.is_stale
+    assert index.sync(mock_data_client) == 2
+    assert not index.is_stale
+    assert index.get_hash(MOCK_FILE_NAME_1) == MOCK_PIN_HASH_1
+    assert index.get_metadata(MOCK_PIN_HASH_2)["ipfs_pin_hash"] == MOCK_PIN_HASH_2
+    assert len(index.search(pin_start=MOCK_PIN_DATE_1)) == 1
+
+
+def test_sync_is_incremental(index, mock_data_client, pins_data):
+    mock_data_client.iter_pins.side_effect = lambda **kwargs: iter(pins_data["rows"])
+    index.sync(mock_data_client)
+    mock_data_client.iter_pins.reset_mock()
+
+    index.sync(mock_data_client)
+
+    first_call = mock_data_client.iter_pins.call_args_list[0]
+    assert first_call.kwargs["pin_start"] == MOCK_PIN_DATE_1
+
+
+def test_sync_does_not_lock_while_fetching(index, mock_data_client, pins_data):
+    def rows(**kwargs):
+        yield pins_data["rows"][0]
+        # Lookups from other threads go on while the next page is fetched.
+        lookup = threading.Thread(target=index.get_hash, args=(MOCK_FILE_NAME_1,))
+        lookup.start()
+        lookup.join(timeout=5)
+        assert not lookup.is_alive()
+        yield pins_data["rows"][1]
+
+    mock_data_client.iter_pins.side_effect = rows
+
+    assert index.sync(mock_data_client) == 2
+
+
+def test_sync_failure_keeps_watermarks(index, mock_data_client, pins_data, mocker):
+    mocker.patch("pinata.index._SYNC_BATCH_SIZE", 1)
+
+    def rows(**kwargs):
+        yield from pins_data["rows"]
+        raise ConnectionError()
+
+    mock_data_client.iter_pins.side_effect = rows
+
+    with pytest.raises(ConnectionError):
+        index.sync(mock_data_client)
+
+    # The written pins are kept, but the next sync fetches them again.
+    assert index.get_hash(MOCK_FILE_NAME_1) == MOCK_PIN_HASH_1
+    assert index.last_sync is None
+    assert index._get_state("pin_watermark") is None
@@ -0,0 +1,151 @@
+import concurrent.futures
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from pinata.exceptions import PinataBadRequestError, PinJobError
+from pinata.jobs import PinJobTracker
+
+HASHES = [f"QmHash{i:02d}" for i in range(20)]
+
+pytestmark = pytest.mark.parametrize("fake_server", [{"hash_pin_delay": 0.1}], indirect=True)
+
+
+@pytest.fixture
+def pinning(fake_sdk):
+    return fake_sdk.pinning
+
+
+@pytest.fixture
+def tracker(pinning):
+    with PinJobTracker(pinning, min_interval=0.01, max_interval=0.05) as job_tracker:
+        yield job_tracker
+
+
+def test_tracker_resolves_futures(tracker, fake_server, mocker):
+    fake_server.fail_pin_job(HASHES[3], status="over_max_size")
+    callback = mocker.Mock()
+
+    futures = tracker.submit_many(HASHES, callback=callback)
+
+    assert tracker.wait(timeout=5)
+    assert futures[HASHES[0]].result() == HASHES[0]
+    with pytest.raises(PinJobError, match="over_max_size"):
+        futures[HASHES[3]].result()
+
+    assert callback.call_count == len(HASHES)
+    assert fake_server.get_pin(HASHES[0])["ipfs_pin_hash"] == HASHES[0]
+    stats = tracker.stats
+    assert (stats.pinned, stats.failed, stats.queued, stats.submitting) == (19, 1, 0, 0)
+    assert stats.statuses == {"over_max_size": 1}
+    assert stats.queue_depth == 0
+    # One poller lists every job, rather than each hash being polled.
+    assert fake_server.stats["pinJobs"] == stats.polls < 30
+    assert fake_server.stats["pinList"] == 0
+
+
+def test_tracker_deduplicates_tracked_hashes(tracker):
+    future = tracker.submit(HASHES[0])
+
+    assert tracker.submit(HASHES[0]) is future
+    assert future.result(timeout=5) == HASHES[0]
+    assert tracker.submit(HASHES[0]) is not future
+
+
+def test_tracker_backs_off_while_nothing_changes(pinning, fake_server):
+    fake_server.hash_pin_delay = 1.0
+    with PinJobTracker(pinning, min_interval=0.01, max_interval=0.2) as tracker:
+        future = tracker.submit(HASHES[0])
+        future.result(timeout=5)
+
+    # Polling every 10ms would have taken about a hundred polls.
+    assert tracker.stats.polls < 20
+
+
+def test_tracker_submission_error(tracker, fake_server):
+    fake_server.fail_next(status=400)
+
+    with pytest.raises(PinataBadRequestError):
+        tracker.submit(HASHES[0]).result(timeout=5)
+
+    assert tracker.stats.failed == 1
+
+
+def test_tracker_paged_listing(tracker, fake_server, mocker):
+    mocker.patch("pinata.jobs.MAX_JOB_PAGE_LIMIT", 2)
+
+    futures = tracker.submit_many(HASHES[:5])
+
+    assert tracker.wait(timeout=5)
+    assert all(future.result() for future in futures.values())
+    assert all(fake_server.get_pin(h) for h in HASHES[:5])
+
+
+def test_tracker_rejects_hashes_when_closed(tracker):
+    tracker.close()
+
+    with pytest.raises(RuntimeError):
+        tracker.submit(HASHES[0])
+
+
+def test_tracker_cancel(pinning, fake_server):
+    fake_server.hash_pin_delay = 5
+    tracker = PinJobTracker(pinning, max_workers=1, min_interval=0.01)
+    futures = tracker.submit_many(HASHES[:5])
+    while not tracker.stats.queued:
+        tracker.wait(timeout=0.01)
+
+    tracker.cancel()
+
+    assert tracker.wait(timeout=5)
+    for future in futures.values():
+        with pytest.raises(CancelledError):
+            future.result()
+
+    time.sleep(0.1)
+    polls = fake_server.stats["pinJobs"]
+    time.sleep(0.1)
+    assert fake_server.stats["pinJobs"] == polls
+    assert tracker._poller is None
+
+
+def test_pin_hashes(fake_sdk, fake_server):
+    fake_server.fail_pin_job(HASHES[1])
+
+    report = fake_sdk.pin_hashes(HASHES[:3] + HASHES[:1], min_interval=0.01)
+
+    assert sorted(report.pinned) == [HASHES[0], HASHES[2]]
+    assert isinstance(report.failed[HASHES[1]], PinJobError)
+    assert report.duplicates == 1
+
+
+def test_pin_hashes_timeout(fake_sdk, fake_server):
+    fake_server.hash_pin_delay = 5
+
+    report = fake_sdk.pin_hashes(HASHES[:2], timeout=0.2, min_interval=0.01)
+
+    assert report.pinned == []
+    assert isinstance(report.failed[HASHES[0]], TimeoutError)
+
+    assert isinstance(report.failed[HASHES[1]], TimeoutError)
+    # The tracker was cancelled, so nothing polls the queue anymore.
+    polls = fake_server.stats["pinJobs"]
+    time.sleep(0.1)
+    assert fake_server.stats["pinJobs"] == polls
+
+
+def test_pin_hashes_timeout_keeps_done_hashes(fake_sdk, mocker):
+    # Time out as soon as the first hash is reported, with the others already done.
+    as_completed = mocker.patch("concurrent.futures.as_completed")
+
+    def first_then_timeout(futures, timeout):
+        assert all(f.exception(timeout=5) is None for f in futures)
+        yield next(iter(futures))
+        raise concurrent.futures.TimeoutError()
+
+    as_completed.side_effect = first_then_timeout
+    report = fake_sdk.pin_hashes(HASHES[:3], timeout=1, min_interval=0.01)
+
+    assert sorted(report.pinned) == HASHES[:3]
+    assert report.failed == {}
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from pinata.journal import PinJournal
+from pinata.sdk import Pinata
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text(f"content {i}")
+        paths.append(path)
+
+    return paths
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "journal" / "pins.jsonl"
+
+
+def test_journal_resumes_recorded_pins(files, journal_path):
+    with PinJournal(journal_path) as journal:
+        journal.record(files[0], "cid0")
+
+    journal = PinJournal(journal_path)
+    assert len(journal) == 1
+    assert journal.get_cid(files[0]) == "cid0"
+    assert journal.get_cid(files[1]) is None
+
+
+def test_journal_ignores_changed_files(files, journal_path):
+    with PinJournal(journal_path) as journal:
+        journal.record(files[0], "cid0")
+
+    files[0].write_text("changed content")
+    assert PinJournal(journal_path).get_cid(files[0]) is None
+
+
+def test_journal_ignores_changed_directories(tmp_path, journal_path):
+    directory = tmp_path / "dir"
+    (directory / "sub").mkdir(parents=True)
+    nested = directory / "sub" / "file.txt"
+    nested.write_text("before")
+    with PinJournal(journal_path) as journal:
+        journal.record(directory, "cid0")
+        assert journal.get_cid(directory) == "cid0"
+
+    # Same size, and neither directory's own mtime changes.
+    nested.write_text("after!")
+    stat = nested.stat()
+    os.utime(nested, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert PinJournal(journal_path).get_cid(directory) is None
+
+
+def test_journal_ignores_truncated_line(files, journal_path):
+    with PinJournal(journal_path) as journal:
+        journal.record(files[0], "cid0")
+        journal.record(files[1], "cid1")
+
+    # Simulate a crash in the middle of writing the last entry.
+    data = journal_path.read_bytes()
+    journal_path.write_bytes(data[:-10])
+
+    with PinJournal(journal_path) as journal:
+        assert journal.get_cid(files[0]) == "cid0"
+        assert journal.get_cid(files[1]) is None
+        journal.record(files[2], "cid2")
+
+    journal = PinJournal(journal_path)
+    assert journal.get_cid(files[0]) == "cid0"
+    assert journal.get_cid(files[2]) == "cid2"
+
+
+def test_journal_flushes_in_batches(files, journal_path, mocker):
+    fsync = mocker.spy(os, "fsync")
+    journal = PinJournal(journal_path, fsync_interval=3600, fsync_every=2)
+    journal.record(files[0], "cid0")
+    assert journal_path.read_text() == ""
+    assert not fsync.called
+
+    journal.record(files[1], "cid1")
+    lines = journal_path.read_text().splitlines()
+    assert [json.loads(line)["cid"] for line in lines] == ["cid0", "cid1"]
+    assert fsync.call_count == 1
+    journal.close()
+
+
+def test_pin_many_skips_journaled_paths(files, journal_path, mocker):
+    pinning = mocker.MagicMock()
+    pinning.session.pool_size = 10
+    pinning.pin_file.side_effect = lambda path, **kwargs: mocker.Mock(
+        data={"IpfsHash": f"cid-{path.name}"}
+    )
+    data = mocker.MagicMock()
+    data.session = pinning.session
+    pinata = Pinata(pinning, data)
+    with PinJournal(journal_path) as journal:
+        journal.record(files[0], "cid-journaled")
+        results = pinata.pin_many(files, journal=journal)
+
+    assert [r.cid for r in results] == ["cid-journaled", "cid-file1.txt", "cid-file2.txt"]
+    assert pinning.pin_file.call_count == 2
+    journal = PinJournal(journal_path)
+    assert [journal.get_cid(f) for f in files] == [r.cid for r in results]
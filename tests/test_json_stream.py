@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+from requests import Response
+
+from pinata.json_stream import JSONArrayParser, iter_json_array
+from pinata.response import PinataResponse
+
+DOCUMENT = {
+    "count": 3,
+    "rows": [
+        {"ipfs_pin_hash": "Qm1", "size": 12, "metadata": {"name": 'a "quoted" é name'}},
+        {"ipfs_pin_hash": "Qm2", "size": 1.5e3, "regions": [{"id": None, "ok": True}]},
+        {"ipfs_pin_hash": "Qm3", "size": -7},
+    ],
+    "next": None,
+}
+BODY = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(BODY)])
+def test_iter_json_array(chunk_size):
+    stream = io.BytesIO(BODY)
+    chunks = iter(lambda: stream.read(chunk_size), b"")
+    assert list(iter_json_array(chunks, "rows")) == DOCUMENT["rows"]
+
+
+def test_json_array_parser_collects_other_fields():
+    parser = JSONArrayParser("rows")
+    items = parser.feed(BODY[:-10]) + parser.feed(BODY[-10:]) + parser.close()
+    assert len(items) == 3
+    assert parser.fields == {"count": 3, "next": None}
+
+
+def test_json_array_parser_yields_items_as_they_complete():
+    parser = JSONArrayParser("rows")
+    first_row_end = BODY.index(b"}, {") + 1
+    assert parser.feed(BODY[: first_row_end + 1]) == [DOCUMENT["rows"][0]]
+
+
+@pytest.mark.parametrize("body", [b'{"rows": [1, 2', b'{"rows": [1 2]}', b"[1]", b'{"rows": []} x'])
+def test_iter_json_array_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body], "rows"))
+
+
+def test_pinata_response_iter_items():
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(BODY)
+    assert list(PinataResponse(response).iter_items("rows", chunk_size=16)) == DOCUMENT["rows"]
@@ -0,0 +1,37 @@
+import pytest
+
+from pinata.logger import REDACTED, format_body, set_max_logged_body_size
+
+
+@pytest.fixture
+def max_body_size():
+    yield set_max_logged_body_size
+    set_max_logged_body_size(2048)
+
+
+def test_format_body_caps_size(max_body_size):
+    max_body_size(10)
+    assert format_body(b"x" * 100) == "x" * 10 + "... (100 total)"
+
+
+def test_format_body_omits_when_disabled(max_body_size):
+    max_body_size(0)
+    assert format_body(b"{}") == "<omitted>"
+
+
+def test_format_body_redacts_dicts():
+    text = format_body({"name": "a", "keys": [{"pinata_api_key": "1", "JWT": "2"}]})
+    assert '"name": "a"' in text
+    assert '"pinata_api_key": "<redacted>"' in text
+    assert '"JWT": "<redacted>"' in text
+
+
+def test_format_body_redacts_bytes(max_body_size):
+    body = b'{"pinata_api_key": "abc", "pinata_api_secret": "def", "name": "x"}'
+    assert format_body(body) == (
+        f'{{"pinata_api_key": "{REDACTED}", "pinata_api_secret": "{REDACTED}", "name": "x"}}'
+    )
+
+    # A secret cut off by the size cap is still redacted.
+    max_body_size(22)
+    assert format_body(body) == f'{{"pinata_api_key": "{REDACTED}"... ({len(body)} total)'
@@ -0,0 +1,82 @@
+from requests import Response
+
+from pinata.metrics import HistogramCollector, RequestEvent, RequestTimings, get_endpoint
+from pinata.session import PinataAPISession
+
+MOCK_HASH = "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+
+
+def _event(elapsed, endpoint="/data/pinList", status_code=200, retries=0):
+    return RequestEvent(
+        method="GET",
+        url=f"https://api.pinata.cloud{endpoint}",
+        endpoint=endpoint,
+        status_code=status_code,
+        retries=retries,
+        elapsed=elapsed,
+        timings=RequestTimings(ttfb=elapsed / 2, total=elapsed),
+        bytes_sent=10,
+        bytes_received=100,
+    )
+
+
+def test_get_endpoint_replaces_hashes():
+    url = f"https://api.pinata.cloud/pinning/unpin/{MOCK_HASH}?a=1"
+    assert get_endpoint(url) == "/pinning/unpin/{hash}"
+
+
+def test_histogram_collector_quantiles():
+    collector = HistogramCollector()
+    for i in range(1, 101):
+        collector(_event(i / 100))
+
+    quantiles = collector.quantiles()[("GET", "/data/pinList")]
+    assert quantiles["p50"] == 0.51
+    assert quantiles["p95"] == 0.96
+    assert quantiles["p99"] == 1.0
+    assert collector.quantiles("ttfb")[("GET", "/data/pinList")]["p50"] == 0.255
+
+
+def test_histogram_collector_to_prometheus():
+    collector = HistogramCollector(buckets=(0.1, 1.0))
+    collector(_event(0.05))
+    collector(_event(0.5, status_code=None, retries=2))
+    text = collector.to_prometheus()
+
+    labels = 'method="GET",endpoint="/data/pinList"'
+    assert f'pinata_request_duration_seconds_bucket{{{labels},phase="total",le="0.1"}} 1' in text
+    assert f'pinata_request_duration_seconds_bucket{{{labels},phase="total",le="+Inf"}} 2' in text
+    assert f'pinata_request_duration_seconds_count{{{labels},phase="total"}} 2' in text
+    assert f'pinata_requests_total{{{labels},status="200"}} 1' in text
+    assert f'pinata_requests_total{{{labels},status="error"}} 1' in text
+    assert f"pinata_request_retries_total{{{labels}}} 2" in text
+    assert f"pinata_request_bytes_sent_total{{{labels}}} 20" in text
+
+
+def test_session_emits_events_to_hooks(mocker):
+    response = Response()
+    response.status_code = 200
+    response._content = b"{}"
+    session = PinataAPISession.from_api_key("key", "secret")
+    mocker.patch.object(session._session, "send", return_value=response)
+    events = []
+    session.add_hook(events.append)
+
+    session.get(f"pinning/unpin/{MOCK_HASH}")
+
+    assert len(events) == 1
+    assert events[0].endpoint == "/pinning/unpin/{hash}"
+    assert events[0].status_code == 200
+    assert events[0].retries == 0
+    assert events[0].bytes_received == 2
+
+
+def test_session_closes_replaced_adapters(mocker):
+    session = PinataAPISession.from_api_key("key", "secret")
+    old_adapter = session._session.adapters["https://"]
+    close = mocker.spy(old_adapter, "close")
+
+    session.add_hook(lambda event: None)
+
+    close.assert_called_once_with()
+    assert session._session.adapters["https://"] is session._session.adapters["http://"]
@@ -0,0 +1,130 @@
+import math
+
+import pytest
+
+from pinata.records import PinRecord, PinTable, np, parse_timestamp
+
+ROWS = [
+    {
+        "ipfs_pin_hash": "QmB",
+        "size": 300,
+        "date_pinned": "2020-02-08T09:30:26.123Z",
+        "date_unpinned": None,
+        "metadata": {"name": "b.txt", "keyvalues": {"k": "v"}},
+    },
+    {
+        "ipfs_pin_hash": "QmA",
+        "size": 100,
+        "date_pinned": "2020-01-05T04:24:21.234Z",
+        "date_unpinned": "2020-03-01T00:00:00.000Z",
+        "metadata": {"name": "a.txt"},
+    },
+    {
+        "ipfs_pin_hash": "bafyC",
+        "size": 200,
+        "date_pinned": "2020-01-20T00:00:00.000Z",
+        "date_unpinned": None,
+        "metadata": {"name": "b.txt"},
+    },
+    {"ipfs_pin_hash": "QmD", "size": 50, "date_pinned": None, "metadata": {}},
+]
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(np is None, reason="no numpy"))]
+
+
+@pytest.fixture(params=BACKENDS, ids=["array", "numpy"])
+def table(request):
+    return PinTable.from_rows(ROWS, use_numpy=request.param)
+
+
+def _cids(table):
+    return [record.cid for record in table]
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("1970-01-01T00:01:00.500Z") == 60.5
+    assert parse_timestamp("1970-01-01T00:01:00Z") == 60.0
+    assert parse_timestamp(None) is None
+
+
+def test_pin_record_from_row():
+    record = PinRecord.from_row(ROWS[0])
+    assert record.cid == "QmB"
+    assert record.name == "b.txt"
+    assert record.size == 300
+    assert record.keyvalues == {"k": "v"}
+    assert record.is_pinned
+    assert record.pinned_at.isoformat() == "2020-02-08T09:30:26.123000+00:00"
+    assert not hasattr(record, "__dict__")
+
+
+def test_pin_table_round_trips_records(table):
+    records = [PinRecord.from_row(row) for row in ROWS]
+    for record in records:
+        record.keyvalues = None
+
+    assert list(table) == records
+    assert len(table) == 4
+    assert table.total_size == 650
+    assert table.names == ["b.txt", "a.txt", "b.txt", ""]
+
+
+def test_pin_table_where(table):
+    assert _cids(table.where(status="pinned")) == ["QmB", "bafyC", "QmD"]
+    assert _cids(table.where(status="unpinned")) == ["QmA"]
+    assert _cids(table.where(pinned_after="2020-01-10T00:00:00Z")) == ["QmB", "bafyC"]
+    assert _cids(table.where(size_min=100, size_max=200)) == ["QmA", "bafyC"]
+    assert _cids(table.where(cid_prefix="Qm", status="pinned")) == ["QmB", "QmD"]
+
+
+def test_pin_table_filter(table):
+    mask = [size > 100 for size in table.sizes]
+    assert _cids(table.filter(mask)) == ["QmB", "bafyC"]
+
+
+def test_pin_table_filter_mask_length(table):
+    with pytest.raises(ValueError):
+        table.filter([True] * (len(table) + 1))
+
+
+@pytest.mark.parametrize(
+    "by,descending,expected",
+    [
+        ("size", False, ["QmD", "QmA", "bafyC", "QmB"]),
+        ("size", True, ["QmB", "bafyC", "QmA", "QmD"]),
+        ("date_pinned", False, ["QmA", "bafyC", "QmB", "QmD"]),
+        ("date_pinned", True, ["QmB", "bafyC", "QmA", "QmD"]),
+        ("name", False, ["QmD", "QmA", "QmB", "bafyC"]),
+        ("name", True, ["QmB", "bafyC", "QmA", "QmD"]),
+        ("cid", False, ["QmA", "QmB", "QmD", "bafyC"]),
+    ],
+)
+def test_pin_table_sort(table, by, descending, expected):
+    assert _cids(table.sort(by, descending=descending)) == expected
+
+
+def test_pin_table_group_by(table):
+    groups = table.group_by("name")
+    assert list(groups) == ["", "a.txt", "b.txt"]
+    assert _cids(groups["b.txt"]) == ["QmB", "bafyC"]
+    assert groups["b.txt"].total_size == 500
+
+
+def test_pin_table_group_by_keys(table):
+    groups = table.group_by([size >= 200 for size in table.sizes])
+    assert _cids(groups[True]) == ["QmB", "bafyC"]
+
+
+def test_pin_table_group_by_missing_keys(table):
+    groups = table.group_by("date_unpinned")
+    assert len(groups) == 2
+    (unpinned_at, unpinned), (missing, pinned) = groups.items()
+    assert unpinned_at == parse_timestamp("2020-03-01T00:00:00.000Z")
+    assert _cids(unpinned) == ["QmA"]
+    assert math.isnan(missing)
+    assert _cids(pinned) == ["QmB", "bafyC", "QmD"]
+
+
+def test_pin_table_unknown_column(table):
+    with pytest.raises(ValueError):
+        table.sort("unknown")
@@ -0,0 +1,84 @@
+import pytest
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout
+
+from pinata.retry import RetryBudget, RetryPolicy
+
+
+def _response(status_code, headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(backoff_factor=1.0, jitter=False)
+
+
+def test_get_retry_delay_backs_off_exponentially(policy):
+    delays = [
+        policy.get_retry_delay("GET", attempt, response=_response(503)) for attempt in range(3)
+    ]
+    assert delays == [1.0, 2.0, 4.0]
+    assert policy.stats.retries == 3
+    assert policy.stats.total_delay == 7.0
+
+
+def test_get_retry_delay_gives_up_after_max_retries(policy):
+    assert policy.get_retry_delay("GET", 3, response=_response(503)) is None
+    assert policy.stats.gave_up == 1
+
+
+def test_get_retry_delay_only_retries_server_errors_when_idempotent(policy):
+    assert policy.get_retry_delay("POST", 0, response=_response(503)) is None
+    assert policy.get_retry_delay("POST", 0, idempotent=True, response=_response(503)) == 1.0
+
+
+def test_get_retry_delay_always_retries_rate_limited_requests(policy):
+    assert policy.get_retry_delay("POST", 0, response=_response(429)) == 1.0
+
+
+def test_get_retry_delay_does_not_retry_client_errors(policy):
+    assert policy.get_retry_delay("GET", 0, response=_response(404)) is None
+
+
+def test_get_retry_delay_honors_retry_after(policy):
+    response = _response(429, {"Retry-After": "7"})
+    assert policy.get_retry_delay("POST", 0, response=response) == 7.0
+
+
+def test_get_retry_delay_gives_up_when_retry_after_too_long(policy):
+    response = _response(429, {"Retry-After": "3600"})
+    assert policy.get_retry_delay("POST", 0, response=response) is None
+
+
+def test_get_retry_delay_connection_errors(policy):
+    assert policy.get_retry_delay("POST", 0, error=ConnectTimeout()) == 1.0
+    assert policy.get_retry_delay("POST", 0, error=RequestsConnectionError()) is None
+    assert policy.get_retry_delay("GET", 0, error=RequestsConnectionError()) == 1.0
+
+
+def test_get_retry_delay_jitter_stays_within_backoff():
+    policy = RetryPolicy(backoff_factor=1.0)
+    for _ in range(5):
+        assert 0 <= policy.get_retry_delay("GET", 2, response=_response(503)) <= 4.0
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0, window=60)
+    for _ in range(4):
+        budget.record_request()
+
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+
+def test_get_retry_delay_gives_up_when_budget_exhausted():
+    budget = RetryBudget(ratio=0, min_retries_per_second=0)
+    policy = RetryPolicy(budget=budget)
+    assert policy.get_retry_delay("GET", 0, response=_response(503)) is None
+    assert policy.stats.budget_exhausted == 1
@@ -0,0 +1,130 @@
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pinata.streaming import (
+    JSONEnvelope,
+    MultipartEncoder,
+    StreamingBody,
+    _FilePart,
+    set_max_open_files,
+)
+
+CONTENT = b"0123456789" * 1000
+
+
+@pytest.fixture
+def temp_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test_file.bin"
+        path.write_bytes(CONTENT)
+        with open(str(path), "rb") as file:
+            yield file
+
+
+@pytest.mark.parametrize("use_mmap", (False, True))
+def test_multipart_encoder_streams_whole_file(temp_file, use_mmap):
+    encoder = MultipartEncoder([("file", temp_file)], chunk_size=333, use_mmap=use_mmap)
+    body = b"".join(encoder)
+
+    assert len(body) == len(encoder)
+    assert CONTENT in body
+    assert b'filename="test_file.bin"' in body
+    assert body.endswith(f"--{encoder.boundary}--\r\n".encode())
+
+
+def test_multipart_encoder_read_in_blocks(temp_file):
+    encoder = MultipartEncoder([("file", ("dir/test_file.bin", temp_file))])
+    expected = b"".join(encoder)
+
+    blocks = []
+    block = encoder.read(1000)
+    while block:
+        blocks.append(block)
+        block = encoder.read(1000)
+
+    assert b"".join(blocks) == expected
+    assert b'filename="dir/test_file.bin"' in expected
+
+
+def test_multipart_encoder_reset(temp_file):
+    encoder = MultipartEncoder([("file", temp_file)])
+    first = encoder.read()
+    encoder.reset()
+    assert encoder.read() == first
+
+
+def test_multipart_encoder_opens_paths_lazily(mocker):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test_file.bin"
+        path.write_bytes(CONTENT)
+        open_spy = mocker.spy(_FilePart, "open")
+
+        encoder = MultipartEncoder([("file", ("dir/test_file.bin", path))])
+        assert open_spy.call_count == 0
+
+        body = b"".join(encoder)
+        assert open_spy.call_count == 1
+        assert CONTENT in body
+        assert len(body) == len(encoder)
+
+
+@pytest.mark.parametrize("prefix", (b"", b"\xef\xbb\xbf"))
+def test_json_envelope_wraps_file_unparsed(prefix):
+    document = b' \n[{"name": "caf\xc3\xa9", "size": 1.50}]\n'
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.json"
+        path.write_bytes(prefix + document)
+        envelope = JSONEnvelope(path, chunk_size=7)
+        body = b"".join(envelope)
+
+    assert body == b'{"pinataContent":' + document + b"}"
+    assert len(body) == len(envelope)
+    assert json.loads(body) == {"pinataContent": [{"name": "café", "size": 1.5}]}
+
+
+def test_json_envelope_reset():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.json"
+        path.write_bytes(b'{"a": 1}')
+        with open(str(path), "rb") as file:
+            envelope = JSONEnvelope(file)
+            first = envelope.read()
+            envelope.reset()
+            assert envelope.read() == first == b'{"pinataContent":{"a": 1}}'
+
+
+@pytest.mark.parametrize("document", (b"", b"  \n", b'"text"', b'{"a": 1]', b"[1, 2"))
+def test_json_envelope_when_not_object_or_array(document):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.json"
+        path.write_bytes(document)
+        with pytest.raises(ValueError):
+            JSONEnvelope(path)
+
+        envelope = JSONEnvelope(path, validate=False)
+        assert b"".join(envelope) == b'{"pinataContent":' + document + b"}"
+
+
+def test_json_envelope_when_text_mode():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.json"
+        path.write_text("{}")
+        with open(str(path)) as file, pytest.raises(ValueError):
+            JSONEnvelope(file)
+
+
+def test_set_max_open_files_when_invalid():
+    with pytest.raises(ValueError):
+        set_max_open_files(0)
+
+
+def test_streaming_body_must_implement_length():
+    class EmptyBody(StreamingBody):
+        def _generate(self):
+            yield b""
+
+    with pytest.raises(TypeError):
+        EmptyBody()
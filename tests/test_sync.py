@@ -0,0 +1,156 @@
+import pytest
+
+from pinata.cid import compute_cid
+from pinata.sync import SyncManifest
+
+
+@pytest.fixture(autouse=True)
+def no_racy_window(mocker):
+    mocker.patch("pinata.sync.RACY_WINDOW_NS", 0)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    directory = tmp_path / "tree"
+    (directory / "sub").mkdir(parents=True)
+    (directory / "a.txt").write_bytes(b"a")
+    (directory / "b.json").write_bytes(b'{"b": 1}')
+    (directory / "sub" / "c.txt").write_bytes(b"c")
+    (directory / "sub" / "copy-of-a.txt").write_bytes(b"a")
+    return directory
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with SyncManifest(tmp_path / "manifest.sqlite") as sync_manifest:
+        yield sync_manifest
+
+
+def _pinned(fake_server, cid):
+    pin = fake_server.get_pin(cid)
+    return bool(pin) and not pin["date_unpinned"]
+
+
+def test_sync_directory(fake_sdk, fake_server, tree, manifest):
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+
+    assert report.success
+    assert sorted(report.uploaded) == ["a.txt", "b.json", "sub/c.txt"]
+    assert [item.path for item in report.plan.adopt] == ["sub/copy-of-a.txt"]
+    assert len(manifest) == 4
+    assert manifest.get_cid("b.json") == compute_cid(tree / "b.json")
+    assert _pinned(fake_server, compute_cid(tree / "sub" / "c.txt"))
+
+
+def test_sync_directory_only_syncs_changes(fake_sdk, fake_server, tree, manifest, mocker):
+    fake_sdk.sync_directory(tree, manifest=manifest)
+    old_b, old_c = manifest.get_cid("b.json"), manifest.get_cid("sub/c.txt")
+    (tree / "b.json").write_bytes(b'{"b": 2}')
+    (tree / "sub" / "c.txt").unlink()
+    (tree / "d.txt").write_bytes(b"a")
+    hash_spy = mocker.patch("pinata.sync.compute_cid", wraps=compute_cid)
+
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+
+    assert sorted(c.args[0].name for c in hash_spy.call_args_list) == ["b.json", "d.txt"]
+    assert report.uploaded == ["b.json"]
+    assert [item.path for item in report.plan.adopt] == ["d.txt"]
+    assert sorted(report.unpinned) == sorted([old_b, old_c])
+    assert not _pinned(fake_server, old_b)
+    assert _pinned(fake_server, manifest.get_cid("a.txt"))
+    assert manifest.get_cid("sub/c.txt") is None
+    assert fake_sdk.sync_directory(tree, manifest=manifest).plan.is_empty
+
+
+def test_sync_directory_keeps_shared_content(fake_sdk, fake_server, tree, manifest):
+    fake_sdk.sync_directory(tree, manifest=manifest)
+    cid = manifest.get_cid("a.txt")
+    (tree / "a.txt").unlink()
+
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+
+    assert [item.path for item in report.plan.remove] == ["a.txt"]
+    assert report.unpinned == []
+    assert _pinned(fake_server, cid)
+
+
+def test_sync_directory_unpins_shared_content_once_unused(fake_sdk, fake_server, tree, manifest):
+    fake_sdk.sync_directory(tree, manifest=manifest)
+    cid = manifest.get_cid("a.txt")
+    (tree / "a.txt").unlink()
+    fake_sdk.sync_directory(tree, manifest=manifest)
+    (tree / "sub" / "copy-of-a.txt").unlink()
+
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+
+    # The copy was adopted from a file the manifest uploaded, so it owns the content too.
+    assert report.unpinned == [cid]
+    assert not _pinned(fake_server, cid)
+
+
+def test_sync_directory_never_unpins_adopted_content(fake_sdk, fake_server, tree, manifest):
+    cid = fake_server.add_content(b"precious")
+    (tree / "precious.txt").write_bytes(b"precious")
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+    assert [item.path for item in report.plan.adopt] == ["precious.txt", "sub/copy-of-a.txt"]
+
+    (tree / "precious.txt").unlink()
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+
+    assert [item.path for item in report.plan.remove] == ["precious.txt"]
+    assert report.unpinned == []
+    assert _pinned(fake_server, cid)
+
+
+def test_sync_manifest_migrates_files_without_ownership(tmp_path):
+    path = tmp_path / "state" / "manifest.sqlite"
+    path.parent.mkdir()
+    with SyncManifest(path) as sync_manifest:
+        sync_manifest._connection.executescript(
+            "DROP TABLE files; CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, "
+            "mtime_ns INTEGER, inode INTEGER, cid TEXT); "
+            "INSERT INTO files VALUES ('a.txt', 1, 1, 1, 'QmOld');"
+        )
+
+    with SyncManifest(path) as sync_manifest:
+        assert sync_manifest.get_cid("a.txt") == "QmOld"
+        plan = sync_manifest.plan(tmp_path, is_pinned=lambda cid: False)
+        assert [item.path for item in plan.remove] == ["a.txt"]
+        assert plan.unpin == []
+
+
+def test_sync_directory_dry_run(fake_sdk, fake_server, tree, manifest):
+    report = fake_sdk.sync_directory(tree, manifest=manifest, dry_run=True)
+
+    lines = list(report.plan.describe())
+    assert lines[0] == f"upload a.txt ({compute_cid(tree / 'a.txt')})"
+    assert len(report.plan.upload) == 3
+    assert len(manifest) == 0
+    assert fake_server.stats["pinFileToIPFS"] == 0
+
+
+def test_sync_directory_retries_failures(fake_sdk, fake_server, tree, manifest, mocker):
+    mocker.patch.object(fake_sdk, "_is_pinned", return_value=False)
+    fake_server.fail_next(count=1, status=500)
+    report = fake_sdk.sync_directory(tree, manifest=manifest, max_workers=1)
+
+    # The copy of the file that failed to upload has no pinned content to share either.
+    assert sorted(report.failed) == ["a.txt", "sub/copy-of-a.txt"]
+    assert len(manifest) == 2
+
+    report = fake_sdk.sync_directory(tree, manifest=manifest)
+    assert report.success
+    assert len(report.uploaded) == 1
+    assert len(manifest) == 4
+
+
+def test_sync_cli_dry_run(runner, root_cli, mock_pinata, tree, tmp_path, fake_server, fake_sdk):
+    mock_pinata.sync_directory.side_effect = fake_sdk.sync_directory
+
+    result = runner.invoke(
+        root_cli, ["sync", str(tree), "--dry-run", "--manifest", str(tmp_path / "m.sqlite")]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "upload sub/c.txt" in result.output
+    assert "Would upload 3, adopt 1, remove 0 and unpin 0; 0 unchanged." in result.output
@@ -0,0 +1,249 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from pinata.aio import AsyncDataClient, AsyncPinataAPISession, AsyncPinningClient
+from pinata.cid import compute_cid
+from pinata.clients.data import DataClient
+from pinata.clients.pinning import PinningClient
+from pinata.exceptions import (
+    PinataBadRequestError,
+    PinataInternalServiceError,
+    PinataUnauthorizedError,
+)
+from pinata.sdk import Pinata
+from pinata.streaming import MultipartEncoder
+
+from .conftest import FAST_RETRIES
+
+
+@pytest.fixture
+def pinning(make_session):
+    return PinningClient(make_session(retry_policy=FAST_RETRIES))
+
+
+@pytest.fixture
+def data(make_session):
+    return DataClient(make_session(retry_policy=FAST_RETRIES))
+
+
+def test_pin_file_computes_cid(tmp_path, pinning, data):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"x" * 600_000)
+
+    response = pinning.pin_file(path)
+
+    assert response["IpfsHash"] == compute_cid(path)
+    assert "isDuplicate" not in response.data
+    assert pinning.pin_file(path)["isDuplicate"]
+    rows = data.search_pins(status="pinned")["rows"]
+    assert [(r["ipfs_pin_hash"], r["metadata"]["name"]) for r in rows] == [
+        (compute_cid(path), "file.bin")
+    ]
+
+
+def test_pin_directory_computes_cid(tmp_path, pinning):
+    directory = tmp_path / "dir"
+    (directory / "sub").mkdir(parents=True)
+    (directory / "a.txt").write_text("a")
+    (directory / "sub" / "b.txt").write_text("b" * 300_000)
+
+    response = pinning.pin_file(directory, recursive=True)
+
+    assert response["IpfsHash"] == compute_cid(directory, recursive=True)
+
+
+def test_chunked_upload(tmp_path, fake_server):
+    path = tmp_path / "file.txt"
+    path.write_text("hello world\n")
+    body = MultipartEncoder.from_path(path)
+
+    # A generator has no length, so requests sends it with chunked encoding.
+    response = requests.post(
+        f"{fake_server.url}pinning/pinFileToIPFS",
+        data=(chunk for chunk in body),
+        headers={"Content-Type": body.content_type},
+    )
+
+    assert response.json()["IpfsHash"] == compute_cid(path)
+
+
+def test_pin_json_and_unpin(pinning, data):
+    cid = pinning.pin_json({"hello": "world"})["IpfsHash"]
+    assert data.search_pins(status="pinned")["count"] == 1
+
+    pinning.unpin(cid)
+    with pytest.raises(PinataBadRequestError) as err:
+        pinning.unpin(cid)
+
+    assert err.value.is_not_pinned
+    row = data.search_pins(status="unpinned")["rows"][0]
+    assert row["ipfs_pin_hash"] == cid
+    assert row["date_unpinned"]
+
+
+def test_pin_json_streamed(pinning, tmp_path):
+    path = tmp_path / "metadata.json"
+    path.write_text('{"hello": "world"}')
+
+    streamed = pinning.pin_json(path, stream=True)["IpfsHash"]
+    assert streamed == pinning.pin_json(path)["IpfsHash"]
+
+
+def test_sdk_pin_file_streams_json_when_asked(pinning, data, tmp_path, mocker):
+    path = tmp_path / "metadata.json"
+    path.write_text('{"hello": "world"}')
+    sdk = Pinata(pinning, data)
+    pin_json = mocker.spy(pinning, "pin_json")
+
+    parsed = sdk.pin_file(path)
+    streamed = sdk.pin_file(path, stream_json=True)
+
+    assert [c.kwargs["stream"] for c in pin_json.call_args_list] == [False, True]
+    assert streamed == parsed
+
+
+def test_pin_hash(fake_server, pinning):
+    fake_server.hash_pin_delay = 0.2
+
+    assert pinning.pin_hash("QmQueued")["status"] == "prechecking"
+    assert fake_server.get_pin("QmQueued") is None
+    time.sleep(0.2)
+    assert fake_server.get_pin("QmQueued")["ipfs_pin_hash"] == "QmQueued"
+
+
+def test_pin_hash_is_retried(fake_server, pinning):
+    fake_server.fail_next(1, status=503)
+
+    assert pinning.pin_hash("QmQueued")["status"] == "prechecking"
+    assert fake_server.stats["errors"] == 1
+
+
+def test_async_pin_hash_is_retried(fake_server):
+    async def pin_hash():
+        session = AsyncPinataAPISession.from_api_key(
+            "key", "secret", host_address=fake_server.url, retry_policy=FAST_RETRIES
+        )
+        async with session:
+            return await AsyncPinningClient(session).pin_hash("QmQueued")
+
+    fake_server.fail_next(1, status=503)
+
+    assert asyncio.run(pin_hash())["status"] == "prechecking"
+    assert fake_server.stats["errors"] == 1
+
+
+def test_list_pin_jobs(fake_server, pinning):
+    fake_server.hash_pin_delay = 0.2
+    fake_server.fail_pin_job("QmExpired")
+    for cid in ("QmQueued", "QmExpired"):
+        pinning.pin_hash(cid)
+
+    jobs = pinning.list_pin_jobs(sort="ASC")
+    assert [(j["ipfs_pin_hash"], j["status"]) for j in jobs["rows"]] == [
+        ("QmQueued", "prechecking"),
+        ("QmExpired", "prechecking"),
+    ]
+    time.sleep(0.2)
+    jobs = pinning.list_pin_jobs()
+    assert [(j["ipfs_pin_hash"], j["status"]) for j in jobs["rows"]] == [("QmExpired", "expired")]
+    assert pinning.list_pin_jobs(status="prechecking")["count"] == 0
+
+
+def test_search_pins_filters_and_paging(fake_server, data):
+    start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    for i in range(25):
+        fake_server.add_pin(f"Qm{i:03d}", name=f"pin {i}", size=i, date_pinned=start + timedelta(i))
+
+    page = data.search_pins(page_limit=10, page_offset=20)
+    assert page["count"] == 25
+    assert [r["ipfs_pin_hash"] for r in page["rows"]] == [f"Qm{i:03d}" for i in range(4, -1, -1)]
+    assert len(list(data.iter_pins())) == 25
+    assert data.search_pins(hash_contains="Qm01")["count"] == 10
+    assert data.search_pins(pin_size_min=5, pin_size_max=9)["count"] == 5
+    assert data.search_pins(pin_start="2021-01-21T00:00:00.000Z")["count"] == 5
+    assert data.search_pins(status="unpinned")["count"] == 0
+
+
+@pytest.fixture
+def capped_pages(fake_server, mocker):
+    # The server returns fewer records than asked for, as Pinata does above its own cap.
+    list_pins = fake_server._list_pins
+
+    def capped(query):
+        page = list_pins(query)
+        return {**page, "rows": page["rows"][:10]}
+
+    mocker.patch.object(fake_server, "_list_pins", side_effect=capped)
+    for i in range(25):
+        fake_server.add_pin(f"Qm{i:03d}")
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_pins_with_capped_pages(capped_pages, data, prefetch):
+    rows = list(data.iter_pins(page_limit=20, prefetch=prefetch))
+
+    assert sorted(r["ipfs_pin_hash"] for r in rows) == [f"Qm{i:03d}" for i in range(25)]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_async_iter_pins_with_capped_pages(capped_pages, fake_server, prefetch):
+    async def iter_pins():
+        session = AsyncPinataAPISession.from_api_key(
+            "key", "secret", host_address=fake_server.url, retry_policy=FAST_RETRIES
+        )
+        async with session:
+            return [r async for r in AsyncDataClient(session).iter_pins(20, prefetch)]
+
+    rows = asyncio.run(iter_pins())
+
+    assert sorted(r["ipfs_pin_hash"] for r in rows) == [f"Qm{i:03d}" for i in range(25)]
+
+
+def test_iter_pins_page_limit(data):
+    with pytest.raises(ValueError, match="between 1 and 1000"):
+        next(data.iter_pins(page_limit=1001))
+
+
+def test_injected_faults_are_retried(fake_server, data):
+    fake_server.fail_next(2, status=503)
+    assert data.search_pins()["count"] == 0
+
+    fake_server.reset_next()
+    assert data.search_pins()["count"] == 0
+    assert fake_server.stats["errors"] == 2
+    assert fake_server.stats["resets"] == 1
+    assert fake_server.stats["pinList"] == 5
+
+
+def test_error_rate(fake_server, data):
+    fake_server.error_rate = 1.0
+    fake_server.error_statuses = (500,)
+
+    with pytest.raises(PinataInternalServiceError):
+        data.search_pins()
+
+    assert fake_server.stats["errors"] == 3
+
+
+def test_latency_and_bandwidth(tmp_path, fake_server, pinning):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"x" * 200_000)
+    fake_server.latency = lambda: 0.05
+    fake_server.bandwidth = 1_000_000
+
+    start = time.perf_counter()
+    pinning.pin_file(path)
+
+    assert time.perf_counter() - start >= 0.25
+
+
+@pytest.mark.parametrize(
+    "fake_server", [{"api_key": "key", "api_secret": "other secret"}], indirect=True
+)
+def test_authentication(data):
+    with pytest.raises(PinataUnauthorizedError):
+        data.search_pins()
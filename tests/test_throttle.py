@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from pinata.throttle import ProcessThrottle, Throttle
+
+
+def _acquire_times(throttle, count):
+    times = []
+    for _ in range(count):
+        with throttle.acquire():
+            times.append(time.perf_counter())
+
+    return times
+
+
+def test_throttle_allows_burst_then_paces_requests():
+    throttle = Throttle(rate=50, burst=2)
+    times = _acquire_times(throttle, 5)
+
+    assert times[1] - times[0] < 0.01
+    assert times[-1] - times[0] >= 3 / 50 * 0.9
+    assert throttle.wait_time > 0
+
+
+def test_throttle_limits_concurrency():
+    throttle = Throttle(max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def request():
+        with throttle.acquire():
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_throttle_pause_holds_back_requests():
+    throttle = Throttle(rate=1000)
+    throttle.pause(0.05)
+    start = time.perf_counter()
+    with throttle.acquire():
+        pass
+
+    assert time.perf_counter() - start >= 0.04
+
+
+def test_throttle_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        Throttle(rate=0)
+    with pytest.raises(ValueError):
+        Throttle(max_concurrency=0)
+
+
+def test_process_throttle_shares_rate_between_instances(tmp_path):
+    # Each instance has its own file handle, like a separate process would.
+    path = tmp_path / "throttle"
+    first = ProcessThrottle(path, rate=50, burst=1)
+    second = ProcessThrottle(path, rate=50, burst=1)
+    start = time.perf_counter()
+    for _ in range(3):
+        for throttle in (first, second):
+            with throttle.acquire():
+                pass
+
+    assert time.perf_counter() - start >= 5 / 50 * 0.9
+
+
+def test_process_throttle_shares_concurrency_slots(tmp_path):
+    path = tmp_path / "throttle"
+    first = ProcessThrottle(path, max_concurrency=1)
+    second = ProcessThrottle(path, max_concurrency=1)
+    acquired = threading.Event()
+
+    def request():
+        with second.acquire():
+            acquired.set()
+
+    with first.acquire():
+        thread = threading.Thread(target=request)
+        thread.start()
+        assert not acquired.wait(0.05)
+
+    assert acquired.wait(1)
+    thread.join()